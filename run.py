@@ -1,6 +1,7 @@
 """
 Convenience script to run the application.
 """
+import argparse
 import os
 import sys
 
@@ -21,20 +22,34 @@ def check_env_file():
         print("📝 Please edit .env file and add your actual Gemini API key")
         sys.exit(1)
 
+def parse_args():
+    """Parse launcher command-line arguments."""
+    parser = argparse.ArgumentParser(description="Run the AI Interview Screener API")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Production mode: multiple workers, no auto-reload (tuned from .env)"
+    )
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     print("🚀 Starting AI Interview Screener...")
     
     check_env_file()
     
     print("✅ Environment configured")
-    print("🌐 Server will be available at: http://localhost:8000")
-    print("📚 API Docs: http://localhost:8000/docs")
+
+    from src.core.server import build_server_config, describe_concurrency, resolve_app_target
+
+    server_config = build_server_config(production=args.prod)
+    app_target = resolve_app_target(server_config)
+
+    port = server_config["port"]
+    print(f"🌐 Server will be available at: http://localhost:{port}")
+    print(f"📚 API Docs: http://localhost:{port}/docs")
+    print(f"⚙️  Concurrency: {describe_concurrency(server_config)}")
     print("\n")
     
     import uvicorn
-    uvicorn.run(
-        "src.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
-    )
+    uvicorn.run(app_target, **server_config)
@@ -8,8 +8,18 @@ api_router = APIRouter()
 
 # Import route modules AFTER creating api_router to avoid circular imports
 from src.api.v1.routes.evaluation import router as evaluation_router
+from src.api.v1.routes.batch_evaluation import router as batch_evaluation_router
 from src.api.v1.routes.ranking import router as ranking_router
+from src.api.v1.routes.rankings import router as rankings_router
+from src.api.v1.routes.live_interview import router as live_interview_router
+from src.api.v1.routes.questions import router as questions_router
+from src.api.v1.routes.cohorts import router as cohorts_router
 
 # Include route modules
 api_router.include_router(evaluation_router)
+api_router.include_router(batch_evaluation_router)
 api_router.include_router(ranking_router)
+api_router.include_router(rankings_router)
+api_router.include_router(live_interview_router)
+api_router.include_router(questions_router)
+api_router.include_router(cohorts_router)
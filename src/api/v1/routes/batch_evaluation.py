@@ -0,0 +1,57 @@
+"""
+API routes for batch answer evaluation.
+"""
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.schemas.evaluation import BatchEvaluationRequest, BatchEvaluationResponse
+from src.services.evaluation_service import evaluation_service
+from src.middleware.priority import batch_priority
+from src.middleware.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/evaluate-answers", tags=["Evaluation"])
+
+
+@router.post(
+    "",
+    response_model=BatchEvaluationResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Evaluate many answers in one request",
+    description="Evaluates up to 100 independent answers concurrently and returns per-item results and errors.",
+    dependencies=[Depends(rate_limiter), Depends(batch_priority)]
+)
+async def evaluate_answers(request: BatchEvaluationRequest) -> BatchEvaluationResponse:
+    """
+    Evaluate a batch of independent answers.
+    
+    - **questions** / **contexts**: Optional shared texts, sent once and referenced by key
+    - **items**: Answers with inline `question`/`context` or `question_ref`/`context_ref`
+    
+    Returns one result or error per item, in request order.
+    """
+    try:
+        logger.info(f"Received batch evaluation request for {len(request.items)} items")
+        
+        # Resolve shared references so identical texts are interned
+        items_data = [
+            {
+                "id": item.id,
+                "candidate_answer": item.candidate_answer,
+                "question": request.questions[item.question_ref] if item.question_ref else item.question,
+                "context": request.contexts[item.context_ref] if item.context_ref else item.context
+            }
+            for item in request.items
+        ]
+        
+        result = await evaluation_service.evaluate_batch(items_data)
+        
+        return BatchEvaluationResponse(**result)
+        
+    except Exception as e:
+        logger.error(f"Batch evaluation error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to evaluate answers. Please try again."
+        )
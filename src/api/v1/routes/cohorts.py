@@ -0,0 +1,47 @@
+"""
+API routes for streaming cohort statistics.
+"""
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, status
+
+from src.schemas.cohort_stats import CohortStatsResponse, CohortSummary
+from src.services.cohort_stats import cohort_stats
+
+router = APIRouter(prefix="/cohorts", tags=["Cohorts"])
+
+
+@router.get(
+    "/questions",
+    response_model=List[CohortSummary],
+    summary="List question cohorts"
+)
+async def list_question_cohorts() -> List[CohortSummary]:
+    """Return every question with recorded scores, largest cohort first."""
+    return [CohortSummary(**item) for item in cohort_stats.list()]
+
+
+@router.get(
+    "/questions/{cohort_id}",
+    response_model=CohortStatsResponse,
+    summary="Score statistics for one question",
+    description=(
+        "Score histogram, mean and percentiles of every evaluation of a question by any worker, "
+        "maintained as evaluations complete and kept across restarts in STATE_DIR (without "
+        "STATE_DIR, each worker counts only its own evaluations). With `score`, also returns "
+        "where that score ranks in the cohort."
+    )
+)
+async def get_question_cohort(
+    cohort_id: str,
+    score: Optional[int] = Query(None, ge=1, le=5, description="Score to place within the cohort")
+) -> CohortStatsResponse:
+    """Return a question cohort's statistics (its id is in evaluation `metadata.cohort_id`)."""
+    stats = cohort_stats.get(cohort_id)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No scores recorded for cohort '{cohort_id}'"
+        )
+    if score is not None:
+        stats["position"] = cohort_stats.position(cohort_id, score)
+    return CohortStatsResponse(**stats)
@@ -2,10 +2,15 @@
 API routes for answer evaluation.
 """
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
 from src.schemas.evaluation import EvaluationRequest, EvaluationResponse
+from src.services.cohort_stats import cohort_stats
 from src.services.evaluation_service import evaluation_service
+from src.services.idempotency import IdempotencyKeyReused, idempotency_store, request_fingerprint
+from src.middleware.load_shedding import load_shedder
+from src.middleware.priority import interactive_priority
 from src.middleware.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
@@ -19,30 +24,61 @@ router = APIRouter(prefix="/evaluate-answer", tags=["Evaluation"])
     status_code=status.HTTP_200_OK,
     summary="Evaluate a candidate's answer",
     description="Evaluates a candidate's answer using AI and returns a score (1-5), summary, and improvement suggestion.",
-    dependencies=[Depends(rate_limiter)]
+    dependencies=[Depends(rate_limiter), Depends(interactive_priority), Depends(load_shedder)]
 )
-async def evaluate_answer(request: EvaluationRequest) -> EvaluationResponse:
+async def evaluate_answer(
+    request: EvaluationRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Retries with the same key return the first request's result"
+    )
+) -> EvaluationResponse:
     """
     Evaluate a candidate's answer.
     
     - **candidate_answer**: The answer text to evaluate (required)
     - **question**: Optional interview question context
     - **context**: Optional additional context for evaluation
+    - **question_id**: Optional question bank id instead of question and context
+    - **samples**: Optional number of evaluations sampled in one model call (median score)
     
     Returns evaluation with score, summary, improvement suggestion, and metadata.
     """
     try:
         logger.info("Received evaluation request")
         
-        # Call evaluation service
-        result = await evaluation_service.evaluate_answer(
-            candidate_answer=request.candidate_answer,
-            question=request.question,
-            context=request.context
+        # The score joins its question's cohort once, not again on idempotent replays
+        async def evaluate():
+            result = await evaluation_service.evaluate_answer(
+                candidate_answer=request.candidate_answer,
+                question=request.question,
+                context=request.context,
+                question_id=request.question_id,
+                samples=request.samples
+            )
+            cohort_stats.record(result["score"], request.question, request.question_id)
+            return result
+        
+        # Call evaluation service (once per idempotency key)
+        result, replayed = await idempotency_store.run(
+            "evaluate-answer",
+            idempotency_key,
+            request_fingerprint(request),
+            evaluate
         )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
         
         return EvaluationResponse(**result)
         
+    except IdempotencyKeyReused as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except ValueError as e:
         logger.warning(f"Validation error: {str(e)}")
         raise HTTPException(
@@ -0,0 +1,147 @@
+"""
+WebSocket route for live interviews with speculative scoring.
+"""
+import logging
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from src.core.config import settings
+from src.core.lifecycle import lifecycle
+from src.middleware.load_shedding import load_shedder
+from src.middleware.priority import identify_client
+from src.middleware.rate_limiter import rate_limiter
+from src.schemas.evaluation import EvaluationRequest
+from src.schemas.live_interview import LiveInterviewMessage
+from src.services.cohort_stats import cohort_stats
+from src.services.live_interview import DraftTooLong, LiveInterviewSession
+from src.services.question_bank import UnknownQuestion, question_bank
+from src.services.scheduler import current_client, current_priority
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/live-interview", tags=["Evaluation"])
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
+
+
+@router.websocket("")
+async def live_interview(websocket: WebSocket) -> None:
+    """
+    Score an answer while it is typed or transcribed.
+
+    Client messages (JSON):
+    - `{"type": "start", "question": ..., "context": ...}` (or
+      `{"type": "start", "question_id": ...}`) begins an answer
+    - `{"type": "draft", "text": ...}` sends the full draft so far
+    - `{"type": "append", "text": ...}` appends a transcription chunk
+    - `{"type": "final", "text": ...}` completes the answer (text optional)
+
+    Server messages:
+    - `{"type": "provisional", "evaluation": ..., "draft_chars": ...}` after
+      each speculative evaluation of a paused draft
+    - `{"type": "result", "evaluation": ..., "speculation": ...}` for the
+      final answer; `speculation.outcome` tells whether a draft result was reused
+    - `{"type": "error", "detail": ...}` for invalid messages, drafts over
+      the answer length limit, rate-limited final answers or failed evaluations
+
+    Every final answer and every speculative evaluation counts against the
+    client's rate limit; speculations that are rate limited or would be load
+    shed are skipped, and the final answer is then scored on its own.
+    """
+    try:
+        await rate_limiter(websocket)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+    if lifecycle.draining:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Server is shutting down")
+        return
+
+    await websocket.accept()
+    current_priority.set("interactive")
+    current_client.set(identify_client(websocket))
+
+    async def send_provisional(evaluation, text):
+        await websocket.send_json({"type": "provisional", "evaluation": evaluation, "draft_chars": len(text)})
+
+    async def admit_speculation():
+        current_priority.set(settings.LIVE_SPECULATIVE_PRIORITY)
+        try:
+            await load_shedder(websocket)
+            await rate_limiter(websocket)
+        except HTTPException:
+            return False
+        return True
+
+    session = LiveInterviewSession(on_provisional=send_provisional, admit=admit_speculation)
+    logger.info("Live interview session started")
+
+    try:
+        while True:
+            try:
+                message = LiveInterviewMessage.model_validate(await websocket.receive_json())
+            except (ValidationError, ValueError) as e:
+                detail = _validation_detail(e) if isinstance(e, ValidationError) else "Messages must be JSON objects"
+                await websocket.send_json({"type": "error", "detail": detail})
+                continue
+
+            if message.type == "start":
+                if message.question_id is not None:
+                    if message.question is not None or message.context is not None:
+                        await websocket.send_json({
+                            "type": "error",
+                            "detail": "Provide either question_id or question/context, not both"
+                        })
+                        continue
+                    try:
+                        question_bank.require(message.question_id)
+                    except UnknownQuestion as e:
+                        await websocket.send_json({"type": "error", "detail": str(e)})
+                        continue
+                session.start(message.question, message.context, message.question_id)
+            elif message.type in ("draft", "append"):
+                try:
+                    if message.type == "draft":
+                        session.update(message.text or "")
+                    else:
+                        session.append(message.text or "")
+                except DraftTooLong as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+            else:
+                try:
+                    request = EvaluationRequest(
+                        candidate_answer=message.text if message.text is not None else session.draft,
+                        question=session.question,
+                        context=session.context,
+                        question_id=session.question_id
+                    )
+                except ValidationError as e:
+                    await websocket.send_json({"type": "error", "detail": _validation_detail(e)})
+                    continue
+                try:
+                    await rate_limiter(websocket)
+                except HTTPException as e:
+                    await websocket.send_json({"type": "error", "detail": e.detail})
+                    continue
+                try:
+                    evaluation, speculation = await session.finalize(request.candidate_answer)
+                except Exception as e:
+                    logger.error(f"Live evaluation error: {str(e)}", exc_info=True)
+                    await websocket.send_json({
+                        "type": "error",
+                        "detail": "Failed to evaluate answer. Please try again."
+                    })
+                    continue
+                cohort_stats.record(evaluation["score"], request.question, request.question_id)
+                await websocket.send_json({"type": "result", "evaluation": evaluation, "speculation": speculation})
+
+    except WebSocketDisconnect:
+        logger.info("Live interview session closed")
+    finally:
+        session.close()
@@ -0,0 +1,44 @@
+"""
+API routes for the question bank.
+"""
+from typing import List
+from fastapi import APIRouter, HTTPException, status
+
+from src.schemas.question_bank import BankQuestionResponse
+from src.services.question_bank import BankQuestion, UnknownQuestion, question_bank
+from src.utils.tokens import estimate_tokens
+
+router = APIRouter(prefix="/questions", tags=["Questions"])
+
+
+def _describe(entry: BankQuestion) -> BankQuestionResponse:
+    return BankQuestionResponse(
+        id=entry.id,
+        question=entry.question,
+        context=entry.context,
+        rubric=entry.rubric,
+        prompt_prefix_tokens=estimate_tokens(entry.prompt_prefix)
+    )
+
+
+@router.get(
+    "",
+    response_model=List[BankQuestionResponse],
+    summary="List question bank questions"
+)
+async def list_questions() -> List[BankQuestionResponse]:
+    """Return every question that requests can refer to by question_id."""
+    return [_describe(entry) for entry in question_bank.list()]
+
+
+@router.get(
+    "/{question_id}",
+    response_model=BankQuestionResponse,
+    summary="Get a question bank question"
+)
+async def get_question(question_id: str) -> BankQuestionResponse:
+    """Return one question bank question."""
+    try:
+        return _describe(question_bank.require(question_id))
+    except UnknownQuestion as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
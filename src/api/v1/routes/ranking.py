@@ -2,11 +2,17 @@
 API routes for candidate ranking.
 """
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 
-from src.schemas.ranking import RankingRequest, RankingResponse
+from src.core.config import settings
+from src.schemas.ranking import RankingRequest, RankingResponse, UploadRankingResponse
+from src.services.idempotency import IdempotencyKeyReused, idempotency_store, request_fingerprint
 from src.services.ranking_service import ranking_service
+from src.middleware.load_shedding import load_shedder
+from src.middleware.priority import background_priority, batch_priority
 from src.middleware.rate_limiter import rate_limiter
+from src.utils.stream_parsing import detect_format, iter_records
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +25,27 @@ router = APIRouter(prefix="/rank-candidates", tags=["Ranking"])
     status_code=status.HTTP_200_OK,
     summary="Rank multiple candidates",
     description="Evaluates multiple candidates and returns them ranked by score (highest to lowest).",
-    dependencies=[Depends(rate_limiter)]
+    dependencies=[Depends(rate_limiter), Depends(batch_priority), Depends(load_shedder)]
 )
-async def rank_candidates(request: RankingRequest) -> RankingResponse:
+async def rank_candidates(
+    request: RankingRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Retries with the same key return the first request's result"
+    )
+) -> RankingResponse:
     """
     Rank multiple candidates based on their answers.
     
     - **candidates**: List of candidates with id and answer (max 50)
+    - **refine_ties**: Optional pairwise refinement of tied top positions
+    - **question** / **reference_answers**: Optional reference answers used as
+      a similarity signal and tie-breaker
+    - **deadline_ms**: Optional time budget; candidates still being evaluated
+      when it expires are listed in pending_candidates
     
     Returns candidates sorted by score with evaluation details for each.
     """
@@ -42,11 +62,33 @@ async def rank_candidates(request: RankingRequest) -> RankingResponse:
             for candidate in request.candidates
         ]
         
-        # Call ranking service
-        result = await ranking_service.rank_candidates(candidates_data)
+        # Call ranking service (once per idempotency key)
+        result, replayed = await idempotency_store.run(
+            "rank-candidates",
+            idempotency_key,
+            request_fingerprint(request),
+            lambda: ranking_service.rank_candidates(
+                candidates_data,
+                refine_ties=request.refine_ties,
+                refine_top_k=request.refine_top_k,
+                question=request.question,
+                reference_answers=request.reference_answers,
+                deadline_ms=request.deadline_ms
+            )
+        )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        if result.get("partial"):
+            # A retry with the same key should pick up the finished evaluations
+            idempotency_store.forget("rank-candidates", idempotency_key)
         
         return RankingResponse(**result)
         
+    except IdempotencyKeyReused as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except ValueError as e:
         logger.warning(f"Validation error: {str(e)}")
         raise HTTPException(
@@ -59,3 +101,57 @@ async def rank_candidates(request: RankingRequest) -> RankingResponse:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to rank candidates. Please try again."
         )
+
+
+@router.post(
+    "/upload",
+    response_model=UploadRankingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Rank candidates from an uploaded CSV or JSONL file",
+    description=(
+        "Streams a CSV (header with id, answer and optional metadata columns) or JSONL "
+        "(one candidate object per line) request body. Rows are validated and evaluated "
+        "while the upload is in progress; invalid rows are reported without rejecting the file."
+    ),
+    dependencies=[Depends(rate_limiter), Depends(background_priority)]
+)
+async def rank_candidates_upload(
+    request: Request,
+    format: Optional[str] = Query(
+        None,
+        description="csv or jsonl; defaults to the request Content-Type"
+    ),
+    top_k: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Return only the top K ranked candidates"
+    )
+) -> UploadRankingResponse:
+    """
+    Rank candidates from a streamed file upload.
+    
+    Send the file as the raw request body with Content-Type `text/csv` or
+    `application/x-ndjson`.
+    """
+    try:
+        upload_format = detect_format(request.headers.get("content-type"), format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+    
+    try:
+        logger.info(f"Received streaming {upload_format} ranking upload")
+        
+        records = iter_records(request.stream(), upload_format, settings.UPLOAD_MAX_LINE_BYTES)
+        result = await ranking_service.rank_stream(records, top_k=top_k)
+        
+        return UploadRankingResponse(**result)
+        
+    except Exception as e:
+        logger.error(f"Upload ranking error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to rank uploaded candidates. Please try again."
+        )
@@ -0,0 +1,192 @@
+"""
+API routes for named, incrementally maintained rankings.
+"""
+import logging
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from src.schemas.cohort_stats import CohortStatsResponse
+from src.schemas.ranking import (
+    AddCandidatesRequest,
+    AddCandidatesResponse,
+    RankedCandidate,
+    RankingPageResponse,
+)
+from src.services.ranking_service import ranking_service
+from src.services.ranking_store import ranking_store
+from src.middleware.priority import batch_priority
+from src.middleware.rate_limiter import rate_limiter
+from src.utils.http_caching import conditional_json_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/rankings", tags=["Rankings"])
+
+
+async def _get_ranking_or_404(name: str):
+    """Look up a ranking, translating invalid or unknown names to HTTP errors."""
+    try:
+        ranking = await ranking_store.get(name)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if ranking is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ranking '{name}' not found"
+        )
+    return ranking
+
+
+@router.get(
+    "",
+    response_model=List[str],
+    summary="List named rankings"
+)
+async def list_rankings() -> List[str]:
+    """Return the names of all stored rankings."""
+    return ranking_store.list_names()
+
+
+@router.post(
+    "/{name}/candidates",
+    response_model=AddCandidatesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Add candidates to a named ranking",
+    description="Evaluates only the new candidates and inserts them into the maintained ranking, creating it if needed.",
+    dependencies=[Depends(rate_limiter), Depends(batch_priority)]
+)
+async def add_candidates(name: str, request: AddCandidatesRequest) -> AddCandidatesResponse:
+    """
+    Add candidates to a named ranking.
+    
+    - **candidates**: Candidates with id and answer (max 50 per request)
+    - **replace_existing**: Re-evaluate candidates whose id already exists
+    """
+    try:
+        ranking_store.validate_name(name)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        logger.info(f"Received {len(request.candidates)} candidates for ranking '{name}'")
+        
+        candidates_data = [
+            {
+                "id": candidate.id,
+                "answer": candidate.answer,
+                "metadata": candidate.metadata
+            }
+            for candidate in request.candidates
+        ]
+        
+        result = await ranking_service.add_to_ranking(
+            name,
+            candidates_data,
+            replace_existing=request.replace_existing
+        )
+        
+        return AddCandidatesResponse(**result)
+        
+    except Exception as e:
+        logger.error(f"Ranking update error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update ranking. Please try again."
+        )
+
+
+@router.get(
+    "/{name}",
+    response_model=RankingPageResponse,
+    summary="Read a page of a named ranking",
+    description=(
+        "Returns ranked candidates from the maintained index without any re-evaluation. "
+        "Responses carry an ETag; send it back in If-None-Match to get 304 when unchanged."
+    ),
+    responses={304: {"description": "Page unchanged since the ETag in If-None-Match"}}
+)
+async def get_ranking(
+    name: str,
+    request: Request,
+    offset: int = Query(0, ge=0, description="Number of leading positions to skip"),
+    limit: int = Query(20, ge=1, le=500, description="Maximum candidates to return")
+) -> Response:
+    """Return positions offset+1 .. offset+limit of a named ranking."""
+    ranking = await _get_ranking_or_404(name)
+    return conditional_json_response(request, RankingPageResponse(
+        name=name,
+        total_candidates=len(ranking),
+        offset=offset,
+        limit=limit,
+        ranked_candidates=ranking.page(offset, limit)
+    ))
+
+
+@router.get(
+    "/{name}/stats",
+    response_model=CohortStatsResponse,
+    summary="Score statistics for a named ranking",
+    description=(
+        "Score histogram, mean and percentiles of the ranking's current candidates, maintained "
+        "as candidates are added and removed. With `score`, also returns where that score ranks."
+    )
+)
+async def get_ranking_stats(
+    name: str,
+    score: Optional[int] = Query(None, ge=1, le=5, description="Score to place within the ranking")
+) -> CohortStatsResponse:
+    """Return a named ranking's score distribution."""
+    histogram = (await _get_ranking_or_404(name)).histogram
+    return CohortStatsResponse(
+        cohort_id=name,
+        **histogram.to_dict(),
+        position=histogram.position(score) if score is not None else None
+    )
+
+
+@router.get(
+    "/{name}/candidates/{candidate_id}",
+    response_model=RankedCandidate,
+    summary="Get one candidate's position in a named ranking",
+    responses={304: {"description": "Candidate unchanged since the ETag in If-None-Match"}}
+)
+async def get_ranked_candidate(name: str, candidate_id: str, request: Request) -> Response:
+    """Return a single candidate with its current rank."""
+    ranking = await _get_ranking_or_404(name)
+    if candidate_id not in ranking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidate '{candidate_id}' not found in ranking '{name}'"
+        )
+    return conditional_json_response(
+        request,
+        RankedCandidate(**ranking.entries[candidate_id], rank=ranking.rank_of(candidate_id))
+    )
+
+
+@router.delete(
+    "/{name}/candidates/{candidate_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Remove a candidate from a named ranking"
+)
+async def remove_candidate(name: str, candidate_id: str) -> Response:
+    """Remove a candidate; remaining ranks shift without re-evaluation."""
+    await _get_ranking_or_404(name)
+    if not await ranking_store.remove(name, candidate_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidate '{candidate_id}' not found in ranking '{name}'"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.delete(
+    "/{name}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a named ranking"
+)
+async def delete_ranking(name: str) -> Response:
+    """Delete a ranking and its stored data."""
+    await _get_ranking_or_404(name)
+    await ranking_store.delete(name)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
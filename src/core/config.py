@@ -3,7 +3,7 @@ Application configuration using Pydantic Settings.
 Loads environment variables from .env file.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Union
+from typing import Dict, List, Set, Union
 
 
 class Settings(BaseSettings):
@@ -20,8 +20,131 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str = "gemini-2.5-flash"
     GEMINI_TIMEOUT: int = 30  # seconds
     
+    # Model cascade: a cheaper first pass, escalating only uncertain scores
+    CASCADE_ENABLED: bool = False
+    CASCADE_FAST_MODEL: str = "gemini-2.5-flash-lite"
+    CASCADE_FAST_MAX_OUTPUT_TOKENS: int = 256
+    CASCADE_BORDERLINE_SCORES: str = "2,3"  # Comma-separated scores always escalated
+    CASCADE_MIN_CONFIDENCE: float = 0.7  # Escalate fast-tier results below this confidence
+
+    # Self-consistency: several evaluations sampled in one call, median score returned
+    SELF_CONSISTENCY_SAMPLES: int = 1  # Samples per main-model evaluation; 1 = off
+    SELF_CONSISTENCY_TEMPERATURE: float = 0.7  # Sampling temperature when drawing several
+
+    # Model providers: gemini, openai (any OpenAI-compatible endpoint) or fake
+    EVALUATION_PROVIDER: str = "gemini"
+    RANKING_PROVIDER: str = ""  # Empty = same as EVALUATION_PROVIDER
+    PROVIDER_FALLBACKS: str = ""  # Comma-separated providers tried when the primary fails
+    PROVIDER_UNHEALTHY_AFTER: int = 3  # Consecutive failures before routing around a provider
+    PROVIDER_COOLDOWN_SECONDS: float = 30.0  # How long an unhealthy provider is skipped
+    OPENAI_COMPAT_BASE_URL: str = ""  # e.g. https://api.openai.com/v1 or http://localhost:8080/v1
+    OPENAI_COMPAT_API_KEY: str = ""
+    OPENAI_COMPAT_MODEL: str = "gpt-4o-mini"
+    FAKE_PROVIDER_LATENCY_MS: int = 0  # Simulated latency of the fake provider
+    FAKE_PROVIDER_CAPACITY: int = 0  # Calls in flight before the fake provider returns 429; 0 = unlimited
+
+    # Record/replay of model calls (EVALUATION_PROVIDER=replay serves a recorded cassette)
+    CASSETTE_RECORD: bool = False  # Record every provider call to CASSETTE_PATH
+    CASSETTE_PATH: str = "data/cassettes/model_calls.jsonl.gz"
+    CASSETTE_TIMING_SCALE: float = 1.0  # Replay latency multiplier: 1 = as recorded, 0 = instant
+    CASSETTE_REPLAY_MISS: str = "error"  # Unrecorded prompt: error, or cycle through recordings
+
+    # Answer compaction before prompting: whitespace, repeated lines, token budget
+    ANSWER_COMPACTION_ENABLED: bool = True
+    ANSWER_MAX_TOKENS: int = 0  # Estimated tokens kept per answer (start and end); 0 = unlimited (no truncation)
+
+    # Streaming cohort statistics (score histograms per question)
+    COHORT_STATS_MAX_QUESTIONS: int = 10000  # Questions tracked; least recently updated evicted first
+
+    # Pooled HTTP transport for model APIs
+    GEMINI_TRANSPORT: str = "http"  # http (pooled REST calls) or sdk (google-generativeai)
+    GEMINI_API_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta"
+    MODEL_HTTP2: bool = True  # Multiplex requests over HTTP/2 when h2 is installed
+    MODEL_HTTP_MAX_CONNECTIONS: int = 20
+    MODEL_HTTP_MAX_KEEPALIVE: int = 20  # Idle connections kept open for reuse
+    MODEL_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    MODEL_HTTP_CONNECT_TIMEOUT: float = 5.0  # seconds
+    MODEL_HTTP_WARMUP: bool = True  # Open connections at startup
+    MODEL_HTTP_WARMUP_CONNECTIONS: int = 2  # Per origin, when HTTP/2 is unavailable
+
+    # Scheduling of outbound model calls
+    MODEL_CONCURRENCY_LIMIT: int = 32  # Model calls in flight per worker (upper bound when adaptive)
+    ADAPTIVE_CONCURRENCY_ENABLED: bool = True  # Adjust the limit from backend latency, 429s and timeouts
+    ADAPTIVE_CONCURRENCY_INITIAL: int = 8
+    ADAPTIVE_CONCURRENCY_MIN: int = 1
+    ADAPTIVE_CONCURRENCY_BACKOFF: float = 0.7  # Multiplier applied on overload
+    ADAPTIVE_LATENCY_TOLERANCE: float = 2.0  # Latency above this multiple of the baseline counts as overload
+    PRIORITY_CLASSES: str = "interactive,batch,background"  # Highest first
+    PRIORITY_DEFAULT_CLASS: str = "batch"  # For model work outside a classified route
+    PRIORITY_AGING_MS: float = 2000.0  # Queued calls move up one class per interval waited
+    PRIORITY_HEADER: str = "X-Priority"  # Request header overriding a route's class; empty disables
+    FAIR_QUEUE_CLIENT_HEADER: str = "X-API-Key"  # Identifies the client; falls back to client IP
+    FAIR_QUEUE_WEIGHTS: str = ""  # Comma-separated client=weight pairs, e.g. "key-a=4,10.0.0.7=0.5"
+
+    # Load shedding for /evaluate-answer and /rank-candidates
+    LOAD_SHED_ENABLED: bool = True
+    LOAD_SHED_TARGETS_MS: str = "interactive=5000,batch=30000"  # Per class; unlisted classes are never shed
+    LOAD_SHED_MAX_RETRY_AFTER: int = 60  # seconds
+
+    # Token accounting: prices per million tokens, for spend in headers and metrics (0 = not reported)
+    TOKEN_PRICE_PROMPT_PER_MILLION: float = 0.0
+    TOKEN_PRICE_OUTPUT_PER_MILLION: float = 0.0
+    USAGE_CLIENT_LABELS: str = ""  # Comma-separated client ids reported by name in client_* metrics; others count as "other"
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 10
+
+    # Server (used by run.py / src.main launchers)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: int = 0  # 0 = derive from CPU count in production mode
+    SERVER_LOOP: str = "auto"  # auto, uvloop or asyncio
+    SERVER_HTTP: str = "auto"  # auto, httptools or h11
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT: int = 5  # seconds
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # seconds; also bounds draining of background work
+    SHUTDOWN_READINESS_DELAY: float = 0.0  # seconds /ready reports 503 before draining starts
+    STATE_DIR: str = "data/state"  # Caches and job state saved at shutdown, cohort journal ("" = disabled)
+
+    # Batch evaluation
+    BATCH_EVALUATION_CONCURRENCY: int = 10  # Concurrent evaluations per batch request
+    
+    # Live interviews (WebSocket)
+    LIVE_DEBOUNCE_MS: int = 600  # Pause in typing/transcription before a draft is evaluated
+    LIVE_MIN_DRAFT_CHARS: int = 40  # Shorter drafts are not evaluated speculatively
+    LIVE_REUSE_SIMILARITY: float = 0.95  # SimHash similarity for a final answer to reuse a draft's result
+    LIVE_SPECULATIVE_PRIORITY: str = "interactive"  # Priority class of speculative evaluations
+    
+    # Ranking
+    DEDUP_ENABLED: bool = True  # Evaluate one representative per near-duplicate cluster
+    DEDUP_SIMILARITY_THRESHOLD: float = 0.95  # SimHash similarity (0-1] to share a result
+    TIE_BREAK_TOP_K: int = 10  # Positions refined by pairwise comparison when requested
+    TIE_BREAK_MAX_COMPARISONS: int = 60  # Hard cap on compared pairs per ranking
+    TIE_BREAK_BATCH_SIZE: int = 10  # Pairs judged per model call
+    TIE_BREAK_CACHE_SIZE: int = 10000  # Cached pairwise judgements
+    
+    RANKING_CACHE_SIZE: int = 2000  # Answer evaluations reused across /rank-candidates requests
+    RANKING_CACHE_TTL_SECONDS: int = 900  # How long a cached ranking evaluation is reused
+    
+    RANKINGS_DIR: str = "data/rankings"  # Journals of named incremental rankings
+    REFERENCE_ANSWERS_PATH: str = "data/reference_answers.json"  # {"question": ["reference", ...]}
+    QUESTION_BANK_PATH: str = "data/question_bank.json"  # {"id": {"question", "context", "rubric"}}
+    
+    # Streaming ranking uploads
+    UPLOAD_CONCURRENCY: int = 10  # Evaluations in flight while the file is still uploading
+    UPLOAD_MAX_ROWS: int = 10000
+    UPLOAD_MAX_LINE_BYTES: int = 65536
+    UPLOAD_MAX_REPORTED_ERRORS: int = 100
+    
+    # Idempotency-Key handling for /evaluate-answer and /rank-candidates
+    IDEMPOTENCY_TTL_SECONDS: int = 3600  # How long a completed result is replayed
+    IDEMPOTENCY_MAX_KEYS: int = 10000  # Completed results kept per worker
+    
+    # Response compression (brotli when installed, otherwise gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Fast setting suited to dynamic responses
     
     # CORS Configuration - Fixed to handle string or list
     CORS_ORIGINS: Union[str, List[str]] = "*"
@@ -43,6 +166,51 @@ class Settings(BaseSettings):
                 return ["*"]
             return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
         return self.CORS_ORIGINS
+    
+    def get_cascade_borderline_scores(self) -> Set[int]:
+        """Parse the comma-separated scores that cascade mode always escalates."""
+        return {
+            int(score) for score in self.CASCADE_BORDERLINE_SCORES.split(",")
+            if score.strip()
+        }
+
+    def get_priority_classes(self) -> List[str]:
+        """Parse the comma-separated priority classes, highest first."""
+        return [name.strip() for name in self.PRIORITY_CLASSES.split(",") if name.strip()]
+
+    def get_usage_client_labels(self) -> List[str]:
+        """Parse the comma-separated client ids reported by name in usage metrics."""
+        return [client.strip() for client in self.USAGE_CLIENT_LABELS.split(",") if client.strip()]
+
+    def get_fair_queue_weights(self) -> Dict[str, float]:
+        """Parse the comma-separated client=weight pairs for fair queuing."""
+        weights = {}
+        for pair in self.FAIR_QUEUE_WEIGHTS.split(","):
+            client, _, weight = pair.rpartition("=")
+            if client.strip():
+                weights[client.strip()] = float(weight)
+        return weights
+
+    def get_load_shed_targets(self) -> Dict[str, float]:
+        """Parse the comma-separated class=milliseconds latency targets for load shedding."""
+        targets = {}
+        for pair in self.LOAD_SHED_TARGETS_MS.split(","):
+            priority, _, target_ms = pair.partition("=")
+            if priority.strip():
+                targets[priority.strip()] = float(target_ms)
+        return targets
+
+    def get_provider_fallbacks(self) -> List[str]:
+        """Parse the comma-separated provider fallback order."""
+        return [name.strip() for name in self.PROVIDER_FALLBACKS.split(",") if name.strip()]
+
+    def get_active_providers(self) -> List[str]:
+        """Every provider requests may be routed to."""
+        return [self.EVALUATION_PROVIDER, self.get_ranking_provider(), *self.get_provider_fallbacks()]
+
+    def get_ranking_provider(self) -> str:
+        """Provider used for ranking evaluations and tie-break comparisons."""
+        return self.RANKING_PROVIDER or self.EVALUATION_PROVIDER
 
 
 # Create global settings instance
@@ -0,0 +1,285 @@
+"""
+Process lifecycle: readiness, draining and graceful shutdown.
+
+Shutdown runs in this order:
+1. SIGTERM flips readiness to not-ready, so /ready returns 503 and load
+   balancers stop routing here, while requests are still served for
+   SHUTDOWN_READINESS_DELAY seconds
+2. New API work is rejected (503) and the server's own shutdown begins
+3. In-flight requests and tracked background work drain for up to
+   SERVER_GRACEFUL_TIMEOUT seconds; what is still running is cancelled
+4. Registered state (caches, job state) is saved to STATE_DIR and log
+   handlers are flushed; the state is loaded again at the next startup
+
+Each worker process saves its own state file, so workers shutting down
+together never overwrite each other; at startup every worker loads the
+files of all workers.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.core.config import settings
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+HANDLED_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+class Lifecycle:
+    """Readiness and draining state of this worker process."""
+
+    def __init__(self):
+        self.ready = True
+        self.draining = False
+        self.in_flight_requests = 0
+        self._drain_started_at: Optional[float] = None
+        self._background: Set[asyncio.Future] = set()
+        self._flush_hooks: List[Tuple[str, Callable[[], Any]]] = []
+        self._state: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {}
+        # State files loaded at startup, with the (st_ino, st_mtime_ns) they had
+        self._restored_files: Dict[Path, Tuple[int, int]] = {}
+
+    # Readiness and admission
+
+    @property
+    def state(self) -> str:
+        if self.draining:
+            return "draining"
+        return "ready" if self.ready else "not_ready"
+
+    def mark_not_ready(self) -> None:
+        """Fail readiness checks while still serving requests."""
+        if self.ready:
+            self.ready = False
+            logger.info("Readiness set to not ready")
+
+    def begin_drain(self) -> None:
+        """Stop admitting new work; in-flight work continues."""
+        self.mark_not_ready()
+        if not self.draining:
+            self.draining = True
+            self._drain_started_at = time.monotonic()
+            logger.info(
+                f"Draining: {self.in_flight_requests} request(s) and "
+                f"{len(self._background)} background task(s) in flight"
+            )
+
+    def reset(self) -> None:
+        """Return to the ready state (for tests and in-process restarts)."""
+        self.ready = True
+        self.draining = False
+        self._drain_started_at = None
+
+    # Work tracking
+
+    def track(self, task: asyncio.Future) -> asyncio.Future:
+        """Keep a background task in the drain set until it finishes."""
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def register_flush(self, name: str, hook: Callable[[], Any]) -> None:
+        """Run `hook` (sync or async) at shutdown after draining."""
+        self._flush_hooks.append((name, hook))
+
+    def register_state(self, name: str, dump: Callable[[], Any], load: Callable[[Any], None]) -> None:
+        """
+        Persist a component's state across restarts.
+
+        Every worker saves its own file, and `load` is called once for each
+        worker's file, so it must merge into the state already loaded. The
+        restored state is the union of all workers' states, which suits
+        caches and replayable results but not counters.
+
+        Args:
+            name: File name prefix under STATE_DIR
+            dump: Returns the JSON-serializable state, called at shutdown
+            load: Receives a saved state at startup
+        """
+        self._state[name] = (dump, load)
+
+    def restore(self, state_dir: str = None) -> None:
+        """Load every registered state saved by the previous workers."""
+        directory = self._state_dir(state_dir)
+        if directory is None:
+            return
+        for name, (_, load) in self._state.items():
+            for path in self._state_files(directory, name):
+                try:
+                    stat = path.stat()
+                    with open(path, "r", encoding="utf-8") as state_file:
+                        load(json.load(state_file))
+                    self._restored_files[path] = (stat.st_ino, stat.st_mtime_ns)
+                    logger.info(f"Restored {name} from {path}")
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to restore {name} from {path}: {str(e)}", exc_info=True)
+
+    def save(self, state_dir: str = None) -> None:
+        """
+        Write every registered state to this worker's file atomically
+        (unique temp file, then rename).
+
+        Files loaded at startup are removed afterwards, since their contents
+        are part of the state just saved; a file replaced since then is kept.
+        """
+        directory = self._state_dir(state_dir)
+        if directory is None:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        saved = set()
+        for name, (dump, _) in self._state.items():
+            path = directory / f"{name}.{os.getpid()}.json"
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as state_file:
+                    json.dump(dump(), state_file, default=str)
+                os.replace(temp_path, path)
+                saved.add(name)
+                logger.info(f"Saved {name} to {path}")
+            except Exception as e:
+                Path(temp_path).unlink(missing_ok=True)
+                logger.error(f"Failed to save {name}: {str(e)}", exc_info=True)
+
+        for name in saved:
+            for path in self._state_files(directory, name):
+                if path not in self._restored_files:
+                    continue
+                try:
+                    stat = path.stat()
+                    if (stat.st_ino, stat.st_mtime_ns) == self._restored_files[path]:
+                        path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def _state_files(directory: Path, name: str) -> List[Path]:
+        """A state's files, oldest first: one per worker, and `<name>.json` from single-file versions."""
+        paths = [
+            path for path in directory.glob(f"{name}.*.json")
+            if path.name[len(name) + 1:-len(".json")].isdigit()
+        ]
+        legacy = directory / f"{name}.json"
+        if legacy.exists():
+            paths.append(legacy)
+
+        def modified(path: Path) -> int:
+            try:
+                return path.stat().st_mtime_ns
+            except FileNotFoundError:
+                return 0
+
+        return sorted(paths, key=modified)
+
+    @staticmethod
+    def _state_dir(state_dir: Optional[str]) -> Optional[Path]:
+        state_dir = settings.STATE_DIR if state_dir is None else state_dir
+        return Path(state_dir) if state_dir else None
+
+    # Shutdown
+
+    async def drain(self, grace_seconds: float = None) -> Dict[str, int]:
+        """
+        Wait for in-flight requests and background tasks to finish.
+
+        The grace period counts from the start of draining. Background
+        tasks still running when it ends are cancelled.
+
+        Returns:
+            Counts of requests still in flight and tasks cancelled
+        """
+        self.begin_drain()
+        grace_seconds = settings.SERVER_GRACEFUL_TIMEOUT if grace_seconds is None else grace_seconds
+        deadline = self._drain_started_at + grace_seconds
+
+        while (self.in_flight_requests or self._background) and time.monotonic() < deadline:
+            pending = [task for task in self._background if not task.done()]
+            if pending:
+                await asyncio.wait(pending, timeout=min(0.1, max(0.0, deadline - time.monotonic())))
+            else:
+                await asyncio.sleep(0.05)
+
+        cancelled = [task for task in self._background if not task.done()]
+        for task in cancelled:
+            task.cancel()
+        if cancelled:
+            await asyncio.gather(*cancelled, return_exceptions=True)
+            logger.warning(f"Cancelled {len(cancelled)} background task(s) after the grace period")
+
+        metrics.increment("shutdown_cancelled_tasks", len(cancelled))
+        return {"requests_in_flight": self.in_flight_requests, "tasks_cancelled": len(cancelled)}
+
+    async def flush(self) -> None:
+        """Run every flush hook and save state; failures are logged and do not stop the others."""
+        for name, hook in self._flush_hooks:
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+                logger.info(f"Flushed {name}")
+            except Exception as e:
+                logger.error(f"Failed to flush {name}: {str(e)}", exc_info=True)
+        self.save()
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
+    async def shutdown(self, grace_seconds: float = None) -> Dict[str, int]:
+        """Drain, then flush. Returns the drain summary."""
+        summary = await self.drain(grace_seconds)
+        await self.flush()
+        logger.info(f"Shutdown complete: {summary}")
+        return summary
+
+    def install_signal_handlers(self) -> None:
+        """
+        Put readiness in front of the server's own signal handling.
+
+        On the first SIGTERM/SIGINT readiness flips immediately; the
+        server's handler (which stops accepting connections) runs after
+        SHUTDOWN_READINESS_DELAY, together with begin_drain(). A second
+        signal skips the delay.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+
+        for sig in HANDLED_SIGNALS:
+            previous = signal.getsignal(sig)
+            if not callable(previous):
+                continue
+
+            def handle(signum, frame, previous=previous):
+                def hand_over():
+                    self.begin_drain()
+                    previous(signum, frame)
+
+                if not self.ready:
+                    loop.call_soon_threadsafe(hand_over)
+                    return
+                self.mark_not_ready()
+                loop.call_soon_threadsafe(loop.call_later, settings.SHUTDOWN_READINESS_DELAY, hand_over)
+
+            signal.signal(sig, handle)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "in_flight_requests": self.in_flight_requests,
+            "background_tasks": len(self._background),
+        }
+
+
+# Create global lifecycle instance
+lifecycle = Lifecycle()
+metrics.register_collector("lifecycle", lifecycle.snapshot)
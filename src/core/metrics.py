@@ -0,0 +1,78 @@
+"""
+In-process metrics registry.
+Counters, value summaries and on-demand collectors, exposed as JSON at /metrics.
+"""
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> str:
+    """Stable string form of a label set, e.g. 'route=/x,tier=fast'."""
+    if not labels:
+        return ""
+    return ",".join(f"{key}={labels[key]}" for key in sorted(labels))
+
+
+class MetricsRegistry:
+    """
+    Minimal metrics registry for a single worker process.
+
+    - Counters: monotonically increasing totals
+    - Summaries: count, sum, min and max of observed values
+    - Collectors: callables evaluated when a snapshot is taken, for values
+      that live elsewhere (pool usage, current limits, derived rates)
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._summaries: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        self._collectors: Dict[str, Callable[[], Any]] = {}
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Add to a counter."""
+        self._counters[name][_label_key(labels)] += value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Record a value in a summary."""
+        key = _label_key(labels)
+        summary = self._summaries[name].get(key)
+        if summary is None:
+            self._summaries[name][key] = {"count": 1, "sum": value, "min": value, "max": value}
+            return
+        summary["count"] += 1
+        summary["sum"] += value
+        summary["min"] = min(summary["min"], value)
+        summary["max"] = max(summary["max"], value)
+
+    def counter_value(self, name: str, labels: Optional[Dict[str, Any]] = None) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        counter = self._counters.get(name)
+        return counter.get(_label_key(labels), 0.0) if counter else 0.0
+
+    def register_collector(self, name: str, collector: Callable[[], Any]) -> None:
+        """Register a callable whose return value is included in snapshots."""
+        self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        summaries = {
+            name: {
+                key: {**summary, "avg": summary["sum"] / summary["count"]}
+                for key, summary in by_label.items()
+            }
+            for name, by_label in self._summaries.items()
+        }
+        return {
+            "counters": {name: dict(by_label) for name, by_label in self._counters.items()},
+            "summaries": summaries,
+            "collectors": {name: collector() for name, collector in self._collectors.items()},
+        }
+
+    def reset(self) -> None:
+        """Clear counters and summaries (collectors stay registered)."""
+        self._counters.clear()
+        self._summaries.clear()
+
+
+# Create global metrics registry
+metrics = MetricsRegistry()
@@ -0,0 +1,99 @@
+"""
+Uvicorn launcher configuration.
+Builds development and production server settings from Settings.
+"""
+import importlib.util
+import os
+from typing import Any, Dict
+
+from src.core.config import settings
+
+APP_IMPORT_STRING = "src.main:app"
+
+
+def resolve_workers(workers: int = None) -> int:
+    """Return the worker count, deriving it from the CPU count when unset."""
+    workers = settings.WORKERS if workers is None else workers
+    if workers and workers > 0:
+        return workers
+    return os.cpu_count() or 1
+
+
+def resolve_loop(loop: str = None) -> str:
+    """Pick the event loop implementation, preferring uvloop when installed."""
+    loop = loop or settings.SERVER_LOOP
+    if loop != "auto":
+        return loop
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def resolve_http(http: str = None) -> str:
+    """Pick the HTTP parser implementation, preferring httptools when installed."""
+    http = http or settings.SERVER_HTTP
+    if http != "auto":
+        return http
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def build_server_config(production: bool) -> Dict[str, Any]:
+    """
+    Build keyword arguments for uvicorn.run.
+
+    Args:
+        production: Multi-worker mode without reload when True,
+            single-process auto-reload mode otherwise
+
+    Returns:
+        Dict of uvicorn.run keyword arguments (without the app)
+    """
+    config: Dict[str, Any] = {
+        "host": settings.HOST,
+        "port": settings.PORT,
+    }
+
+    if not production:
+        config["reload"] = True
+        return config
+
+    config.update({
+        "workers": resolve_workers(),
+        "loop": resolve_loop(),
+        "http": resolve_http(),
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_TIMEOUT,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        "access_log": False,
+    })
+    return config
+
+
+def resolve_app_target(config: Dict[str, Any]) -> Any:
+    """
+    Return the app object or import string to hand to uvicorn.
+
+    The app is always imported up front so configuration errors fail fast
+    in the launcher. A single worker without reload reuses that preloaded
+    object; reload and multi-worker modes need the import string because
+    each process imports the app itself.
+    """
+    from src.main import app
+
+    if config.get("reload") or config.get("workers", 1) > 1:
+        return APP_IMPORT_STRING
+    return app
+
+
+def describe_concurrency(config: Dict[str, Any]) -> str:
+    """Human-readable summary of the effective server concurrency."""
+    if config.get("reload"):
+        return "development mode: 1 process with auto-reload"
+
+    workers = config.get("workers", 1)
+    return (
+        f"{workers} worker process{'es' if workers != 1 else ''} "
+        f"({os.cpu_count() or 1} CPUs), "
+        f"loop={config['loop']}, http={config['http']}, "
+        f"backlog={config['backlog']}, "
+        f"keep-alive={config['timeout_keep_alive']}s, "
+        f"graceful-shutdown={config['timeout_graceful_shutdown']}s"
+    )
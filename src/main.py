@@ -11,8 +11,14 @@ from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 
 from src.core.config import settings
+from src.core.lifecycle import lifecycle
 from src.core.logging import setup_logging
+from src.core.metrics import metrics
+from src.services.providers import model_transport, provider_registry
 from src.api.v1.routes import api_router
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.draining import DrainingMiddleware
+from src.middleware.usage import UsageAccountingMiddleware
 from src.middleware.error_handler import (
     validation_exception_handler,
     global_exception_handler
@@ -30,9 +36,18 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"Using Gemini model: {settings.GEMINI_MODEL}")
+    logger.info(f"Evaluation provider: {settings.EVALUATION_PROVIDER}")
+    if settings.MODEL_HTTP_WARMUP:
+        await model_transport.start(provider_registry.warmup_urls(settings.get_active_providers()))
+    lifecycle.reset()
+    lifecycle.restore()
+    lifecycle.install_signal_handlers()
     yield
-    # Shutdown
+    # Shutdown: the server has stopped accepting connections by now
     logger.info("Shutting down application")
+    await lifecycle.shutdown()
+    await provider_registry.close()
+    await model_transport.close()
 
 
 # Create FastAPI application
@@ -55,6 +70,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Token usage accounting per request
+app.add_middleware(UsageAccountingMiddleware)
+
+# In-flight request tracking; rejects new API work during shutdown
+app.add_middleware(DrainingMiddleware)
+
+# Response compression (outermost, so every response is eligible)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(ValidationError, validation_exception_handler)
@@ -83,6 +108,35 @@ async def health_check():
     )
 
 
+# Readiness endpoint
+@app.get(
+    "/ready",
+    tags=["Health"],
+    status_code=status.HTTP_200_OK,
+    summary="Readiness check",
+    description="503 once shutdown has begun, so load balancers stop routing here"
+)
+async def readiness_check():
+    """Readiness endpoint."""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if lifecycle.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": lifecycle.state, "in_flight_requests": lifecycle.in_flight_requests}
+    )
+
+
+# Metrics endpoint
+@app.get(
+    "/metrics",
+    tags=["Health"],
+    status_code=status.HTTP_200_OK,
+    summary="Service metrics",
+    description="In-process counters and summaries for this worker"
+)
+async def get_metrics():
+    """Metrics snapshot endpoint."""
+    return JSONResponse(content=metrics.snapshot())
+
+
 # Root endpoint
 @app.get(
     "/",
@@ -105,9 +159,11 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "src.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.DEBUG
-    )
+    from src.core.server import APP_IMPORT_STRING, build_server_config, describe_concurrency
+
+    server_config = build_server_config(production=not settings.DEBUG)
+    logger.info(f"Server concurrency: {describe_concurrency(server_config)}")
+
+    # This module is already loaded as __main__; reuse it unless workers must import it
+    single_process = not server_config.get("reload") and server_config.get("workers", 1) == 1
+    uvicorn.run(app if single_process else APP_IMPORT_STRING, **server_config)
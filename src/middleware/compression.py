@@ -0,0 +1,178 @@
+"""
+Response compression middleware with gzip and brotli negotiation.
+"""
+import logging
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # Optional: fall back to gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Already-compressed or binary payloads gain nothing from another pass
+_COMPRESSIBLE_PREFIXES = ("text/", "application/json", "application/xml", "application/javascript")
+
+
+def supported_encodings() -> tuple:
+    """Encodings this server can produce, in preference order."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the preferred supported encoding from an Accept-Encoding header.
+
+    Codings with q=0 are refused; `*` covers codings not listed explicitly.
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    candidates = [
+        (weights.get(coding, weights.get("*", 0.0)), -position, coding)
+        for position, coding in enumerate(supported_encodings())
+    ]
+    quality, _, coding = max(candidates)
+    return coding if quality > 0 else None
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor with a common interface."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits=31 selects the gzip container
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies when the client accepts it and the body is
+    large enough to benefit.
+
+    Single-message bodies below COMPRESSION_MIN_SIZE are sent as-is;
+    streamed bodies are compressed chunk by chunk. Strong ETags become weak,
+    since the compressed bytes differ from the identity representation.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """ASGI send wrapper that decides per response whether to compress."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not self._should_compress(body, more_body):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding)
+            compressed = self.compressor.compress(body)
+            if not more_body:
+                compressed += self.compressor.finish()
+            self._prepare_headers(len(compressed) if not more_body else None)
+            metrics.increment("compressed_responses", labels={"encoding": self.encoding})
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            metrics.increment("compression_bytes_in", len(body))
+            metrics.increment("compression_bytes_out", len(compressed))
+            return
+
+        compressed = self.compressor.compress(body)
+        if not more_body:
+            compressed += self.compressor.finish()
+        metrics.increment("compression_bytes_in", len(body))
+        metrics.increment("compression_bytes_out", len(compressed))
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _should_compress(self, body: bytes, more_body: bool) -> bool:
+        headers = Headers(raw=self.start_message["headers"])
+        if "content-encoding" in headers or self.start_message["status"] in (204, 304):
+            return False
+        if not headers.get("content-type", "").startswith(_COMPRESSIBLE_PREFIXES):
+            return False
+        # Streamed bodies are compressed regardless of their first chunk's size
+        return more_body or len(body) >= self.minimum_size
+
+    def _prepare_headers(self, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
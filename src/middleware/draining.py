@@ -0,0 +1,56 @@
+"""
+Middleware that stops admitting API work while the process drains.
+"""
+import json
+import logging
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.lifecycle import Lifecycle, lifecycle as default_lifecycle
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DrainingMiddleware:
+    """
+    Count in-flight HTTP requests and, once draining has started, reject new
+    API requests with 503, Retry-After and `Connection: close` so clients
+    retry against another instance.
+
+    Requests outside API_V1_PREFIX (/health, /ready, /metrics) are always
+    served so probes keep working during shutdown.
+    """
+
+    def __init__(self, app: ASGIApp, lifecycle: Lifecycle = None):
+        self.app = app
+        self.lifecycle = lifecycle or default_lifecycle
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.lifecycle.draining and scope["path"].startswith(settings.API_V1_PREFIX):
+            metrics.increment("draining_rejected_requests")
+            logger.info("Rejecting request while draining", extra={"path": scope["path"]})
+            body = json.dumps({"detail": "Server is shutting down. Please retry."}).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"retry-after", b"1"),
+                    (b"connection", b"close"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        self.lifecycle.in_flight_requests += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.lifecycle.in_flight_requests -= 1
@@ -0,0 +1,61 @@
+"""
+Admission control: reject work that cannot finish within its latency target.
+"""
+import logging
+import math
+
+from fastapi import HTTPException, Request, status
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.services.scheduler import ModelCallScheduler, current_priority, model_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class LoadShedder:
+    """
+    Rejects a request with 503 before any model call is made when its first
+    call is expected to complete after the latency target of its priority
+    class (LOAD_SHED_TARGETS_MS).
+
+    Expected completion is the scheduler's estimated queue wait for the
+    class plus one average call. Retry-After is the time the queue needs to
+    drain back under the target. Must run after the priority classifier.
+    """
+
+    def __init__(self, scheduler: ModelCallScheduler = None):
+        self.scheduler = scheduler or model_scheduler
+
+    async def __call__(self, request: Request) -> None:
+        """Admit the request or raise 503 with Retry-After."""
+        if not settings.LOAD_SHED_ENABLED:
+            return
+
+        priority = self.scheduler.resolve_priority(current_priority.get())
+        target_ms = settings.get_load_shed_targets().get(priority)
+        if target_ms is None or self.scheduler.hold_time_ms is None:
+            return
+
+        expected_ms = self.scheduler.estimated_wait_ms(priority) + self.scheduler.hold_time_ms
+        if expected_ms <= target_ms:
+            return
+
+        retry_after = min(
+            settings.LOAD_SHED_MAX_RETRY_AFTER,
+            max(1, math.ceil((expected_ms - target_ms) / 1000))
+        )
+        metrics.increment("load_shed_requests", labels={"route": request.url.path, "priority": priority})
+        logger.warning(
+            f"Shedding request: expected {expected_ms:.0f}ms exceeds {priority} target {target_ms:.0f}ms",
+            extra={"path": request.url.path, "retry_after": retry_after}
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Service overloaded. Please retry in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+# Create global load shedder instance
+load_shedder = LoadShedder()
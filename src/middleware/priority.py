@@ -0,0 +1,80 @@
+"""
+Route dependency that classifies a request's model work: its priority class
+and the client it is accounted to for fair queuing.
+"""
+import hashlib
+import logging
+
+from fastapi import HTTPException, Request, status
+
+from src.core.config import settings
+from src.middleware.rate_limiter import rate_limiter
+from src.services.scheduler import ClientShare, current_client, current_priority
+from src.services.usage import current_usage
+
+logger = logging.getLogger(__name__)
+
+
+def identify_client(request: Request) -> ClientShare:
+    """
+    Client a request's model work is accounted to.
+
+    Requests carrying the FAIR_QUEUE_CLIENT_HEADER (an API key) are grouped
+    by a digest of its value, so the key itself never appears in metrics;
+    other requests are grouped by client IP. FAIR_QUEUE_WEIGHTS may name
+    either the raw key, its digest id or the IP.
+    """
+    api_key = (
+        request.headers.get(settings.FAIR_QUEUE_CLIENT_HEADER)
+        if settings.FAIR_QUEUE_CLIENT_HEADER else None
+    )
+    if api_key:
+        raw = api_key.strip()
+        client_id = f"key-{hashlib.blake2b(raw.encode('utf-8'), digest_size=6).hexdigest()}"
+    else:
+        raw = client_id = rate_limiter._get_client_ip(request)
+
+    weights = settings.get_fair_queue_weights()
+    weight = weights.get(raw, weights.get(client_id, 1.0))
+    return ClientShare(client_id, weight)
+
+
+class PriorityClassifier:
+    """
+    Sets the priority class and client used by the model-call scheduler
+    (and by usage accounting).
+
+    Each route declares its default class; clients may choose another class
+    with the PRIORITY_HEADER request header.
+    """
+
+    def __init__(self, default: str):
+        self.default = default
+
+    async def __call__(self, request: Request) -> None:
+        """Record the request's priority class and client for downstream model calls."""
+        priority = self.default
+        requested = request.headers.get(settings.PRIORITY_HEADER) if settings.PRIORITY_HEADER else None
+        if requested:
+            priority = requested.strip().lower()
+            if priority not in settings.get_priority_classes():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"Unknown priority class '{requested}'. "
+                        f"Available: {', '.join(settings.get_priority_classes())}"
+                    )
+                )
+        client = identify_client(request)
+        current_priority.set(priority)
+        current_client.set(client)
+        usage = current_usage.get()
+        if usage is not None:
+            usage.client = client.id
+        logger.debug(f"Request priority class: {priority}, client: {client.id}")
+
+
+# Route defaults
+interactive_priority = PriorityClassifier("interactive")
+batch_priority = PriorityClassifier("batch")
+background_priority = PriorityClassifier("background")
@@ -0,0 +1,47 @@
+"""
+Middleware that accounts model token usage to each request.
+"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services.usage import RequestUsage, current_usage, record_request_usage
+
+logger = logging.getLogger(__name__)
+
+
+class UsageAccountingMiddleware:
+    """
+    Give every HTTP request a usage tracker, report its totals in response
+    headers (X-Model-Calls, X-Prompt-Tokens, X-Output-Tokens,
+    X-Total-Tokens) and aggregate them per route and client.
+
+    Requests that made no model calls are left untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = RequestUsage()
+        token = current_usage.set(tracker)
+
+        async def send_with_usage(message: Message) -> None:
+            if message["type"] == "http.response.start" and tracker.calls:
+                headers = MutableHeaders(scope=message)
+                for name, value in tracker.headers().items():
+                    headers[name] = value
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_usage)
+        finally:
+            current_usage.reset(token)
+            if tracker.calls:
+                route = scope.get("route")
+                record_request_usage(getattr(route, "path", scope["path"]), tracker)
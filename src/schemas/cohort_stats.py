@@ -0,0 +1,58 @@
+"""
+Pydantic schemas for cohort statistics endpoints.
+"""
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+
+class ScorePosition(BaseModel):
+    """Where a score falls within a cohort."""
+    
+    score: int = Field(..., ge=1, le=5)
+    rank_best: int = Field(..., ge=1, description="Best rank shared by candidates with this score (1 = top)")
+    rank_worst: int = Field(..., ge=1, description="Worst rank shared by candidates with this score")
+    percentile_rank: Optional[float] = Field(
+        None,
+        description="Percent of the cohort scoring lower, counting equal scores as half"
+    )
+
+
+class CohortStatsResponse(BaseModel):
+    """Score distribution of a cohort (a question or a named ranking)."""
+    
+    cohort_id: str
+    question: Optional[str] = Field(None, description="Question text (truncated) for question cohorts")
+    count: int = Field(..., ge=0, description="Scores recorded")
+    mean: Optional[float] = None
+    stddev: Optional[float] = None
+    histogram: Dict[str, int] = Field(..., description="Number of candidates per score")
+    percentiles: Dict[str, Optional[int]] = Field(..., description="Nearest-rank percentiles (p10 … p90)")
+    position: Optional[ScorePosition] = Field(
+        None,
+        description="Standing of the score given in the `score` query parameter"
+    )
+    
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "cohort_id": "py-decorators",
+                    "question": None,
+                    "count": 1250,
+                    "mean": 3.28,
+                    "stddev": 1.06,
+                    "histogram": {"1": 60, "2": 240, "3": 390, "4": 410, "5": 150},
+                    "percentiles": {"p10": 2, "p25": 3, "p50": 3, "p75": 4, "p90": 5},
+                    "position": {"score": 4, "rank_best": 151, "rank_worst": 560, "percentile_rank": 71.6}
+                }
+            ]
+        }
+    }
+
+
+class CohortSummary(BaseModel):
+    """A question cohort and its size."""
+    
+    cohort_id: str
+    question: Optional[str] = None
+    count: int = Field(..., ge=0)
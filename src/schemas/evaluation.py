@@ -1,8 +1,8 @@
 """
 Pydantic schemas for evaluation endpoints.
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Annotated, Dict, List, Optional
 from datetime import datetime
 
 
@@ -25,6 +25,19 @@ class EvaluationRequest(BaseModel):
         max_length=2000,
         description="Optional: Additional context for evaluation"
     )
+    question_id: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=100,
+        description="Optional: Question bank id; supplies the question, context and rubric"
+    )
+    samples: Optional[int] = Field(
+        None,
+        ge=1,
+        le=8,
+        description="Optional: Evaluations sampled in one model call; the median score is returned "
+                    "(default SELF_CONSISTENCY_SAMPLES)"
+    )
     
     @field_validator('candidate_answer')
     @classmethod
@@ -34,6 +47,13 @@ class EvaluationRequest(BaseModel):
             raise ValueError("candidate_answer cannot be empty or whitespace")
         return v.strip()
     
+    @model_validator(mode='after')
+    def validate_single_source(self) -> 'EvaluationRequest':
+        """Ensure a bank question is not combined with inline question text."""
+        if self.question_id is not None and (self.question is not None or self.context is not None):
+            raise ValueError("Provide either question_id or question/context, not both")
+        return self
+    
     model_config = {
         "json_schema_extra": {
             "examples": [
@@ -47,11 +67,74 @@ class EvaluationRequest(BaseModel):
     }
 
 
+class TokenUsage(BaseModel):
+    """Model tokens consumed by an evaluation."""
+    
+    prompt_tokens: int = Field(..., ge=0)
+    output_tokens: int = Field(..., ge=0)
+    total_tokens: int = Field(..., ge=0)
+    estimated: bool = Field(
+        False,
+        description="True when the provider reported no usage and it was estimated locally"
+    )
+
+
+class AnswerCompaction(BaseModel):
+    """How much the answer shrank before it was sent to the model."""
+    
+    original_chars: int = Field(..., ge=0)
+    chars: int = Field(..., ge=0, description="Characters of the answer as sent to the model")
+    original_tokens: int = Field(..., ge=0, description="Estimated tokens of the submitted answer")
+    tokens: int = Field(..., ge=0, description="Estimated tokens of the answer as sent to the model")
+    lines_collapsed: int = Field(0, ge=0, description="Repeated or near-identical lines removed")
+    truncated: bool = Field(
+        False,
+        description="True when the middle of the answer was cut to fit ANSWER_MAX_TOKENS"
+    )
+    compaction_ms: float = Field(0.0, ge=0, description="Time spent compacting")
+
+
+class SelfConsistency(BaseModel):
+    """How several sampled evaluations of one answer agreed."""
+    
+    requested: int = Field(..., ge=1, description="Samples requested in the model call")
+    samples: int = Field(..., ge=1, description="Samples parsed and aggregated")
+    unparsed: int = Field(0, ge=0, description="Samples skipped because they could not be parsed")
+    scores: List[int] = Field(..., description="Score of each parsed sample")
+    agreement: float = Field(..., ge=0, le=1, description="Share of samples that gave the median score")
+    spread: int = Field(..., ge=0, description="Highest minus lowest sampled score")
+
+
 class EvaluationMetadata(BaseModel):
     """Metadata for evaluation response."""
     
     model: str = Field(..., description="AI model used for evaluation")
+    provider: Optional[str] = Field(None, description="Model provider that served the evaluation")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+    tier: Optional[str] = Field(
+        None,
+        description="Cascade tier that produced the score (fast or strong), when cascade mode is on"
+    )
+    escalation_reason: Optional[str] = Field(
+        None,
+        description="Why the fast tier's result was escalated to the strong model"
+    )
+    usage: Optional[TokenUsage] = Field(
+        None,
+        description="Tokens used, including both tiers when a cascade evaluation escalated"
+    )
+    compaction: Optional[AnswerCompaction] = Field(
+        None,
+        description="Answer size before and after compaction, when compaction is enabled"
+    )
+    self_consistency: Optional[SelfConsistency] = Field(
+        None,
+        description="Sampled scores and their agreement, when several samples were drawn"
+    )
+    cohort_id: Optional[str] = Field(
+        None,
+        description="Cohort whose statistics include this score (GET /api/v1/cohorts/questions/{cohort_id})"
+    )
 
 
 class EvaluationResponse(BaseModel):
@@ -98,3 +181,140 @@ class EvaluationResponse(BaseModel):
             ]
         }
     }
+
+
+SharedQuestionText = Annotated[str, Field(min_length=1, max_length=1000)]
+SharedContextText = Annotated[str, Field(min_length=1, max_length=2000)]
+
+
+class BatchEvaluationItem(BaseModel):
+    """A single answer within a batch evaluation request."""
+    
+    id: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=100,
+        description="Optional client identifier echoed back in the result"
+    )
+    candidate_answer: str = Field(
+        ...,
+        min_length=1,
+        max_length=5000,
+        description="The candidate's answer to evaluate"
+    )
+    question: Optional[str] = Field(
+        None,
+        max_length=1000,
+        description="Optional: Inline interview question"
+    )
+    question_ref: Optional[str] = Field(
+        None,
+        description="Optional: Key into the request's shared `questions`"
+    )
+    context: Optional[str] = Field(
+        None,
+        max_length=2000,
+        description="Optional: Inline evaluation context"
+    )
+    context_ref: Optional[str] = Field(
+        None,
+        description="Optional: Key into the request's shared `contexts`"
+    )
+    
+    @field_validator('candidate_answer')
+    @classmethod
+    def validate_answer_not_empty(cls, v: str) -> str:
+        """Ensure answer is not just whitespace."""
+        if not v or not v.strip():
+            raise ValueError("candidate_answer cannot be empty or whitespace")
+        return v.strip()
+    
+    @model_validator(mode='after')
+    def validate_single_source(self) -> 'BatchEvaluationItem':
+        """Ensure inline text and shared references are not both given."""
+        if self.question is not None and self.question_ref is not None:
+            raise ValueError("Provide either question or question_ref, not both")
+        if self.context is not None and self.context_ref is not None:
+            raise ValueError("Provide either context or context_ref, not both")
+        return self
+
+
+class BatchEvaluationRequest(BaseModel):
+    """Request schema for evaluating many independent answers."""
+    
+    questions: Dict[str, SharedQuestionText] = Field(
+        default_factory=dict,
+        description="Shared question texts referenced by items via question_ref"
+    )
+    contexts: Dict[str, SharedContextText] = Field(
+        default_factory=dict,
+        description="Shared context texts referenced by items via context_ref"
+    )
+    items: List[BatchEvaluationItem] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Answers to evaluate (max 100)"
+    )
+    
+    @model_validator(mode='after')
+    def validate_references(self) -> 'BatchEvaluationRequest':
+        """Ensure every reference points at a shared text."""
+        for index, item in enumerate(self.items):
+            if item.question_ref is not None and item.question_ref not in self.questions:
+                raise ValueError(f"items[{index}].question_ref '{item.question_ref}' is not defined in questions")
+            if item.context_ref is not None and item.context_ref not in self.contexts:
+                raise ValueError(f"items[{index}].context_ref '{item.context_ref}' is not defined in contexts")
+        return self
+    
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "questions": {"q1": "What is Python?"},
+                    "contexts": {"junior": "Technical screening for junior developer position"},
+                    "items": [
+                        {
+                            "id": "session-42/q1",
+                            "candidate_answer": "Python is a high-level, interpreted programming language.",
+                            "question_ref": "q1",
+                            "context_ref": "junior"
+                        },
+                        {
+                            "id": "session-43/q1",
+                            "candidate_answer": "Python is a snake and also a language.",
+                            "question_ref": "q1",
+                            "context_ref": "junior"
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class BatchEvaluationItemResult(BaseModel):
+    """Outcome of one item in a batch evaluation."""
+    
+    index: int = Field(..., ge=0, description="Position of the item in the request")
+    id: Optional[str] = None
+    result: Optional[EvaluationResponse] = None
+    error: Optional[str] = None
+
+
+class BatchEvaluationResponse(BaseModel):
+    """Response schema for batch evaluation."""
+    
+    results: List[BatchEvaluationItemResult] = Field(
+        ...,
+        description="Per-item results in request order"
+    )
+    total_items: int = Field(..., ge=0)
+    succeeded: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+    unique_evaluations: int = Field(
+        ...,
+        ge=0,
+        description="Evaluations actually performed after deduplicating identical items"
+    )
+    evaluation_time_ms: int = Field(..., ge=0)
@@ -0,0 +1,40 @@
+"""
+Pydantic schemas for the live-interview WebSocket.
+"""
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+
+class LiveInterviewMessage(BaseModel):
+    """
+    Client message on the live-interview WebSocket.
+
+    - start: set the question and context, or a question bank id, for the
+      next answer (resets the draft)
+    - draft: the full answer text so far
+    - append: text to add to the draft (e.g. a transcription chunk)
+    - final: the answer is complete; `text`, when given, replaces the draft
+    """
+
+    type: Literal["start", "draft", "append", "final"]
+    text: Optional[str] = Field(
+        None,
+        max_length=5000,
+        description="Answer text (full draft, appended chunk or final answer)"
+    )
+    question: Optional[str] = Field(
+        None,
+        max_length=1000,
+        description="Interview question (start only)"
+    )
+    context: Optional[str] = Field(
+        None,
+        max_length=2000,
+        description="Additional evaluation context (start only)"
+    )
+    question_id: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=100,
+        description="Question bank id instead of question and context (start only)"
+    )
@@ -0,0 +1,22 @@
+"""
+Pydantic schemas for question bank endpoints.
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class BankQuestionResponse(BaseModel):
+    """A question bank entry, referenced in requests by its id."""
+    
+    id: str
+    question: str
+    context: Optional[str] = None
+    rubric: Optional[str] = Field(
+        default=None,
+        description="Question-specific grading criteria added to the evaluation prompt"
+    )
+    prompt_prefix_tokens: int = Field(
+        ...,
+        ge=0,
+        description="Estimated tokens in the compiled prompt prefix shared by every evaluation of this question"
+    )
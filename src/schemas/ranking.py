@@ -43,6 +43,35 @@ class RankingRequest(BaseModel):
         max_length=50,
         description="List of candidates to rank (max 50)"
     )
+    refine_ties: bool = Field(
+        default=False,
+        description="Order candidates with equal scores using pairwise AI comparisons"
+    )
+    refine_top_k: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=50,
+        description="Number of leading positions to refine (default from server settings)"
+    )
+    question: Optional[str] = Field(
+        default=None,
+        max_length=1000,
+        description="Interview question; selects reference answers from the question bank"
+    )
+    reference_answers: Optional[List[str]] = Field(
+        default=None,
+        max_length=20,
+        description="Reference answers to compare candidates against (overrides the question bank)"
+    )
+    deadline_ms: Optional[int] = Field(
+        default=None,
+        ge=100,
+        le=600000,
+        description=(
+            "Time budget in milliseconds; candidates not evaluated by then are returned "
+            "as pending and finish in the background"
+        )
+    )
     
     @field_validator('candidates')
     @classmethod
@@ -83,6 +112,31 @@ class RankedCandidate(BaseModel):
     improvement: str
     rank: int = Field(ge=1, description="Rank position (1 is highest)")
     metadata: Optional[Dict[str, Any]] = None
+    duplicate_of: Optional[str] = Field(
+        default=None,
+        description="Id of the near-duplicate candidate whose evaluation was reused"
+    )
+    tier: Optional[str] = Field(
+        default=None,
+        description="Cascade tier that produced the score, when cascade mode is on"
+    )
+    reference_similarity: Optional[float] = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Similarity to the closest reference answer; orders candidates with equal scores"
+    )
+
+
+class PendingCandidate(BaseModel):
+    """Schema for a candidate whose evaluation did not finish before the deadline."""
+    
+    id: str
+    status: str = Field(default="pending", description="Evaluation is still running")
+    duplicate_of: Optional[str] = Field(
+        default=None,
+        description="Id of the near-duplicate candidate whose evaluation will be reused"
+    )
 
 
 class RankingResponse(BaseModel):
@@ -92,8 +146,20 @@ class RankingResponse(BaseModel):
         ...,
         description="Candidates sorted by score (highest first)"
     )
+    pending_candidates: List[PendingCandidate] = Field(
+        default_factory=list,
+        description="Candidates not yet evaluated when the deadline was reached (unranked)"
+    )
+    partial: bool = Field(
+        default=False,
+        description="True when some candidates are pending; repeat the request to rank them"
+    )
     total_candidates: int = Field(..., ge=0)
     evaluation_time_ms: int = Field(..., ge=0)
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Ranking details such as model evaluations made and near-duplicate clusters"
+    )
     
     model_config = {
         "json_schema_extra": {
@@ -118,8 +184,96 @@ class RankingResponse(BaseModel):
                         }
                     ],
                     "total_candidates": 2,
-                    "evaluation_time_ms": 1750
+                    "evaluation_time_ms": 1750,
+                    "metadata": {
+                        "evaluations": 2,
+                        "evaluations_saved": 0,
+                        "duplicate_clusters": []
+                    }
                 }
             ]
         }
     }
+
+
+class UploadRowError(BaseModel):
+    """Schema for a rejected row in an uploaded candidate file."""
+    
+    line: int = Field(..., ge=1, description="Line number where the row starts")
+    id: Optional[str] = None
+    error: str
+
+
+class UploadRankingResponse(RankingResponse):
+    """Response schema for ranking an uploaded candidate file."""
+    
+    rows_received: int = Field(..., ge=0, description="Data rows read from the file")
+    rows_rejected: int = Field(..., ge=0, description="Rows skipped as invalid")
+    errors: List[UploadRowError] = Field(
+        default_factory=list,
+        description="Details of rejected rows (capped)"
+    )
+    errors_truncated: bool = Field(
+        default=False,
+        description="True when more rows were rejected than are listed in errors"
+    )
+
+
+class AddCandidatesRequest(BaseModel):
+    """Request schema for adding candidates to a named ranking."""
+    
+    candidates: List[CandidateInput] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Candidates to add (max 50 per request)"
+    )
+    replace_existing: bool = Field(
+        default=False,
+        description="Re-evaluate candidates whose id is already in the ranking"
+    )
+    
+    @field_validator('candidates')
+    @classmethod
+    def validate_unique_ids(cls, v: List[CandidateInput]) -> List[CandidateInput]:
+        """Ensure all candidate IDs are unique."""
+        ids = [candidate.id for candidate in v]
+        if len(ids) != len(set(ids)):
+            raise ValueError("All candidate IDs must be unique")
+        return v
+
+
+class CandidateError(BaseModel):
+    """Schema for a candidate that could not be added to a ranking."""
+    
+    id: str
+    error: str
+
+
+class AddCandidatesResponse(BaseModel):
+    """Response schema for an incremental ranking update."""
+    
+    name: str
+    added: int = Field(..., ge=0, description="New candidates inserted")
+    replaced: int = Field(..., ge=0, description="Existing candidates re-evaluated")
+    skipped: List[str] = Field(
+        default_factory=list,
+        description="Ids already in the ranking and left unchanged"
+    )
+    errors: List[CandidateError] = Field(
+        default_factory=list,
+        description="Candidates whose evaluation failed; they are not added and are evaluated again on the next update"
+    )
+    evaluations: int = Field(..., ge=0, description="Model evaluations performed")
+    total_candidates: int = Field(..., ge=0)
+    evaluation_time_ms: int = Field(..., ge=0)
+
+
+class RankingPageResponse(BaseModel):
+    """Response schema for a page of a named ranking."""
+    
+    name: str
+    total_candidates: int = Field(..., ge=0)
+    offset: int = Field(..., ge=0)
+    limit: int = Field(..., ge=1)
+    ranked_candidates: List[RankedCandidate]
@@ -0,0 +1,299 @@
+"""
+Streaming score statistics per interview question.
+
+Every completed evaluation of an answer to a question adds its score to
+that question's cohort, so score distributions, percentiles and a
+candidate's standing are available without re-reading past results.
+Named rankings keep the same statistics on their own index (see
+StoredRanking.histogram).
+
+With STATE_DIR set, scores are appended to a journal shared by every
+worker process (`<STATE_DIR>/cohort_stats.jsonl`), and each worker applies
+the records the others appended before answering a query, so statistics
+cover all workers and survive restarts. Without it, each worker counts
+only its own evaluations.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process journal locking, run a single worker
+    fcntl = None
+
+from src.core.config import settings
+from src.core.lifecycle import lifecycle
+from src.core.metrics import metrics
+from src.utils.score_histogram import MAX_SCORE, MIN_SCORE, ScoreHistogram
+
+logger = logging.getLogger(__name__)
+
+# Characters of the question text kept as a cohort's label
+LABEL_CHARS = 200
+
+# The journal is compacted once it holds this many records and twice as many as there are cohorts
+COMPACT_MIN_RECORDS = 10000
+
+_WHITESPACE = re.compile(r"\s+")
+
+def cohort_id(question: Optional[str] = None, question_id: Optional[str] = None) -> Optional[str]:
+    """
+    Cohort for a question: its question bank id, or a digest of its text
+    (case and whitespace insensitive). None when there is no question.
+    """
+    if question_id:
+        return question_id
+    if not question or not question.strip():
+        return None
+    normalized = _WHITESPACE.sub(" ", question).strip().lower()
+    return "text-" + hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class _Cohort:
+    __slots__ = ("label", "histogram")
+
+    def __init__(self, label: Optional[str], histogram: ScoreHistogram = None):
+        self.label = label
+        self.histogram = histogram or ScoreHistogram()
+
+
+class CohortStats:
+    """
+    Score histograms per question, at most COHORT_STATS_MAX_QUESTIONS of
+    them (least recently updated evicted first). Each cohort has a fixed
+    size however many candidates answer, so memory is bounded.
+
+    Appends to the shared journal are single O_APPEND writes under a shared
+    lock, so workers never wait on each other to record a score. Compaction
+    rewrites the journal under an exclusive lock and is skipped while any
+    worker is appending; records that meet a compaction in progress are
+    kept and written with the next score or query, or at shutdown.
+    """
+
+    def __init__(self, max_cohorts: int = None, state_dir: str = None):
+        self.max_cohorts = max_cohorts if max_cohorts is not None else settings.COHORT_STATS_MAX_QUESTIONS
+        state_dir = settings.STATE_DIR if state_dir is None else state_dir
+        self.journal_path = Path(state_dir) / "cohort_stats.jsonl" if state_dir else None
+        self._cohorts: "OrderedDict[str, _Cohort]" = OrderedDict()
+        # Open journal, the offset read up to and the records it held
+        self._journal: Optional[BinaryIO] = None
+        self._offset = 0
+        self._records = 0
+        self._pending: List[str] = []
+
+    def record(self, score: int, question: Optional[str] = None, question_id: Optional[str] = None) -> Optional[str]:
+        """
+        Add a completed evaluation's score to its question's cohort.
+
+        Returns:
+            The cohort id, or None for answers without a question
+        """
+        key = cohort_id(question, question_id)
+        if key is None:
+            return None
+        if not MIN_SCORE <= int(score) <= MAX_SCORE:
+            # Checked before journaling: a bad record would fail every worker's replay
+            raise ValueError(f"Score must be between {MIN_SCORE} and {MAX_SCORE}, got {score}")
+        label = question[:LABEL_CHARS] if question else None
+        record = {"id": key, "question": label, "score": int(score)}
+        if self.journal_path is None:
+            self._apply(record)
+        else:
+            self._pending.append(json.dumps(record) + "\n")
+            self._sync()
+        return key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Statistics for one cohort, if it exists."""
+        self._sync()
+        cohort = self._cohorts.get(key)
+        if cohort is None:
+            return None
+        return {"cohort_id": key, "question": cohort.label, **cohort.histogram.to_dict()}
+
+    def position(self, key: str, score: int) -> Optional[Dict[str, Any]]:
+        """Where a score falls in a cohort (see ScoreHistogram.position)."""
+        self._sync()
+        cohort = self._cohorts.get(key)
+        return cohort.histogram.position(score) if cohort is not None else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Cohort ids with their labels and sizes, largest first."""
+        self._sync()
+        return sorted(
+            (
+                {"cohort_id": key, "question": cohort.label, "count": cohort.histogram.count}
+                for key, cohort in self._cohorts.items()
+            ),
+            key=lambda item: (-item["count"], item["cohort_id"])
+        )
+
+    def clear(self) -> None:
+        """Remove every cohort, including the shared journal."""
+        self._cohorts.clear()
+        self._pending.clear()
+        self._close_journal()
+        if self.journal_path is not None:
+            self.journal_path.unlink(missing_ok=True)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        key = record["id"]
+        cohort = self._cohorts.get(key)
+        if cohort is None:
+            cohort = _Cohort(record.get("question"))
+            self._cohorts[key] = cohort
+            while len(self._cohorts) > self.max_cohorts:
+                self._cohorts.popitem(last=False)
+                metrics.increment("cohort_stats_evicted")
+        else:
+            self._cohorts.move_to_end(key)
+        if "counts" in record:
+            # Compacted record: a cohort's whole histogram
+            cohort.histogram = ScoreHistogram(
+                [have + add for have, add in zip(cohort.histogram.counts, record["counts"])]
+            )
+        else:
+            cohort.histogram.add(record["score"])
+
+    def flush(self) -> None:
+        """Write records held back by a compaction, waiting for it to finish (at shutdown)."""
+        if self.journal_path is not None and self._pending:
+            self._append_pending(wait=True)
+
+    def _append_pending(self, wait: bool = False) -> None:
+        """
+        Write buffered records. Unless `wait` is set, records that meet a
+        compaction in progress are kept for the next call.
+        """
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        while self._pending:
+            with open(self.journal_path, "ab") as journal:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(journal, fcntl.LOCK_SH if wait else fcntl.LOCK_SH | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        return
+                    try:
+                        if not os.path.samestat(os.fstat(journal.fileno()), os.stat(self.journal_path)):
+                            continue  # Replaced by a compaction; append to the new file
+                    except FileNotFoundError:
+                        continue
+                os.write(journal.fileno(), "".join(self._pending).encode("utf-8"))
+                self._pending.clear()
+
+    def _sync(self) -> None:
+        """
+        Apply the records appended since this worker last read the journal,
+        or replay it from the start when it was compacted or removed. A
+        trailing partial line (an append in progress) is left for later.
+
+        The journal read is kept open, so its inode cannot be reused by a
+        later file and a replaced journal is always recognized.
+        """
+        if self.journal_path is None:
+            return
+        if self._pending:
+            try:
+                self._append_pending()
+            except OSError as e:
+                logger.error(f"Failed to journal cohort scores: {str(e)}")
+        try:
+            current = os.stat(self.journal_path)
+        except FileNotFoundError:
+            if self._journal is not None:
+                self._cohorts.clear()
+                self._close_journal()
+            return
+
+        if self._journal is None or not os.path.samestat(os.fstat(self._journal.fileno()), current):
+            self._close_journal()
+            try:
+                self._journal = open(self.journal_path, "rb")
+            except FileNotFoundError:
+                self._cohorts.clear()
+                return
+            self._cohorts.clear()
+        self._read()
+        if self._records >= max(COMPACT_MIN_RECORDS, 2 * len(self._cohorts)):
+            self._compact()
+
+    def _read(self) -> None:
+        """Apply the complete records after the offset read up to."""
+        self._journal.seek(self._offset)
+        data = self._journal.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            if line.strip():
+                self._records += 1
+                self._apply(json.loads(line))
+        self._offset += len(complete)
+
+    def _compact(self) -> None:
+        """
+        Rewrite the journal with one record per cohort, least recently
+        updated first, unless another worker is appending to it.
+        """
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+        try:
+            if not os.path.samestat(os.fstat(self._journal.fileno()), os.stat(self.journal_path)):
+                return  # Compacted by another worker meanwhile
+            # Records appended before the lock was taken are complete now
+            self._read()
+            fd, temp_path = tempfile.mkstemp(dir=self.journal_path.parent, prefix=".cohort_stats.", suffix=".tmp")
+            compacted = os.fdopen(fd, "w+b")
+            try:
+                for key, cohort in self._cohorts.items():
+                    compacted.write((json.dumps(
+                        {"id": key, "question": cohort.label, "counts": cohort.histogram.counts}
+                    ) + "\n").encode("utf-8"))
+                compacted.flush()
+                os.replace(temp_path, self.journal_path)
+            except OSError as e:
+                compacted.close()
+                Path(temp_path).unlink(missing_ok=True)
+                logger.error(f"Failed to compact cohort statistics: {str(e)}")
+                return
+        except FileNotFoundError:
+            return
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._journal, fcntl.LOCK_UN)
+        self._close_journal()
+        self._journal = compacted
+        self._offset = compacted.tell()
+        self._records = len(self._cohorts)
+        metrics.increment("cohort_stats_compactions")
+        logger.info(f"Compacted cohort statistics to {len(self._cohorts)} cohorts")
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = None
+        self._offset = 0
+        self._records = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cohort count and total scores recorded, for the metrics endpoint."""
+        self._sync()
+        return {
+            "cohorts": len(self._cohorts),
+            "scores": sum(cohort.histogram.count for cohort in self._cohorts.values()),
+        }
+
+
+# Create global instance
+cohort_stats = CohortStats()
+
+metrics.register_collector("cohort_stats", cohort_stats.snapshot)
+lifecycle.register_flush("cohort_stats", cohort_stats.flush)
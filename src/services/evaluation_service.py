@@ -1,13 +1,16 @@
 """
 Business logic for answer evaluation.
-Orchestrates Gemini API calls and response formatting.
+Orchestrates model provider calls and response formatting.
 """
+import asyncio
 import logging
 import time
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-from src.services.gemini_service import gemini_service
+from src.services.cohort_stats import cohort_id, cohort_stats
+from src.services.gemini_service import InvalidAnswerError, gemini_service
+from src.services.question_bank import question_bank
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,7 +27,9 @@ class EvaluationService:
         self,
         candidate_answer: str,
         question: str = None,
-        context: str = None
+        context: str = None,
+        question_id: str = None,
+        samples: int = None
     ) -> Dict:
         """
         Evaluate a candidate's answer.
@@ -33,20 +38,33 @@ class EvaluationService:
             candidate_answer: The answer to evaluate
             question: Optional question that was asked
             context: Optional evaluation context
+            question_id: Optional question bank id (supplies question, context and rubric)
+            samples: Optional evaluations to sample in one model call (median score returned)
             
         Returns:
             Dict containing evaluation results with metadata
+            
+        Raises:
+            UnknownQuestion: If question_id is not in the question bank
         """
         start_time = time.time()
         
+        rubric = None
+        if question_id is not None:
+            entry = question_bank.require(question_id)
+            question, context, rubric = entry.question, entry.context, entry.rubric
+        
         logger.info("Starting answer evaluation")
         
         try:
-            # Call Gemini API for evaluation
+            # Call the configured model provider for evaluation
             evaluation_result = await self.gemini.evaluate_answer(
                 candidate_answer=candidate_answer,
                 question=question,
-                context=context
+                context=context,
+                provider=settings.EVALUATION_PROVIDER,
+                rubric=rubric,
+                samples=samples
             )
             
             # Calculate evaluation time
@@ -59,8 +77,15 @@ class EvaluationService:
                 "improvement": evaluation_result["improvement"],
                 "evaluation_time_ms": evaluation_time_ms,
                 "metadata": {
-                    "model": settings.GEMINI_MODEL,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "model": evaluation_result.get("model", settings.GEMINI_MODEL),
+                    "provider": evaluation_result.get("provider", settings.EVALUATION_PROVIDER),
+                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "tier": evaluation_result.get("tier"),
+                    "escalation_reason": evaluation_result.get("escalation_reason"),
+                    "usage": evaluation_result.get("usage"),
+                    "compaction": evaluation_result.get("compaction"),
+                    "self_consistency": evaluation_result.get("self_consistency"),
+                    "cohort_id": cohort_id(question, question_id)
                 }
             }
             
@@ -77,6 +102,86 @@ class EvaluationService:
         except Exception as e:
             logger.error(f"Evaluation failed: {str(e)}", exc_info=True)
             raise
+    
+    async def evaluate_batch(self, items: List[Dict]) -> Dict:
+        """
+        Evaluate many independent answers concurrently.
+        
+        Items with identical answer, question and context are evaluated once.
+        A failing item is reported in its result entry without failing the batch;
+        answers the model backend rejects as invalid get that reason, other
+        failures a generic retry message.
+        Each successful item's score is added to its question's cohort statistics.
+        
+        Args:
+            items: List of dicts with candidate_answer, optional id, question and context
+            
+        Returns:
+            Dict containing per-item results in request order and batch totals
+        """
+        start_time = time.time()
+        
+        # Intern identical evaluations
+        unique_keys: Dict[Tuple[str, Optional[str], Optional[str]], int] = {}
+        item_keys = []
+        for item in items:
+            key = (item["candidate_answer"], item.get("question"), item.get("context"))
+            unique_keys.setdefault(key, len(unique_keys))
+            item_keys.append(key)
+        
+        logger.info(
+            f"Starting batch evaluation of {len(items)} items ({len(unique_keys)} unique)"
+        )
+        
+        semaphore = asyncio.Semaphore(settings.BATCH_EVALUATION_CONCURRENCY)
+        
+        async def evaluate_unique(key: Tuple[str, Optional[str], Optional[str]]) -> Dict:
+            async with semaphore:
+                return await self.evaluate_answer(
+                    candidate_answer=key[0],
+                    question=key[1],
+                    context=key[2]
+                )
+        
+        outcomes = await asyncio.gather(
+            *[evaluate_unique(key) for key in unique_keys],
+            return_exceptions=True
+        )
+        
+        results = []
+        for index, (item, key) in enumerate(zip(items, item_keys)):
+            outcome = outcomes[unique_keys[key]]
+            entry = {"index": index, "id": item.get("id"), "result": None, "error": None}
+            if isinstance(outcome, InvalidAnswerError):
+                entry["error"] = str(outcome)
+            elif isinstance(outcome, Exception):
+                entry["error"] = "Failed to evaluate answer. Please try again."
+            else:
+                entry["result"] = outcome
+                cohort_stats.record(outcome["score"], question=item.get("question"))
+            results.append(entry)
+        
+        failed = sum(1 for entry in results if entry["error"] is not None)
+        evaluation_time_ms = int((time.time() - start_time) * 1000)
+        
+        logger.info(
+            f"Batch evaluation completed in {evaluation_time_ms}ms",
+            extra={
+                "total_items": len(items),
+                "unique_evaluations": len(unique_keys),
+                "failed": failed,
+                "time_ms": evaluation_time_ms
+            }
+        )
+        
+        return {
+            "results": results,
+            "total_items": len(items),
+            "succeeded": len(items) - failed,
+            "failed": failed,
+            "unique_evaluations": len(unique_keys),
+            "evaluation_time_ms": evaluation_time_ms
+        }
 
 
 # Create global instance
@@ -1,84 +1,110 @@
 """
-Service for interacting with Google Gemini API.
+Service for model interactions (Google Gemini by default, see providers).
 Handles AI model calls and response parsing.
 """
 import logging
 import json
 import re
-from typing import Dict, Optional
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+import statistics
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from src.core.config import settings
+from src.core.metrics import metrics
+from src.services.providers import ProviderError, ProviderRegistry, provider_registry
+from src.utils.answer_compaction import compact_answer
 
 logger = logging.getLogger(__name__)
 
+# Output token cap for full evaluations and comparisons
+MAX_OUTPUT_TOKENS = 1024
+
+# Interned evaluation prompt prefixes (one per question/context/rubric)
+PROMPT_PREFIX_CACHE_SIZE = 256
+
+
+class InvalidAnswerError(ValueError):
+    """The model backend rejected the evaluation request itself (e.g. the answer is too long for it)."""
+
 
 class GeminiService:
-    """Service for Google Gemini API interactions."""
-    
-    def __init__(self):
-        """Initialize Gemini API client."""
-        if not settings.GEMINI_API_KEY:
-            raise ValueError("GEMINI_API_KEY is not set in environment variables")
-        
-        # Configure the Gemini API
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        
-        # Initialize the model
-        self.model = genai.GenerativeModel(
-            model_name=settings.GEMINI_MODEL,
-            generation_config={
-                "temperature": 0.3,  # Lower temperature for more consistent scoring
-                "top_p": 0.95,
-                "top_k": 40,
-                "max_output_tokens": 1024,
-            },
-            safety_settings={
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
-        )
+    """
+    Service for model interactions: prompt building, provider calls and
+    response parsing. Calls go through the provider registry, so the backend
+    (Gemini by default) is selected per call or via configuration.
+    """
+    
+    def __init__(self, providers: ProviderRegistry = None):
+        """Initialize the service on top of a provider registry."""
+        self.providers = providers or provider_registry
+        self._prefixes: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._pinned_prefixes: Dict[Tuple, str] = {}
         
-        logger.info(f"Gemini service initialized with model: {settings.GEMINI_MODEL}")
+        logger.info(
+            f"Model service initialized with provider: {settings.EVALUATION_PROVIDER}, "
+            f"model: {settings.GEMINI_MODEL}"
+        )
     
     async def evaluate_answer(
         self, 
         candidate_answer: str,
         question: Optional[str] = None,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        provider: Optional[str] = None,
+        rubric: Optional[str] = None,
+        samples: Optional[int] = None
     ) -> Dict:
         """
-        Evaluate a candidate's answer using Gemini AI.
+        Evaluate a candidate's answer using the configured model provider.
+        
+        In cascade mode a cheaper model scores first and only borderline or
+        low-confidence results are re-scored by the main model.
+        
+        With more than one sample (self-consistency), the main model draws
+        that many evaluations in a single call and the median score is
+        returned along with how well the samples agree.
+        
+        With ANSWER_COMPACTION_ENABLED the answer is compacted (whitespace,
+        repeated lines, ANSWER_MAX_TOKENS budget) before the prompt is built.
         
         Args:
             candidate_answer: The candidate's answer text
             question: Optional question that was asked
             context: Optional additional context
+            provider: Provider name (defaults to EVALUATION_PROVIDER)
+            rubric: Optional question-specific grading criteria
+            samples: Evaluations drawn from the main model in one call
+                (defaults to SELF_CONSISTENCY_SAMPLES)
             
         Returns:
-            Dict with score, summary, and improvement
+            Dict with score, summary, improvement, the model and provider
+            used and token usage; cascade mode adds tier and escalation_reason,
+            compaction adds a size report under "compaction" and multiple
+            samples add "self_consistency"
             
         Raises:
+            InvalidAnswerError: If the model backend rejected the request as invalid
             Exception: If API call fails or response parsing fails
         """
+        provider = provider or settings.EVALUATION_PROVIDER
+        samples = samples or settings.SELF_CONSISTENCY_SAMPLES
+        compaction = None
+        if settings.ANSWER_COMPACTION_ENABLED:
+            candidate_answer, compaction = self._compact_answer(candidate_answer)
         try:
-            prompt = self._build_evaluation_prompt(candidate_answer, question, context)
-            
-            logger.info("Sending evaluation request to Gemini API")
-            logger.debug(f"Prompt length: {len(prompt)} characters")
-            
-            # Generate content
-            response = self.model.generate_content(prompt)
-            
-            # Extract text from response
-            response_text = response.text
-            logger.debug(f"Received response: {response_text[:200]}...")
+            if settings.CASCADE_ENABLED:
+                evaluation = await self._evaluate_with_cascade(
+                    candidate_answer, question, context, provider, rubric, samples
+                )
+            else:
+                prompt = self._build_evaluation_prompt(candidate_answer, question, context, rubric=rubric)
+                evaluation = await self._run_evaluation(
+                    prompt, provider, settings.GEMINI_MODEL, MAX_OUTPUT_TOKENS, samples
+                )
             
-            # Parse the JSON response
-            evaluation = self._parse_evaluation_response(response_text)
+            if compaction is not None:
+                evaluation["compaction"] = compaction
             
             logger.info(
                 f"Evaluation completed successfully",
@@ -88,26 +114,349 @@ class GeminiService:
             return evaluation
             
         except Exception as e:
-            logger.error(f"Error during Gemini API call: {str(e)}", exc_info=True)
+            if isinstance(e, ProviderError) and e.is_invalid_request:
+                logger.warning(f"Model provider rejected the evaluation request: {str(e)}")
+                raise InvalidAnswerError(
+                    "The model provider rejected this answer as an invalid request"
+                ) from e
+            logger.error(f"Error during model API call: {str(e)}", exc_info=True)
             raise Exception(f"Failed to evaluate answer: {str(e)}")
     
+    def _compact_answer(self, candidate_answer: str) -> Tuple[str, Dict]:
+        """
+        Compact an answer for the prompt and report the saving.
+        
+        Returns:
+            Tuple of (compacted answer, size report with compaction_ms)
+        """
+        start_time = time.perf_counter()
+        compacted = compact_answer(candidate_answer, settings.ANSWER_MAX_TOKENS)
+        compaction_ms = (time.perf_counter() - start_time) * 1000
+        
+        metrics.observe("answer_compaction_ms", compaction_ms)
+        metrics.observe("answer_tokens_saved", compacted.original_tokens - compacted.tokens)
+        if compacted.truncated:
+            metrics.increment("answers_truncated")
+            logger.info(
+                f"Answer truncated to the token budget: "
+                f"{compacted.original_tokens} -> {compacted.tokens} estimated tokens"
+            )
+        return compacted.text, {**compacted.report(), "compaction_ms": round(compaction_ms, 3)}
+    
+    async def _run_evaluation(
+        self,
+        prompt: str,
+        provider: str,
+        model_name: str,
+        max_output_tokens: int,
+        samples: int = 1
+    ) -> Dict:
+        """Send an evaluation prompt to one model and parse the result (or samples)."""
+        logger.info(f"Sending evaluation request to {provider} ({model_name})")
+        logger.debug(f"Prompt length: {len(prompt)} characters")
+        
+        sampling = {}
+        if samples > 1:
+            sampling = {"temperature": settings.SELF_CONSISTENCY_TEMPERATURE, "candidate_count": samples}
+        response = await self.providers.generate(
+            prompt,
+            provider=provider,
+            model=model_name,
+            max_output_tokens=max_output_tokens,
+            **sampling
+        )
+        logger.debug(f"Received response: {response.text[:200]}...")
+        logger.debug(
+            f"Token usage: {response.usage}"
+            + (" (estimated)" if response.usage_estimated else "")
+        )
+        
+        # Parse the JSON response
+        if samples > 1:
+            evaluation = self._aggregate_samples(response.texts, samples)
+        else:
+            evaluation = self._parse_evaluation_response(response.text)
+        evaluation["model"] = response.model
+        evaluation["provider"] = response.provider
+        evaluation["usage"] = {**response.usage, "estimated": response.usage_estimated}
+        return evaluation
+    
+    def _aggregate_samples(self, texts: List[str], requested: int) -> Dict:
+        """
+        Combine sampled evaluations into one.
+        
+        The score is the median of the parsed samples (the lower middle
+        value for an even count); summary and improvement come from the
+        first sample with that score. Samples that fail to parse are skipped.
+        
+        Raises:
+            ValueError: If no sample could be parsed
+        """
+        parsed = []
+        for text in texts:
+            try:
+                parsed.append(self._parse_evaluation_response(text))
+            except ValueError:
+                continue
+        if not parsed:
+            raise ValueError(f"None of {len(texts)} sampled evaluations could be parsed")
+        
+        scores = [evaluation["score"] for evaluation in parsed]
+        score = statistics.median_low(scores)
+        agreement = scores.count(score) / len(scores)
+        evaluation = dict(next(sample for sample in parsed if sample["score"] == score))
+        evaluation["self_consistency"] = {
+            "requested": requested,
+            "samples": len(parsed),
+            "unparsed": len(texts) - len(parsed),
+            "scores": scores,
+            "agreement": round(agreement, 3),
+            "spread": max(scores) - min(scores),
+        }
+        metrics.observe("self_consistency_agreement", agreement)
+        if len(texts) < requested:
+            metrics.increment("self_consistency_short_samples")
+        return evaluation
+    
+    async def _evaluate_with_cascade(
+        self,
+        candidate_answer: str,
+        question: Optional[str],
+        context: Optional[str],
+        provider: str,
+        rubric: Optional[str] = None,
+        samples: int = 1
+    ) -> Dict:
+        """
+        Score with the fast tier, escalating to the main model when needed.
+        Only the main model draws multiple samples.
+        
+        Returns:
+            Evaluation dict tagged with the tier that produced it
+        """
+        fast_prompt = self._build_evaluation_prompt(
+            candidate_answer, question, context, include_confidence=True, rubric=rubric
+        )
+        
+        fast_usage = None
+        try:
+            evaluation = await self._run_evaluation(
+                fast_prompt, provider, settings.CASCADE_FAST_MODEL,
+                settings.CASCADE_FAST_MAX_OUTPUT_TOKENS
+            )
+            fast_usage = evaluation["usage"]
+            reason = self._escalation_reason(evaluation)
+        except Exception as e:
+            logger.warning(f"Fast tier evaluation failed, escalating: {str(e)}")
+            reason = "fast_tier_error"
+        
+        if reason is None:
+            metrics.increment("cascade_evaluations", labels={"tier": "fast"})
+            evaluation["tier"] = "fast"
+            return evaluation
+        
+        metrics.increment("cascade_escalations", labels={"reason": reason})
+        
+        prompt = self._build_evaluation_prompt(candidate_answer, question, context, rubric=rubric)
+        evaluation = await self._run_evaluation(
+            prompt, provider, settings.GEMINI_MODEL, MAX_OUTPUT_TOKENS, samples
+        )
+        
+        metrics.increment("cascade_evaluations", labels={"tier": "strong"})
+        if fast_usage is not None:
+            # The escalated evaluation paid for both tiers
+            evaluation["usage"] = self._combine_usage(fast_usage, evaluation["usage"])
+        evaluation["tier"] = "strong"
+        evaluation["escalation_reason"] = reason
+        
+        logger.info(
+            f"Cascade escalated evaluation to {settings.GEMINI_MODEL}",
+            extra={"reason": reason, "score": evaluation.get("score")}
+        )
+        return evaluation
+    
+    @staticmethod
+    def _combine_usage(first: Dict, second: Dict) -> Dict:
+        """Sum two calls' token usage."""
+        return {
+            "prompt_tokens": first.get("prompt_tokens", 0) + second.get("prompt_tokens", 0),
+            "output_tokens": first.get("output_tokens", 0) + second.get("output_tokens", 0),
+            "total_tokens": first.get("total_tokens", 0) + second.get("total_tokens", 0),
+            "estimated": first.get("estimated", False) or second.get("estimated", False),
+        }
+    
+    def _escalation_reason(self, evaluation: Dict) -> Optional[str]:
+        """Return why a fast-tier result needs the main model, or None to accept it."""
+        if evaluation["score"] in settings.get_cascade_borderline_scores():
+            return "borderline_score"
+        confidence = evaluation.get("confidence")
+        if confidence is None:
+            return "missing_confidence"
+        if confidence < settings.CASCADE_MIN_CONFIDENCE:
+            return "low_confidence"
+        return None
+    
+    async def compare_answers(
+        self,
+        pairs: List[Tuple[str, str]],
+        question: Optional[str] = None,
+        provider: Optional[str] = None
+    ) -> List[str]:
+        """
+        Judge several answer pairs in a single model call.
+        
+        Args:
+            pairs: List of (answer_a, answer_b) tuples
+            question: Optional question the answers respond to
+            provider: Provider name (defaults to EVALUATION_PROVIDER)
+            
+        Returns:
+            List with "A" or "B" per pair, naming the stronger answer
+            
+        Raises:
+            Exception: If API call fails or response parsing fails
+        """
+        try:
+            prompt = self._build_comparison_prompt(pairs, question)
+            
+            provider = provider or settings.EVALUATION_PROVIDER
+            
+            logger.info(f"Sending comparison request for {len(pairs)} pairs to {provider}")
+            
+            response = await self.providers.generate(
+                prompt,
+                provider=provider,
+                model=settings.GEMINI_MODEL,
+                max_output_tokens=MAX_OUTPUT_TOKENS
+            )
+            
+            return self._parse_comparison_response(response.text, len(pairs))
+            
+        except Exception as e:
+            logger.error(f"Error during model comparison call: {str(e)}", exc_info=True)
+            raise Exception(f"Failed to compare answers: {str(e)}")
+    
+    def _build_comparison_prompt(
+        self,
+        pairs: List[Tuple[str, str]],
+        question: Optional[str] = None
+    ) -> str:
+        """
+        Build a prompt asking Gemini to pick the stronger answer of each pair.
+        
+        Args:
+            pairs: List of (answer_a, answer_b) tuples
+            question: Optional question
+            
+        Returns:
+            Formatted prompt string
+        """
+        prompt_parts = [
+            "You are an expert technical interviewer comparing candidate responses.",
+            "The answers in each pair received the same score; decide which one is stronger.\n"
+        ]
+        
+        if question:
+            prompt_parts.append(f"Question Asked: {question}\n")
+        
+        for index, (answer_a, answer_b) in enumerate(pairs, start=1):
+            prompt_parts.extend([
+                f"Pair {index}:",
+                f"A: \"{answer_a}\"",
+                f"B: \"{answer_b}\"\n"
+            ])
+        
+        prompt_parts.extend([
+            "Judge accuracy, depth and clarity. Ties are not allowed.",
+            "Return ONLY a valid JSON object with this EXACT structure (no markdown, no code blocks, no additional text):",
+            "{",
+            f'  "winners": [<"A" or "B" for each of the {len(pairs)} pairs, in order>]',
+            "}"
+        ])
+        
+        return "\n".join(prompt_parts)
+    
+    def _parse_comparison_response(self, response_text: str, expected: int) -> List[str]:
+        """
+        Parse Gemini's pairwise comparison response.
+        
+        Args:
+            response_text: Raw response text from Gemini
+            expected: Number of pairs that were compared
+            
+        Returns:
+            List with "A" or "B" per pair
+            
+        Raises:
+            ValueError: If response cannot be parsed
+        """
+        try:
+            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            comparison = json.loads(json_match.group(0) if json_match else response_text)
+            
+            winners = [str(winner).strip().upper() for winner in comparison["winners"]]
+            if len(winners) != expected:
+                raise ValueError(f"Expected {expected} winners, got {len(winners)}")
+            if any(winner not in ("A", "B") for winner in winners):
+                raise ValueError(f"Invalid winner values: {winners}")
+            
+            return winners
+            
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Failed to parse comparison response: {response_text}")
+            raise ValueError(f"Invalid comparison response from AI: {str(e)}")
+    
     def _build_evaluation_prompt(
         self,
         answer: str,
         question: Optional[str] = None,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        include_confidence: bool = False,
+        rubric: Optional[str] = None
     ) -> str:
         """
         Build the evaluation prompt for Gemini.
         
+        The candidate's answer comes last, after a prefix that only depends
+        on the question, so providers can reuse their cached prefix.
+        
         Args:
             answer: Candidate's answer
             question: Optional question
             context: Optional context
+            include_confidence: Also ask for a 0-1 confidence in the score
+            rubric: Optional question-specific grading criteria
             
         Returns:
             Formatted prompt string
         """
+        prefix = self.evaluation_prompt_prefix(question, context, rubric, include_confidence)
+        return f"{prefix}Candidate's Answer: \"{answer}\""
+    
+    def evaluation_prompt_prefix(
+        self,
+        question: Optional[str] = None,
+        context: Optional[str] = None,
+        rubric: Optional[str] = None,
+        include_confidence: bool = False
+    ) -> str:
+        """
+        Everything in the evaluation prompt before the answer.
+        
+        Prefixes are interned (LRU, PROMPT_PREFIX_CACHE_SIZE), so repeated
+        questions reuse one string instead of rebuilding it. Prefixes of
+        question bank entries are pinned outside the LRU (see
+        pin_question_prefix) so traffic on other questions never evicts them.
+        """
+        key = (question, context, rubric, include_confidence)
+        prefix = self._pinned_prefixes.get(key)
+        if prefix is not None:
+            return prefix
+        prefix = self._prefixes.get(key)
+        if prefix is not None:
+            self._prefixes.move_to_end(key)
+            return prefix
+        
         prompt_parts = [
             "You are an expert technical interviewer evaluating candidate responses.",
             "Your task is to provide a fair, objective assessment.\n"
@@ -120,23 +469,67 @@ class GeminiService:
             prompt_parts.append(f"Question Asked: {question}\n")
         
         prompt_parts.extend([
-            f"Candidate's Answer: \"{answer}\"\n",
-            "Evaluate this answer and provide your assessment in STRICT JSON format.\n",
+            "Evaluate the candidate's answer below and provide your assessment in STRICT JSON format.\n",
             "Scoring Guide:",
             "- 5: Exceptional - comprehensive, accurate, well-structured with depth",
             "- 4: Good - correct understanding with minor gaps, solid explanation",
             "- 3: Adequate - shows basic understanding but lacks depth or has minor errors",
             "- 2: Weak - significant gaps in understanding or multiple errors",
             "- 1: Poor - incorrect, irrelevant, or completely missing the point\n",
+        ])
+        
+        if rubric:
+            prompt_parts.append(f"Grading criteria for this question:\n{rubric}\n")
+        
+        prompt_parts.extend([
             "Return ONLY a valid JSON object with this EXACT structure (no markdown, no code blocks, no additional text):",
             "{",
             '  "score": <integer 1-5>,',
             '  "summary": "<one concise sentence summarizing the answer quality>",',
-            '  "improvement": "<one specific, actionable suggestion for improvement>"',
-            "}"
+            '  "improvement": "<one specific, actionable suggestion for improvement>"' + ("," if include_confidence else ""),
         ])
         
-        return "\n".join(prompt_parts)
+        if include_confidence:
+            prompt_parts.append('  "confidence": <number 0.0-1.0, how certain you are of the score>')
+        
+        prompt_parts.append("}\n\n")
+        
+        prefix = "\n".join(prompt_parts)
+        self._prefixes[key] = prefix
+        while len(self._prefixes) > PROMPT_PREFIX_CACHE_SIZE:
+            self._prefixes.popitem(last=False)
+        return prefix
+    
+    def pin_question_prefix(
+        self,
+        question: Optional[str],
+        context: Optional[str] = None,
+        rubric: Optional[str] = None
+    ) -> str:
+        """
+        Compile a question's prompt prefixes (with and without the cascade's
+        confidence field) and keep them until unpinned.
+        
+        Returns:
+            The prefix used for main-model evaluations of the question
+        """
+        for include_confidence in (False, True):
+            key = (question, context, rubric, include_confidence)
+            if key not in self._pinned_prefixes:
+                prefix = self.evaluation_prompt_prefix(question, context, rubric, include_confidence)
+                self._prefixes.pop(key, None)
+                self._pinned_prefixes[key] = prefix
+        return self._pinned_prefixes[(question, context, rubric, False)]
+    
+    def unpin_question_prefix(
+        self,
+        question: Optional[str],
+        context: Optional[str] = None,
+        rubric: Optional[str] = None
+    ) -> None:
+        """Return a question's pinned prefixes to the LRU."""
+        for include_confidence in (False, True):
+            self._pinned_prefixes.pop((question, context, rubric, include_confidence), None)
     
     def _parse_evaluation_response(self, response_text: str) -> Dict:
         """
@@ -182,12 +575,19 @@ class GeminiService:
             if not isinstance(evaluation["improvement"], str) or not evaluation["improvement"].strip():
                 raise ValueError("Improvement must be a non-empty string")
             
-            return {
+            result = {
                 "score": score,
                 "summary": evaluation["summary"].strip(),
                 "improvement": evaluation["improvement"].strip()
             }
             
+            # Optional self-reported confidence (cascade first tier)
+            confidence = evaluation.get("confidence")
+            if isinstance(confidence, (int, float)) and not isinstance(confidence, bool):
+                result["confidence"] = min(max(float(confidence), 0.0), 1.0)
+            
+            return result
+            
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {response_text}")
             raise ValueError(f"Invalid JSON response from AI: {str(e)}")
@@ -196,5 +596,20 @@ class GeminiService:
             raise ValueError(f"Failed to parse evaluation: {str(e)}")
 
 
+def _cascade_stats() -> Dict:
+    """Cascade tier counts and escalation rate for the metrics endpoint."""
+    fast = metrics.counter_value("cascade_evaluations", labels={"tier": "fast"})
+    strong = metrics.counter_value("cascade_evaluations", labels={"tier": "strong"})
+    total = fast + strong
+    return {
+        "enabled": settings.CASCADE_ENABLED,
+        "fast": fast,
+        "strong": strong,
+        "escalation_rate": strong / total if total else 0.0
+    }
+
+
+metrics.register_collector("cascade", _cascade_stats)
+
 # Create global instance
 gemini_service = GeminiService()
@@ -0,0 +1,180 @@
+"""
+Idempotency keys for retried POST requests.
+
+A request carrying an `Idempotency-Key` runs once: retries with the same key
+attach to the in-flight computation or receive its stored result until the
+key expires. Failed computations are forgotten so a retry can try again.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.core.config import settings
+from src.core.lifecycle import lifecycle
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used with a different request payload."""
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    """Digest of a validated request body, to detect keys reused for other payloads."""
+    return hashlib.blake2b(payload.model_dump_json().encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    task: asyncio.Future
+    expires_at: float
+
+
+class IdempotencyStore:
+    """
+    In-process store of keyed computations for a single worker.
+
+    Entries are kept in creation order; expired and surplus completed
+    entries are evicted lazily whenever a new key is stored. Running
+    computations are never evicted.
+    """
+
+    def __init__(self, ttl_seconds: float = None, max_keys: int = None):
+        self.ttl_seconds = settings.IDEMPOTENCY_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_keys = settings.IDEMPOTENCY_MAX_KEYS if max_keys is None else max_keys
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+    async def run(
+        self,
+        scope: str,
+        key: Optional[str],
+        fingerprint: str,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run `compute` once per (scope, key).
+
+        Args:
+            scope: Route the key belongs to (keys do not collide across routes)
+            key: Idempotency key from the client, or None to always compute
+            fingerprint: request_fingerprint() of the payload
+            compute: Zero-argument coroutine factory producing the result
+
+        Returns:
+            (result, replayed) where replayed is True if the result came from
+            an earlier request with the same key
+
+        Raises:
+            IdempotencyKeyReused: If the key was first used with another payload
+        """
+        if key is None:
+            return await compute(), False
+
+        store_key = (scope, key)
+        entry = self._live_entry(store_key)
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                metrics.increment("idempotency_requests", labels={"route": scope, "outcome": "conflict"})
+                raise IdempotencyKeyReused(
+                    "Idempotency-Key was already used with a different request body"
+                )
+            outcome = "replayed" if entry.task.done() else "attached"
+            metrics.increment("idempotency_requests", labels={"route": scope, "outcome": outcome})
+            logger.info(f"Idempotency key {outcome}", extra={"route": scope})
+            return await self._await(entry.task), True
+
+        self._evict()
+        task = lifecycle.track(asyncio.ensure_future(compute()))
+        entry = _Entry(fingerprint, task, time.monotonic() + self.ttl_seconds)
+        self._entries[store_key] = entry
+        task.add_done_callback(lambda done: self._forget_failure(store_key, entry))
+        metrics.increment("idempotency_requests", labels={"route": scope, "outcome": "stored"})
+        return await self._await(task), False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Stored keys and computations still running."""
+        return {
+            "keys": len(self._entries),
+            "in_flight": sum(1 for entry in self._entries.values() if not entry.task.done()),
+        }
+
+    def forget(self, scope: str, key: Optional[str]) -> None:
+        """Drop a stored result so the key computes again (e.g. an incomplete result)."""
+        if key is not None:
+            self._entries.pop((scope, key), None)
+
+    def clear(self) -> None:
+        """Forget every stored key."""
+        self._entries.clear()
+
+    def export_state(self) -> List[Dict[str, Any]]:
+        """Completed, unexpired results with wall-clock expiry, for saving at shutdown."""
+        now, wall_now = time.monotonic(), time.time()
+        return [
+            {
+                "scope": scope,
+                "key": key,
+                "fingerprint": entry.fingerprint,
+                "result": entry.task.result(),
+                "expires_at": wall_now + entry.expires_at - now,
+            }
+            for (scope, key), entry in self._entries.items()
+            if entry.task.done() and not entry.task.cancelled()
+            and entry.task.exception() is None and entry.expires_at > now
+        ]
+
+    def import_state(self, saved: List[Dict[str, Any]]) -> None:
+        """Restore results saved by export_state(), so retries across a restart still replay."""
+        loop = asyncio.get_running_loop()
+        now, wall_now = time.monotonic(), time.time()
+        for item in saved:
+            remaining = item["expires_at"] - wall_now
+            if remaining <= 0:
+                continue
+            task = loop.create_future()
+            task.set_result(item["result"])
+            self._entries[(item["scope"], item["key"])] = _Entry(item["fingerprint"], task, now + remaining)
+        self._evict()
+
+    @staticmethod
+    async def _await(task: asyncio.Future) -> Any:
+        # Shield so a disconnecting client does not cancel work others wait on
+        if task.done():
+            return task.result()
+        return await asyncio.shield(task)
+
+    def _live_entry(self, store_key: Tuple[str, str]) -> Optional[_Entry]:
+        entry = self._entries.get(store_key)
+        if entry is not None and entry.task.done() and entry.expires_at <= time.monotonic():
+            del self._entries[store_key]
+            return None
+        return entry
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest completed ones above max_keys."""
+        now = time.monotonic()
+        for store_key, entry in list(self._entries.items()):
+            over_capacity = len(self._entries) >= self.max_keys
+            if not over_capacity and entry.expires_at > now:
+                break
+            if entry.task.done():
+                del self._entries[store_key]
+
+    def _forget_failure(self, store_key: Tuple[str, str], entry: _Entry) -> None:
+        if entry.task.cancelled() or entry.task.exception() is not None:
+            if self._entries.get(store_key) is entry:
+                del self._entries[store_key]
+
+
+# Create global idempotency store
+idempotency_store = IdempotencyStore()
+metrics.register_collector("idempotency", idempotency_store.snapshot)
+lifecycle.register_state("idempotency", idempotency_store.export_state, idempotency_store.import_state)
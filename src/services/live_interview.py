@@ -0,0 +1,233 @@
+"""
+Speculative evaluation of answers while they are typed or transcribed.
+
+A live session evaluates the draft in the background whenever the candidate
+pauses (LIVE_DEBOUNCE_MS). When the final answer arrives, the latest
+speculative evaluation is reused if its text matches or nearly matches the
+final text (SimHash similarity of at least LIVE_REUSE_SIMILARITY), so the
+score is available without a further model round-trip.
+
+Drafts are limited to the length the REST API accepts for an answer, and
+each speculative evaluation must be admitted (rate limit, load shedding)
+like a request before it is started.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.services.evaluation_service import evaluation_service
+from src.services.scheduler import current_priority
+from src.utils.near_duplicates import simhash, similarity
+
+logger = logging.getLogger(__name__)
+
+# Same limit as EvaluationRequest.candidate_answer
+MAX_DRAFT_CHARS = 5000
+
+
+class DraftTooLong(ValueError):
+    """The draft would exceed MAX_DRAFT_CHARS."""
+
+
+@dataclass
+class _Speculation:
+    text: str
+    fingerprint: int
+    task: asyncio.Task
+
+    @property
+    def failed(self) -> bool:
+        return self.task.done() and (self.task.cancelled() or self.task.exception() is not None)
+
+
+class LiveInterviewSession:
+    """
+    Draft state and speculative evaluations for one live-interview connection.
+
+    At most one speculative evaluation runs at a time. When the candidate
+    pauses on a draft that no longer nearly matches the running evaluation's
+    text, that evaluation is stale and is cancelled in favour of the draft.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[..., Awaitable[Dict]] = None,
+        on_provisional: Callable[[Dict, str], Awaitable[None]] = None,
+        admit: Callable[[], Awaitable[bool]] = None
+    ):
+        """
+        Args:
+            evaluate: Evaluation coroutine (default: evaluation_service.evaluate_answer)
+            on_provisional: Called with each speculative result and its draft text
+            admit: Called before each speculative evaluation; returning False
+                skips it (default: always admitted)
+        """
+        self.evaluate = evaluate or evaluation_service.evaluate_answer
+        self.on_provisional = on_provisional
+        self.admit = admit
+        self.question: Optional[str] = None
+        self.context: Optional[str] = None
+        self.question_id: Optional[str] = None
+        self.draft = ""
+        self._debounce: Optional[asyncio.Task] = None
+        self._speculation: Optional[_Speculation] = None
+
+    def start(
+        self,
+        question: Optional[str] = None,
+        context: Optional[str] = None,
+        question_id: Optional[str] = None
+    ) -> None:
+        """Begin a new answer, discarding any draft."""
+        self._reset()
+        self.question = question
+        self.context = context
+        self.question_id = question_id
+
+    def update(self, text: str) -> None:
+        """
+        Replace the draft with the full text typed so far.
+
+        Raises:
+            DraftTooLong: If the text exceeds MAX_DRAFT_CHARS (the draft is kept)
+        """
+        self._set_draft(text)
+
+    def append(self, chunk: str) -> None:
+        """
+        Add a chunk (e.g. transcribed speech) to the draft.
+
+        Raises:
+            DraftTooLong: If the draft would exceed MAX_DRAFT_CHARS (the draft is kept)
+        """
+        self._set_draft(self.draft + chunk)
+
+    def _set_draft(self, text: str) -> None:
+        if len(text) > MAX_DRAFT_CHARS:
+            metrics.increment("live_drafts_too_long")
+            raise DraftTooLong(f"Answer exceeds the maximum of {MAX_DRAFT_CHARS} characters")
+        self.draft = text
+        self._schedule()
+
+    async def finalize(self, answer: str) -> Tuple[Dict, Dict[str, Any]]:
+        """
+        Evaluate the final answer, reusing the speculative result when it matches.
+
+        Args:
+            answer: Final answer text (already validated)
+
+        Returns:
+            Tuple of (evaluation result, details: outcome, similarity, wait_ms)
+            where outcome is "reused" (speculation had finished), "joined"
+            (speculation was still running) or "fresh"
+        """
+        start_time = time.perf_counter()
+        self._cancel_debounce()
+
+        speculation = self._speculation
+        match = self._match(speculation, answer) if speculation is not None else 0.0
+        result = None
+        outcome = "fresh"
+        if match >= settings.LIVE_REUSE_SIMILARITY:
+            outcome = "reused" if speculation.task.done() else "joined"
+            try:
+                result = await asyncio.shield(speculation.task)
+            except Exception as e:
+                logger.warning(f"Speculative evaluation failed, evaluating final answer: {str(e)}")
+                outcome = "fresh"
+
+        if result is None:
+            self._cancel_speculation()
+            result = await self.evaluate(
+                candidate_answer=answer,
+                question=self.question,
+                context=self.context,
+                question_id=self.question_id
+            )
+
+        self._reset()
+        metrics.increment("live_final_evaluations", labels={"outcome": outcome})
+        details = {
+            "outcome": outcome,
+            "similarity": round(match, 4),
+            "wait_ms": int((time.perf_counter() - start_time) * 1000)
+        }
+        logger.info(f"Live answer scored ({outcome}) in {details['wait_ms']}ms", extra=details)
+        return result, details
+
+    def close(self) -> None:
+        """Cancel pending work when the connection ends."""
+        self._reset()
+
+    def _schedule(self) -> None:
+        """Restart the debounce timer for the current draft."""
+        self._cancel_debounce()
+        self._debounce = asyncio.create_task(self._speculate_after_pause())
+
+    async def _speculate_after_pause(self) -> None:
+        await asyncio.sleep(settings.LIVE_DEBOUNCE_MS / 1000)
+        text = self.draft.strip()
+        if len(text) < settings.LIVE_MIN_DRAFT_CHARS:
+            return
+
+        speculation = self._speculation
+        if speculation is not None and not speculation.failed:
+            if self._match(speculation, text) >= settings.LIVE_REUSE_SIMILARITY:
+                return
+        if self.admit is not None and not await self.admit():
+            metrics.increment("live_speculations_rejected")
+            logger.debug("Speculative evaluation not admitted")
+            return
+        if speculation is not None and not speculation.task.done():
+            metrics.increment("live_speculations_cancelled")
+            logger.debug("Cancelling stale speculative evaluation")
+        self._cancel_speculation()
+
+        metrics.increment("live_speculations")
+        task = asyncio.create_task(self._speculate(text))
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._speculation = _Speculation(text, simhash(text), task)
+
+    async def _speculate(self, text: str) -> Dict:
+        current_priority.set(settings.LIVE_SPECULATIVE_PRIORITY)
+        result = await self.evaluate(
+            candidate_answer=text,
+            question=self.question,
+            context=self.context,
+            question_id=self.question_id
+        )
+        if self.on_provisional is not None:
+            try:
+                await self.on_provisional(result, text)
+            except Exception as e:
+                # The result stays usable for the final answer
+                logger.debug(f"Could not deliver provisional result: {str(e)}")
+        return result
+
+    @staticmethod
+    def _match(speculation: _Speculation, text: str) -> float:
+        """Similarity between the speculated text and `text` (1.0 for identical text)."""
+        if speculation.failed:
+            return 0.0
+        if speculation.text == text:
+            return 1.0
+        return similarity(speculation.fingerprint, simhash(text))
+
+    def _cancel_debounce(self) -> None:
+        if self._debounce is not None and not self._debounce.done():
+            self._debounce.cancel()
+        self._debounce = None
+
+    def _cancel_speculation(self) -> None:
+        if self._speculation is not None and not self._speculation.task.done():
+            self._speculation.task.cancel()
+        self._speculation = None
+
+    def _reset(self) -> None:
+        self._cancel_debounce()
+        self._cancel_speculation()
+        self.draft = ""
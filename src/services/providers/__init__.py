@@ -0,0 +1,16 @@
+"""
+Model provider backends.
+"""
+from src.services.providers.base import EvaluationProvider, ProviderError, ProviderResponse
+from src.services.providers.registry import ProviderRegistry, provider_registry
+from src.services.providers.transport import ModelTransport, model_transport
+
+__all__ = [
+    "EvaluationProvider",
+    "ProviderError",
+    "ProviderResponse",
+    "ProviderRegistry",
+    "provider_registry",
+    "ModelTransport",
+    "model_transport",
+]
@@ -0,0 +1,93 @@
+"""
+Backend-agnostic interface for model providers.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# HTTP statuses with which a backend rejects the request itself (bad
+# argument, prompt too large), so retrying or another provider will not help
+INVALID_REQUEST_STATUSES = (400, 413, 422)
+
+
+@dataclass
+class ProviderResponse:
+    """Text generated by a provider plus call details."""
+
+    text: str
+    model: str
+    provider: str
+    latency_ms: float = 0.0
+    usage: Dict[str, int] = field(default_factory=dict)  # prompt_tokens, output_tokens, total_tokens
+    usage_estimated: bool = False  # True when usage was estimated locally, not reported
+    candidates: List[str] = field(default_factory=list)  # Every sample when several were requested
+
+    @property
+    def texts(self) -> List[str]:
+        """All generated samples (just `text` for a single-sample call)."""
+        return self.candidates or [self.text]
+
+
+class ProviderError(Exception):
+    """
+    Error raised by a provider call.
+
+    Attributes:
+        status_code: HTTP-style status when known (429 = rate limited)
+        kind: Short classification: rate_limited, timeout, unavailable,
+            invalid_request (the backend rejected the request itself, e.g.
+            an over-long prompt), config or error
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, kind: str = "error"):
+        super().__init__(message)
+        self.status_code = status_code
+        self.kind = kind
+
+    @property
+    def is_rate_limited(self) -> bool:
+        return self.kind == "rate_limited" or self.status_code == 429
+
+    @property
+    def is_invalid_request(self) -> bool:
+        return self.kind == "invalid_request"
+
+
+class EvaluationProvider(ABC):
+    """A model backend that turns a prompt into text."""
+
+    name: str = "base"
+
+    # Origin to pre-connect at startup; None for providers without HTTP connections
+    warmup_url: Optional[str] = None
+
+    @abstractmethod
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float = 0.3,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        """
+        Generate a completion for a prompt.
+
+        Args:
+            prompt: Full prompt text
+            model: Requested model name (providers may map or override it)
+            max_output_tokens: Output token cap (per sample)
+            temperature: Sampling temperature
+            candidate_count: Independent samples to draw in this one call;
+                backends that cannot sample several may return fewer
+
+        Returns:
+            ProviderResponse with the generated text (the first sample) and,
+            when several were drawn, every sample in `candidates`
+
+        Raises:
+            ProviderError: If the backend call fails
+        """
+
+    async def close(self) -> None:
+        """Release provider resources (connections, clients)."""
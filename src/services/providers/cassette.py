@@ -0,0 +1,218 @@
+"""
+Record and replay of model calls ("cassettes") for offline benchmarks.
+
+With CASSETTE_RECORD on, every provider call made through the registry
+(prompt, response text, latency, usage, or the error raised) is appended
+to the cassette at CASSETTE_PATH. EVALUATION_PROVIDER=replay then serves
+those responses without network access, sleeping for the recorded
+latency times CASSETTE_TIMING_SCALE (0 = no delay).
+
+On-disk format: gzip-compressed JSON Lines, written in batches of
+FLUSH_EVERY records (one gzip member per batch, which gzip readers
+concatenate). Prompts repeated within a recording session are stored once;
+later records carry only the prompt key. Files not ending in ".gz" are
+plain JSON Lines.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from src.core.config import settings
+from src.core.lifecycle import lifecycle
+from src.core.metrics import metrics
+from src.services.providers.base import EvaluationProvider, ProviderError, ProviderResponse
+
+logger = logging.getLogger(__name__)
+
+# Records buffered before a batch is written
+FLUSH_EVERY = 50
+
+
+def prompt_key(prompt: str) -> str:
+    """Stable key for a prompt."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class CassetteWriter:
+    """Buffers recorded calls and appends them to a cassette file."""
+
+    def __init__(self, path: str = None):
+        self.path = Path(path if path is not None else settings.CASSETTE_PATH)
+        self.recorded = 0
+        self._buffer: List[Dict] = []
+        self._stored_prompts: Set[str] = set()
+
+    def record(
+        self,
+        prompt: str,
+        model: str,
+        latency_ms: float,
+        response: Optional[ProviderResponse] = None,
+        error: Optional[ProviderError] = None
+    ) -> None:
+        """Add one call: either its response or the error it raised."""
+        key = prompt_key(prompt)
+        record = {"key": key, "model": model, "latency_ms": round(latency_ms, 1)}
+        if key not in self._stored_prompts:
+            self._stored_prompts.add(key)
+            record["prompt"] = prompt
+        if error is not None:
+            record["error"] = {"message": str(error), "status_code": error.status_code, "kind": error.kind}
+        else:
+            record["provider"] = response.provider
+            record["response_model"] = response.model
+            record["text"] = response.text
+            if response.candidates:
+                record["candidates"] = response.candidates
+            if response.usage and not response.usage_estimated:
+                record["usage"] = response.usage
+
+        self._buffer.append(record)
+        self.recorded += 1
+        metrics.increment("cassette_recorded_calls")
+        if len(self._buffer) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered records to the cassette."""
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _open(self.path, "a") as cassette:
+            cassette.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        logger.debug(f"Wrote {len(records)} call(s) to cassette {self.path}")
+
+
+class RecordingProvider(EvaluationProvider):
+    """Wraps a provider and records each of its calls to a cassette."""
+
+    def __init__(self, inner: EvaluationProvider, writer: CassetteWriter):
+        self.inner = inner
+        self.writer = writer
+        self.name = inner.name
+
+    @property
+    def warmup_url(self) -> Optional[str]:
+        return self.inner.warmup_url
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float = 0.3,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        # Only multi-sample calls pass candidate_count, as the registry does
+        options = {"candidate_count": candidate_count} if candidate_count > 1 else {}
+        start_time = time.perf_counter()
+        try:
+            response = await self.inner.generate(
+                prompt, model=model, max_output_tokens=max_output_tokens, temperature=temperature, **options
+            )
+        except ProviderError as e:
+            self.writer.record(prompt, model, (time.perf_counter() - start_time) * 1000, error=e)
+            raise
+        self.writer.record(prompt, model, (time.perf_counter() - start_time) * 1000, response=response)
+        return response
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+class ReplayProvider(EvaluationProvider):
+    """
+    Serves recorded responses from a cassette.
+
+    Calls are matched by prompt, preferring recordings for the requested
+    model; several recordings of one prompt are served in turn. A prompt
+    that was never recorded raises a ProviderError, or with
+    CASSETTE_REPLAY_MISS=cycle gets the next recording in file order (for
+    benchmarks whose prompts differ from the recorded ones).
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str = None):
+        self.path = Path(path if path is not None else settings.CASSETTE_PATH)
+        self.records: List[Dict] = []
+        self._by_key: Dict[str, List[Dict]] = {}
+        self._turns: Dict[str, int] = {}
+        self._cycle = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise ValueError(f"Cassette not found: {self.path} (set CASSETTE_PATH or record one first)")
+        with _open(self.path, "r") as cassette:
+            for line in cassette:
+                if line.strip():
+                    record = json.loads(line)
+                    self.records.append(record)
+                    self._by_key.setdefault(record["key"], []).append(record)
+        logger.info(f"Loaded {len(self.records)} recorded call(s) from cassette {self.path}")
+
+    def lookup(self, prompt: str, model: str) -> Optional[Dict]:
+        """Next recording for this prompt (and model, when recorded), if any."""
+        key = prompt_key(prompt)
+        candidates = self._by_key.get(key)
+        if candidates:
+            matching = [record for record in candidates if record["model"] == model]
+            candidates = matching or candidates
+            turn_key = f"{key}:{model}" if matching else key
+            turn = self._turns.get(turn_key, 0)
+            self._turns[turn_key] = turn + 1
+            return candidates[turn % len(candidates)]
+        if settings.CASSETTE_REPLAY_MISS == "cycle" and self.records:
+            record = self.records[self._cycle % len(self.records)]
+            self._cycle += 1
+            return record
+        return None
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float = 0.3,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        record = self.lookup(prompt, model)
+        if record is None:
+            metrics.increment("cassette_replay_misses")
+            raise ProviderError(f"No recorded response for this prompt in {self.path}", kind="unavailable")
+
+        latency_ms = record["latency_ms"] * settings.CASSETTE_TIMING_SCALE
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000)
+        metrics.increment("cassette_replayed_calls")
+
+        error = record.get("error")
+        if error is not None:
+            raise ProviderError(error["message"], status_code=error["status_code"], kind=error["kind"])
+        return ProviderResponse(
+            text=record["text"],
+            model=record.get("response_model", record["model"]),
+            provider=self.name,
+            latency_ms=latency_ms,
+            usage=dict(record.get("usage") or {}),
+            candidates=record.get("candidates", [])[:candidate_count] if candidate_count > 1 else []
+        )
+
+
+# Create global instance
+cassette_writer = CassetteWriter()
+
+lifecycle.register_flush("cassette", cassette_writer.flush)
@@ -0,0 +1,98 @@
+"""
+Deterministic local provider for development, tests and load experiments.
+Produces well-formed evaluation and comparison responses without network calls.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+
+from src.core.config import settings
+from src.services.providers.base import EvaluationProvider, ProviderError, ProviderResponse
+
+_ANSWER_PATTERN = re.compile(r'Candidate\'s Answer: "(.*)"', re.DOTALL)
+_PAIR_PATTERN = re.compile(r'^Pair \d+:\nA: "(.*?)"\nB: "(.*?)"$', re.DOTALL | re.MULTILINE)
+
+
+def _fake_score(answer: str, sample: int = 0) -> int:
+    """
+    Longer answers score higher; a hash keeps equal-length answers apart.
+    Further samples of one answer (sample > 0) may land one point lower.
+    """
+    words = len(answer.split())
+    bucket = min(words // 15, 3)
+    jitter = hashlib.blake2b(answer.encode("utf-8"), digest_size=1).digest()[0] % 2
+    score = 1 + bucket + (jitter if bucket == 3 else 0)
+    if sample and hashlib.blake2b(f"{sample}:{answer}".encode("utf-8"), digest_size=1).digest()[0] % 3 == 0:
+        score = max(1, score - 1)
+    return score
+
+
+class FakeProvider(EvaluationProvider):
+    """
+    Provider that scores answers locally from their text.
+
+    With FAKE_PROVIDER_CAPACITY set it behaves like a quota-limited API:
+    calls beyond that many in flight are rejected with a 429.
+    """
+
+    name = "fake"
+
+    def __init__(self):
+        self.in_flight = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float = 0.3,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        self.in_flight += 1
+        try:
+            if 0 < settings.FAKE_PROVIDER_CAPACITY < self.in_flight:
+                raise ProviderError(
+                    f"Fake provider over capacity ({settings.FAKE_PROVIDER_CAPACITY} in flight)",
+                    status_code=429,
+                    kind="rate_limited"
+                )
+            return await self._generate(prompt, candidate_count)
+        finally:
+            self.in_flight -= 1
+
+    async def _generate(self, prompt: str, candidate_count: int = 1) -> ProviderResponse:
+        start_time = time.perf_counter()
+        if settings.FAKE_PROVIDER_LATENCY_MS > 0:
+            await asyncio.sleep(settings.FAKE_PROVIDER_LATENCY_MS / 1000)
+
+        texts = [self._respond(prompt, sample) for sample in range(candidate_count)]
+        return ProviderResponse(
+            text=texts[0],
+            model="fake",
+            provider=self.name,
+            latency_ms=(time.perf_counter() - start_time) * 1000,
+            candidates=texts if candidate_count > 1 else []
+        )
+
+    @staticmethod
+    def _respond(prompt: str, sample: int) -> str:
+        if '"winners"' in prompt:
+            winners = [
+                "A" if (len(answer_a), answer_a) >= (len(answer_b), answer_b) else "B"
+                for answer_a, answer_b in _PAIR_PATTERN.findall(prompt)
+            ]
+            return json.dumps({"winners": winners})
+
+        match = _ANSWER_PATTERN.search(prompt)
+        answer = match.group(1) if match else prompt
+        score = _fake_score(answer, sample)
+        payload = {
+            "score": score,
+            "summary": f"Answer of {len(answer.split())} words rated {score}/5.",
+            "improvement": "Add concrete examples and explain the trade-offs."
+        }
+        if '"confidence"' in prompt:
+            payload["confidence"] = 0.9
+        return json.dumps(payload)
@@ -0,0 +1,210 @@
+"""
+Google Gemini provider.
+Calls the generateContent REST endpoint over the shared pooled transport by
+default, or the google-generativeai SDK when GEMINI_TRANSPORT=sdk.
+"""
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
+from src.core.config import settings
+from src.services.providers.base import INVALID_REQUEST_STATUSES, EvaluationProvider, ProviderError, ProviderResponse
+from src.services.providers.transport import ModelTransport, model_transport
+
+logger = logging.getLogger(__name__)
+
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+}
+
+# Same settings in the REST API's format
+REST_SAFETY_SETTINGS = [
+    {"category": category.name, "threshold": threshold.name}
+    for category, threshold in SAFETY_SETTINGS.items()
+]
+
+
+def _client_error_kind(status_code: int, message: str) -> str:
+    """Gemini reports an invalid API key as a 400 too; that is a configuration error."""
+    if "API key" in message or "API_KEY" in message:
+        return "config"
+    return "invalid_request" if status_code in INVALID_REQUEST_STATUSES else "error"
+
+
+class GeminiProvider(EvaluationProvider):
+    """Provider for the Gemini API over pooled HTTP or the SDK."""
+
+    name = "gemini"
+
+    def __init__(self, transport: Optional[ModelTransport] = None):
+        if not settings.GEMINI_API_KEY:
+            raise ValueError("GEMINI_API_KEY is not set in environment variables")
+
+        self.use_sdk = settings.GEMINI_TRANSPORT == "sdk"
+        self._transport = transport or model_transport
+
+        if self.use_sdk:
+            # Configure the Gemini API
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+
+        # One SDK model object per (model name, output cap, temperature, sample count)
+        self._models: Dict[Tuple[str, int, float, int], genai.GenerativeModel] = {}
+
+    @property
+    def warmup_url(self) -> Optional[str]:
+        return None if self.use_sdk else settings.GEMINI_API_BASE_URL
+
+    def _get_model(
+        self,
+        model: str,
+        max_output_tokens: int,
+        temperature: float,
+        candidate_count: int = 1
+    ) -> genai.GenerativeModel:
+        key = (model, max_output_tokens, temperature, candidate_count)
+        if key not in self._models:
+            self._models[key] = genai.GenerativeModel(
+                model_name=model,
+                generation_config={
+                    "temperature": temperature,
+                    "top_p": 0.95,
+                    "top_k": 40,
+                    "max_output_tokens": max_output_tokens,
+                    "candidate_count": candidate_count,
+                },
+                safety_settings=SAFETY_SETTINGS
+            )
+        return self._models[key]
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float = 0.3,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        """Generate content without blocking the event loop."""
+        if self.use_sdk:
+            return await self._generate_sdk(prompt, model, max_output_tokens, temperature, candidate_count)
+        return await self._generate_http(prompt, model, max_output_tokens, temperature, candidate_count)
+
+    async def _generate_http(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        """Call generateContent through the shared connection pool."""
+        start_time = time.perf_counter()
+        try:
+            response = await self._transport.post(
+                f"{settings.GEMINI_API_BASE_URL.rstrip('/')}/models/{model}:generateContent",
+                headers={"x-goog-api-key": settings.GEMINI_API_KEY},
+                json={
+                    "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                    "generationConfig": {
+                        "temperature": temperature,
+                        "topP": 0.95,
+                        "topK": 40,
+                        "maxOutputTokens": max_output_tokens,
+                        "candidateCount": candidate_count,
+                    },
+                    "safetySettings": REST_SAFETY_SETTINGS,
+                }
+            )
+        except httpx.TimeoutException as e:
+            raise ProviderError(f"Request timed out: {e}", status_code=504, kind="timeout")
+        except httpx.HTTPError as e:
+            raise ProviderError(f"Request failed: {e}", kind="unavailable")
+
+        if response.status_code == 429:
+            raise ProviderError("Rate limited by Gemini API", status_code=429, kind="rate_limited")
+        if response.status_code >= 500:
+            raise ProviderError(
+                f"Gemini API returned {response.status_code}",
+                status_code=response.status_code,
+                kind="timeout" if response.status_code == 504 else "unavailable"
+            )
+        if response.status_code >= 400:
+            raise ProviderError(
+                f"Gemini API returned {response.status_code}: {response.text[:200]}",
+                status_code=response.status_code,
+                kind=_client_error_kind(response.status_code, response.text)
+            )
+
+        try:
+            body = response.json()
+            texts = [
+                "".join(part.get("text", "") for part in candidate["content"]["parts"])
+                for candidate in body["candidates"]
+                if "content" in candidate
+            ]
+            text = texts[0]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"Malformed Gemini response (possibly blocked): {e}")
+
+        usage = body.get("usageMetadata") or {}
+        return ProviderResponse(
+            text=text,
+            model=model,
+            provider=self.name,
+            latency_ms=(time.perf_counter() - start_time) * 1000,
+            usage={
+                "prompt_tokens": usage.get("promptTokenCount", 0),
+                "output_tokens": usage.get("candidatesTokenCount", 0),
+                "total_tokens": usage.get("totalTokenCount", 0),
+            } if usage else {},
+            candidates=texts if len(texts) > 1 else []
+        )
+
+    async def _generate_sdk(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        """Call the SDK's async generate_content."""
+        start_time = time.perf_counter()
+        try:
+            response = await self._get_model(
+                model, max_output_tokens, temperature, candidate_count
+            ).generate_content_async(prompt)
+            if candidate_count > 1:
+                texts = [
+                    "".join(part.text for part in candidate.content.parts)
+                    for candidate in response.candidates
+                ]
+            else:
+                texts = [response.text]
+            text = texts[0]
+        except google_exceptions.ResourceExhausted as e:
+            raise ProviderError(str(e), status_code=429, kind="rate_limited")
+        except google_exceptions.DeadlineExceeded as e:
+            raise ProviderError(str(e), status_code=504, kind="timeout")
+        except google_exceptions.ServiceUnavailable as e:
+            raise ProviderError(str(e), status_code=503, kind="unavailable")
+        except google_exceptions.InvalidArgument as e:
+            raise ProviderError(str(e), status_code=400, kind=_client_error_kind(400, str(e)))
+        except Exception as e:
+            raise ProviderError(str(e))
+
+        return ProviderResponse(
+            text=text,
+            model=model,
+            provider=self.name,
+            latency_ms=(time.perf_counter() - start_time) * 1000,
+            candidates=texts if len(texts) > 1 else []
+        )
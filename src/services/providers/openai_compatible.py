@@ -0,0 +1,98 @@
+"""
+Provider for any OpenAI-compatible chat completions endpoint
+(OpenAI, vLLM, llama.cpp server, Ollama, LiteLLM, ...).
+"""
+import time
+from typing import Optional
+
+import httpx
+
+from src.core.config import settings
+from src.services.providers.base import INVALID_REQUEST_STATUSES, EvaluationProvider, ProviderError, ProviderResponse
+from src.services.providers.transport import ModelTransport, model_transport
+
+
+class OpenAICompatibleProvider(EvaluationProvider):
+    """Provider that POSTs to `{OPENAI_COMPAT_BASE_URL}/chat/completions`."""
+
+    name = "openai"
+
+    def __init__(self, transport: Optional[ModelTransport] = None):
+        if not settings.OPENAI_COMPAT_BASE_URL:
+            raise ValueError("OPENAI_COMPAT_BASE_URL is not set in environment variables")
+
+        self._base_url = settings.OPENAI_COMPAT_BASE_URL.rstrip("/")
+        self._headers = {}
+        if settings.OPENAI_COMPAT_API_KEY:
+            self._headers["Authorization"] = f"Bearer {settings.OPENAI_COMPAT_API_KEY}"
+        self._transport = transport or model_transport
+
+    @property
+    def warmup_url(self) -> Optional[str]:
+        return self._base_url
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float = 0.3,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        # Gemini model names mean nothing here; always use the configured model
+        model_name = settings.OPENAI_COMPAT_MODEL
+        payload = {
+            "model": model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_output_tokens,
+            "temperature": temperature,
+        }
+        if candidate_count > 1:
+            payload["n"] = candidate_count
+        start_time = time.perf_counter()
+        try:
+            response = await self._transport.post(
+                f"{self._base_url}/chat/completions",
+                headers=self._headers,
+                json=payload
+            )
+        except httpx.TimeoutException as e:
+            raise ProviderError(f"Request timed out: {e}", status_code=504, kind="timeout")
+        except httpx.HTTPError as e:
+            raise ProviderError(f"Request failed: {e}", kind="unavailable")
+
+        if response.status_code == 429:
+            raise ProviderError("Rate limited by provider", status_code=429, kind="rate_limited")
+        if response.status_code >= 500:
+            raise ProviderError(
+                f"Provider returned {response.status_code}",
+                status_code=response.status_code,
+                kind="unavailable"
+            )
+        if response.status_code >= 400:
+            raise ProviderError(
+                f"Provider returned {response.status_code}: {response.text[:200]}",
+                status_code=response.status_code,
+                kind="invalid_request" if response.status_code in INVALID_REQUEST_STATUSES else "error"
+            )
+
+        try:
+            body = response.json()
+            texts = [choice["message"]["content"] for choice in body["choices"]]
+            text = texts[0]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"Malformed provider response: {e}")
+
+        usage = body.get("usage") or {}
+        return ProviderResponse(
+            text=text,
+            model=body.get("model", model_name),
+            provider=self.name,
+            latency_ms=(time.perf_counter() - start_time) * 1000,
+            usage={
+                "prompt_tokens": usage.get("prompt_tokens", 0),
+                "output_tokens": usage.get("completion_tokens", 0),
+                "total_tokens": usage.get("total_tokens", 0),
+            } if usage else {},
+            candidates=texts if len(texts) > 1 else []
+        )
@@ -0,0 +1,257 @@
+"""
+Provider registry: lazy construction, per-provider health statistics and
+fallback routing.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.services.providers.base import EvaluationProvider, ProviderError, ProviderResponse
+from src.services.providers.cassette import RecordingProvider, ReplayProvider, cassette_writer
+from src.services.providers.fake import FakeProvider
+from src.services.scheduler import ModelCallScheduler, model_scheduler
+from src.services.usage import record_call_usage
+from src.utils.tokens import estimate_tokens, estimate_usage
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the moving averages
+EWMA_ALPHA = 0.2
+
+
+def _gemini_factory() -> EvaluationProvider:
+    # Imported lazily so the SDK is only loaded when Gemini is used
+    from src.services.providers.gemini import GeminiProvider
+    return GeminiProvider()
+
+
+def _openai_factory() -> EvaluationProvider:
+    from src.services.providers.openai_compatible import OpenAICompatibleProvider
+    return OpenAICompatibleProvider()
+
+
+PROVIDER_FACTORIES: Dict[str, Callable[[], EvaluationProvider]] = {
+    "gemini": _gemini_factory,
+    "fake": FakeProvider,
+    "openai": _openai_factory,
+    "replay": ReplayProvider,
+}
+
+
+class ProviderStats:
+    """Rolling call statistics for one provider."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.latency_ms: Optional[float] = None  # EWMA of successful calls
+        self.error_rate = 0.0  # EWMA of failures (1) and successes (0)
+        self.last_failure_at: Optional[float] = None
+        self.last_error_kind: Optional[str] = None
+
+    def record_success(self, latency_ms: float) -> None:
+        self.calls += 1
+        self.consecutive_failures = 0
+        self.error_rate *= 1 - EWMA_ALPHA
+        self.latency_ms = latency_ms if self.latency_ms is None else (
+            EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * self.latency_ms
+        )
+
+    def record_failure(self, kind: str) -> None:
+        self.calls += 1
+        self.errors += 1
+        self.consecutive_failures += 1
+        self.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * self.error_rate
+        self.last_failure_at = time.monotonic()
+        self.last_error_kind = kind
+
+    @property
+    def healthy(self) -> bool:
+        """Unhealthy after repeated failures, until the cooldown has passed."""
+        if self.consecutive_failures < settings.PROVIDER_UNHEALTHY_AFTER:
+            return True
+        return time.monotonic() - self.last_failure_at >= settings.PROVIDER_COOLDOWN_SECONDS
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "latency_ms": round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error_kind": self.last_error_kind,
+            "healthy": self.healthy,
+        }
+
+
+class ProviderRegistry:
+    """
+    Creates providers on first use and routes calls between them.
+
+    A call goes to the requested provider unless it is currently unhealthy,
+    in which case configured fallbacks (PROVIDER_FALLBACKS) are tried first.
+    Failures on one provider fall through to the next candidate. Each call
+    holds a slot from the model-call scheduler, so queued work is admitted
+    by priority class. With CASSETTE_RECORD on, providers are wrapped so
+    their calls are recorded for replay.
+    """
+
+    def __init__(
+        self,
+        factories: Dict[str, Callable[[], EvaluationProvider]] = None,
+        scheduler: ModelCallScheduler = None
+    ):
+        self._factories = dict(factories or PROVIDER_FACTORIES)
+        self.scheduler = scheduler or model_scheduler
+        self._providers: Dict[str, EvaluationProvider] = {}
+        self.stats: Dict[str, ProviderStats] = {}
+
+    def register(self, name: str, factory: Callable[[], EvaluationProvider]) -> None:
+        """Register (or replace) a provider factory."""
+        self._factories[name] = factory
+        self._providers.pop(name, None)
+
+    def get(self, name: str) -> EvaluationProvider:
+        """Return a provider instance, creating it on first use."""
+        if name not in self._providers:
+            if name not in self._factories:
+                raise ValueError(
+                    f"Unknown provider '{name}'. Available: {', '.join(sorted(self._factories))}"
+                )
+            provider = self._factories[name]()
+            if settings.CASSETTE_RECORD and not isinstance(provider, ReplayProvider):
+                provider = RecordingProvider(provider, cassette_writer)
+            self._providers[name] = provider
+            logger.info(f"Initialized model provider: {name}")
+        return self._providers[name]
+
+    def _stats_for(self, name: str) -> ProviderStats:
+        if name not in self.stats:
+            self.stats[name] = ProviderStats()
+        return self.stats[name]
+
+    def route(self, name: str) -> List[str]:
+        """Order in which providers are tried for a call to `name`."""
+        candidates = [name] + [
+            fallback for fallback in settings.get_provider_fallbacks() if fallback != name
+        ]
+        healthy = [candidate for candidate in candidates if self._stats_for(candidate).healthy]
+        unhealthy = [candidate for candidate in candidates if candidate not in healthy]
+        return healthy + unhealthy
+
+    async def generate(
+        self,
+        prompt: str,
+        provider: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float = 0.3,
+        priority: Optional[str] = None,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        """
+        Generate text, falling back across providers on failure.
+
+        The call waits for a scheduler slot in `priority`'s class (default:
+        the current request's class), costed at the prompt's estimated
+        tokens plus the output budget (per sample) for fair queuing between
+        clients. Token usage is recorded for the current request, estimated
+        locally when the provider does not report it.
+
+        Raises:
+            ProviderError: The last error if every candidate failed
+        """
+        cost = estimate_tokens(prompt) + max_output_tokens * candidate_count
+        async with self.scheduler.slot(priority, cost=cost):
+            return await self._generate(prompt, provider, model, max_output_tokens, temperature, candidate_count)
+
+    async def _generate(
+        self,
+        prompt: str,
+        provider: str,
+        model: str,
+        max_output_tokens: int,
+        temperature: float,
+        candidate_count: int = 1
+    ) -> ProviderResponse:
+        """Try each routed provider in turn."""
+        # Single-sample calls keep the original signature for custom providers
+        options = {"candidate_count": candidate_count} if candidate_count > 1 else {}
+        last_error: Optional[ProviderError] = None
+        for name in self.route(provider):
+            stats = self._stats_for(name)
+            start_time = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self.get(name).generate(
+                        prompt, model=model, max_output_tokens=max_output_tokens, temperature=temperature,
+                        **options
+                    ),
+                    timeout=settings.GEMINI_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                last_error = ProviderError(
+                    f"{name} timed out after {settings.GEMINI_TIMEOUT}s", status_code=504, kind="timeout"
+                )
+            except ProviderError as e:
+                last_error = e
+            except ValueError as e:
+                # Misconfigured provider (missing key / URL)
+                last_error = ProviderError(str(e), kind="config")
+            else:
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                stats.record_success(latency_ms)
+                self.scheduler.record_latency(latency_ms)
+                if not response.usage:
+                    response.usage = estimate_usage(prompt, "\n".join(response.texts))
+                    response.usage_estimated = True
+                record_call_usage(name, response.model, response.usage, response.usage_estimated)
+                metrics.observe("provider_latency_ms", latency_ms, labels={"provider": name})
+                if name != provider:
+                    metrics.increment("provider_fallbacks", labels={"from": provider, "to": name})
+                return response
+
+            metrics.increment("provider_errors", labels={"provider": name, "kind": last_error.kind})
+            if last_error.is_invalid_request:
+                # A rejected request says nothing about the provider's health,
+                # and no other provider would accept it either
+                logger.warning(f"Provider {name} rejected the request: {last_error}")
+                raise last_error
+            stats.record_failure(last_error.kind)
+            if last_error.kind in ("rate_limited", "timeout"):
+                self.scheduler.record_overload(last_error.kind)
+            logger.warning(f"Provider {name} failed ({last_error.kind}): {last_error}")
+
+        raise last_error
+
+    def warmup_urls(self, names: List[str]) -> List[str]:
+        """Origins of the named providers, creating them; misconfigured ones are skipped."""
+        urls = []
+        for name in dict.fromkeys(names):
+            try:
+                url = self.get(name).warmup_url
+            except ValueError as e:
+                logger.warning(f"Skipping warm-up for provider {name}: {str(e)}")
+                continue
+            if url:
+                urls.append(url)
+        return urls
+
+    def snapshot(self) -> Dict:
+        """Per-provider statistics for the metrics endpoint."""
+        return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    async def close(self) -> None:
+        """Close every provider that was created."""
+        for provider in self._providers.values():
+            await provider.close()
+
+
+# Create global instance
+provider_registry = ProviderRegistry()
+
+metrics.register_collector("providers", provider_registry.snapshot)
@@ -0,0 +1,172 @@
+"""
+Shared pooled HTTP transport for model API calls.
+One AsyncClient per process keeps connections (HTTP/2 where available)
+open across requests so connection setup stays off the critical path.
+"""
+import asyncio
+import importlib.util
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+
+from src.core.config import settings
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ModelTransport:
+    """
+    Owner of the pooled httpx client used by HTTP-based providers.
+
+    The client is created on first use (or at startup via `start`), shared
+    by every provider and closed at shutdown. Requests made through `post`
+    are counted so pool utilization can be reported alongside the pool's
+    own connection state.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        # Custom transports (tests, proxies) bypass the connection pool
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self._pool_stats_failed = False
+
+    @property
+    def http2(self) -> bool:
+        return settings.MODEL_HTTP2 and http2_available()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first access."""
+        if self._client is None or self._client.is_closed:
+            if settings.MODEL_HTTP2 and not http2_available():
+                logger.warning("MODEL_HTTP2 is enabled but 'h2' is not installed; using HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=settings.MODEL_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.MODEL_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.MODEL_HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(
+                    settings.GEMINI_TIMEOUT,
+                    connect=settings.MODEL_HTTP_CONNECT_TIMEOUT
+                ),
+                transport=self._transport
+            )
+        return self._client
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST through the shared pool, tracking requests in flight."""
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await self.client.post(url, **kwargs)
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def start(self, warmup_urls: Iterable[str] = ()) -> None:
+        """
+        Create the client and open connections before traffic arrives.
+
+        Each origin gets MODEL_HTTP_WARMUP_CONNECTIONS concurrent requests
+        (one suffices with HTTP/2 multiplexing). The responses are ignored;
+        only the established, pooled connections matter. Failures are
+        logged and never block startup.
+        """
+        client = self.client
+        per_origin = 1 if self.http2 else max(1, settings.MODEL_HTTP_WARMUP_CONNECTIONS)
+        urls = [url for url in dict.fromkeys(warmup_urls) if url]
+        if not urls:
+            return
+
+        async def warm(url: str) -> None:
+            try:
+                await client.head(url, timeout=settings.MODEL_HTTP_CONNECT_TIMEOUT)
+            except httpx.HTTPError as e:
+                logger.warning(f"Connection warm-up to {url} failed: {str(e)}")
+
+        await asyncio.gather(*[warm(url) for url in urls for _ in range(per_origin)])
+        stats = self.pool_stats()
+        logger.info(
+            "Warmed up model API connections",
+            extra={"origins": len(urls), "connections": stats["open"] if stats else None}
+        )
+
+    def pool_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Connection and queue counts from the underlying connection pool, or
+        None if they cannot be read.
+
+        httpx does not expose its pool, so this reads the private state of
+        httpx 0.27 / httpcore 1.0 (both pinned in requirements.txt). Any
+        other layout is reported as unavailable rather than as empty.
+        """
+        if self._client is None:
+            return {"open": 0, "idle": 0, "http2": 0, "queued": 0}
+        if self._transport is not None:
+            # Custom transports bypass the pool
+            return None
+        try:
+            pool = self._client._transport._pool
+            connections = list(pool.connections)
+            pool_requests = list(pool._requests)
+            return {
+                "open": sum(1 for connection in connections if not connection.is_closed()),
+                "idle": sum(1 for connection in connections if connection.is_idle()),
+                "http2": sum(1 for connection in connections if "HTTP/2" in connection.info()),
+                "queued": sum(1 for request in pool_requests if request.is_queued()),
+            }
+        except Exception as e:
+            if not self._pool_stats_failed:
+                self._pool_stats_failed = True
+                logger.warning(f"Connection pool stats unavailable: {str(e)}")
+            return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool configuration and utilization for the metrics endpoint."""
+        connections = self.pool_stats()
+        limit = settings.MODEL_HTTP_MAX_CONNECTIONS
+        # Share of the connection limit currently carrying requests
+        if not limit:
+            utilization = 0.0
+        elif connections is None:
+            utilization = round(min(self.in_flight / limit, 1.0), 4)
+        else:
+            utilization = round((connections["open"] - connections["idle"]) / limit, 4)
+        return {
+            "http2": self.http2,
+            "max_connections": settings.MODEL_HTTP_MAX_CONNECTIONS,
+            "max_keepalive": settings.MODEL_HTTP_MAX_KEEPALIVE,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "connections": connections,
+            "utilization": utilization,
+        }
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Create global instance
+model_transport = ModelTransport()
+
+metrics.register_collector("http_pool", model_transport.snapshot)
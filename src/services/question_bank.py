@@ -0,0 +1,122 @@
+"""
+Registry of interview questions that requests refer to by `question_id`.
+"""
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from src.core.config import settings
+from src.services.gemini_service import gemini_service
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownQuestion(ValueError):
+    """The question_id is not in the question bank."""
+
+
+@dataclass(frozen=True)
+class BankQuestion:
+    """A question with its context, rubric and compiled prompt prefix."""
+
+    id: str
+    question: str
+    context: Optional[str] = None
+    rubric: Optional[str] = None
+    prompt_prefix: str = ""
+
+
+def _format_rubric(rubric: Union[str, List[str], None]) -> Optional[str]:
+    """Rubrics may be given as text or as a list of criteria."""
+    if not rubric:
+        return None
+    if isinstance(rubric, str):
+        return rubric.strip()
+    return "\n".join(f"- {criterion.strip()}" for criterion in rubric)
+
+
+class QuestionBank:
+    """
+    Questions loaded from QUESTION_BANK_PATH on first use: a JSON object
+    mapping question ids to `{"question": ..., "context": ..., "rubric": ...}`
+    (context and rubric optional; the rubric is text or a list of criteria).
+
+    Each question's evaluation prompt prefix is compiled once at load time
+    and pinned in the model service, so requests send only the id and the
+    answer, and every evaluation of a question reuses the same prefix.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path if path is not None else settings.QUESTION_BANK_PATH
+        self._questions: Dict[str, BankQuestion] = {}
+        self._loaded = False
+
+    def register(
+        self,
+        question_id: str,
+        question: str,
+        context: Optional[str] = None,
+        rubric: Union[str, List[str], None] = None
+    ) -> BankQuestion:
+        """Add or replace a question and compile and pin its prompt prefix."""
+        rubric_text = _format_rubric(rubric)
+        entry = BankQuestion(
+            id=question_id,
+            question=question,
+            context=context,
+            rubric=rubric_text,
+            prompt_prefix=gemini_service.pin_question_prefix(question, context, rubric_text)
+        )
+        previous = self._questions.get(question_id)
+        self._questions[question_id] = entry
+        if previous is not None and not any(
+            (other.question, other.context, other.rubric) == (previous.question, previous.context, previous.rubric)
+            for other in self._questions.values()
+        ):
+            gemini_service.unpin_question_prefix(previous.question, previous.context, previous.rubric)
+        return entry
+
+    def get(self, question_id: str) -> Optional[BankQuestion]:
+        """Question with this id, if any."""
+        self._ensure_loaded()
+        return self._questions.get(question_id)
+
+    def require(self, question_id: str) -> BankQuestion:
+        """
+        Question with this id.
+
+        Raises:
+            UnknownQuestion: If the id is not in the bank
+        """
+        entry = self.get(question_id)
+        if entry is None:
+            raise UnknownQuestion(f"Unknown question_id '{question_id}'")
+        return entry
+
+    def list(self) -> List[BankQuestion]:
+        """All questions, in id order."""
+        self._ensure_loaded()
+        return [self._questions[question_id] for question_id in sorted(self._questions)]
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not Path(self.path).exists():
+            return
+
+        with open(self.path, encoding="utf-8") as bank_file:
+            bank = json.load(bank_file)
+        for question_id, item in bank.items():
+            self.register(question_id, item["question"], item.get("context"), item.get("rubric"))
+        logger.info(f"Loaded {len(self._questions)} questions from {self.path}")
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._questions)
+
+
+# Create global instance
+question_bank = QuestionBank()
@@ -5,54 +5,205 @@ Evaluates multiple candidates and ranks them by score.
 import logging
 import time
 import asyncio
-from typing import List, Dict, Any
+import hashlib
+import heapq
+from collections import OrderedDict
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from pydantic import ValidationError
 
+from src.services.cohort_stats import cohort_stats
 from src.services.gemini_service import gemini_service
+from src.services.tie_break_service import tie_break_service
+from src.services.ranking_store import ranking_store
+from src.services.reference_answers import reference_answers as reference_registry
+from src.core.config import settings
+from src.core.lifecycle import lifecycle
+from src.core.metrics import metrics
+from src.schemas.ranking import CandidateInput
+from src.utils.near_duplicates import NearDuplicateIndex, cluster_near_duplicates
+from src.utils.stream_parsing import ParsedRecord
 
 logger = logging.getLogger(__name__)
 
 
+def _rank_key(candidate: Dict) -> Tuple:
+    # Score (descending), then reference similarity when present, then id
+    # (for consistent tie-breaking)
+    return (-candidate["score"], -(candidate.get("reference_similarity") or 0.0), candidate["id"])
+
+
+class _TopCandidates:
+    """
+    Evaluated candidates of a streamed ranking. With a limit, only the best
+    `limit` are kept: the buffer is trimmed back to them with heapq whenever
+    it reaches twice the limit, so memory does not grow with the row count.
+    """
+    
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.count = 0
+        self._entries: Dict[str, Dict] = {}
+    
+    def add(self, entry: Dict) -> None:
+        self.count += 1
+        self._entries[entry["id"]] = entry
+        if self.limit and len(self._entries) >= 2 * self.limit:
+            kept = heapq.nsmallest(self.limit, self._entries.values(), key=_rank_key)
+            self._entries = {candidate["id"]: candidate for candidate in kept}
+    
+    def skip(self) -> None:
+        """Count a candidate that cannot make the leading entries."""
+        self.count += 1
+    
+    def get(self, candidate_id: str) -> Optional[Dict]:
+        """A kept entry, or None if it was never added or has been trimmed."""
+        return self._entries.get(candidate_id)
+    
+    def could_keep(self, key: Tuple) -> bool:
+        """Whether an entry with this rank key would be among the best `limit` so far."""
+        if not self.limit or len(self._entries) < self.limit:
+            return True
+        return key < heapq.nsmallest(self.limit, map(_rank_key, self._entries.values()))[-1]
+    
+    def entries(self) -> List[Dict]:
+        return list(self._entries.values())
+
+
 class RankingService:
     """Service for ranking multiple candidates."""
     
     def __init__(self):
         """Initialize ranking service."""
         self.gemini = gemini_service
+        # Answer key -> (evaluation task, expiry); running tasks are shared
+        self._evaluations: "OrderedDict[str, Tuple[asyncio.Future, float]]" = OrderedDict()
     
-    async def rank_candidates(self, candidates: List[Dict[str, Any]]) -> Dict:
+    async def rank_candidates(
+        self,
+        candidates: List[Dict[str, Any]],
+        refine_ties: bool = False,
+        refine_top_k: Optional[int] = None,
+        question: Optional[str] = None,
+        reference_answers: Optional[List[str]] = None,
+        deadline_ms: Optional[int] = None
+    ) -> Dict:
         """
         Evaluate and rank multiple candidates.
         
+        Evaluations are cached per answer (RANKING_CACHE_SIZE), and a request
+        for an answer that is still being evaluated joins that evaluation.
+        With a deadline, candidates not evaluated in time are returned as
+        pending; their evaluations keep running and fill the cache, so a
+        repeated request completes from it.
+        
+        With a question, the scores of a complete ranking are added to that
+        question's cohort statistics (failed evaluations excluded).
+        
         Args:
             candidates: List of candidate objects with id, answer, and optional metadata
+            refine_ties: Order tied candidates with pairwise model comparisons
+            refine_top_k: Number of leading positions to refine (default from settings)
+            question: Optional question, used to look up reference answers
+            reference_answers: Optional inline reference answers
+            deadline_ms: Optional time budget for the whole request
             
         Returns:
-            Dict containing ranked candidates and metadata
+            Dict containing ranked candidates, pending candidates and metadata
         """
         start_time = time.time()
+        deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms else None
         
         logger.info(f"Starting evaluation of {len(candidates)} candidates")
         
         try:
-            # Evaluate all candidates concurrently
-            evaluation_tasks = [
-                self._evaluate_single_candidate(candidate)
-                for candidate in candidates
+            # Group near-identical answers; only representatives are evaluated
+            clusters = self._cluster_candidates(candidates)
+            candidates_by_id = {candidate["id"]: candidate for candidate in candidates}
+            
+            # Evaluate all representatives concurrently, reusing cached evaluations
+            evaluation_tasks = {
+                representative_id: self._cached_evaluation(candidates_by_id[representative_id]["answer"])
+                for representative_id in clusters
+            }
+            cached = sum(1 for task in evaluation_tasks.values() if task.done())
+            
+            waiting = {task for task in evaluation_tasks.values() if not task.done()}
+            if waiting:
+                await asyncio.wait(waiting, timeout=self._remaining(deadline))
+            
+            evaluated_representatives = []
+            pending_ids = []
+            for representative_id, task in evaluation_tasks.items():
+                if task.done():
+                    evaluated_representatives.append(
+                        self._candidate_result(candidates_by_id[representative_id], task)
+                    )
+                else:
+                    pending_ids.append(representative_id)
+            
+            # Fan representative results out to their cluster members
+            evaluated_candidates = self._expand_clusters(
+                evaluated_representatives, clusters, candidates_by_id
+            )
+            pending_candidates = [
+                {"id": member_id, "duplicate_of": representative_id if member_id != representative_id else None}
+                for representative_id in pending_ids
+                for member_id, _ in clusters[representative_id]
             ]
             
-            evaluated_candidates = await asyncio.gather(*evaluation_tasks)
+            # Similarity to reference answers, as a signal and tie-breaker
+            reference_stats = self._attach_reference_similarity(
+                evaluated_candidates, candidates_by_id, question, reference_answers
+            )
             
             # Sort by score (descending) and add rank
             ranked_candidates = self._sort_and_rank(evaluated_candidates)
             
+            tie_break_stats = None
+            if refine_ties and pending_candidates:
+                tie_break_stats = {"skipped": "ranking incomplete at deadline"}
+            elif refine_ties:
+                try:
+                    ranked_candidates, tie_break_stats = await asyncio.wait_for(
+                        tie_break_service.refine(
+                            ranked_candidates,
+                            answers={candidate["id"]: candidate["answer"] for candidate in candidates},
+                            top_k=refine_top_k
+                        ),
+                        timeout=self._remaining(deadline)
+                    )
+                except asyncio.TimeoutError:
+                    # Judgements made so far stay cached for the next request
+                    tie_break_stats = {"skipped": "deadline reached during refinement"}
+            
             # Calculate total time
             evaluation_time_ms = int((time.time() - start_time) * 1000)
             
             response = {
                 "ranked_candidates": ranked_candidates,
-                "total_candidates": len(ranked_candidates),
-                "evaluation_time_ms": evaluation_time_ms
+                "pending_candidates": pending_candidates,
+                "partial": bool(pending_candidates),
+                "total_candidates": len(candidates),
+                "evaluation_time_ms": evaluation_time_ms,
+                "metadata": {
+                    "evaluations": len(clusters) - cached,
+                    "evaluations_saved": len(candidates) - len(clusters) + cached,
+                    "cached_evaluations": cached,
+                    "duplicate_clusters": self._describe_clusters(clusters)
+                }
             }
+            if question and not pending_candidates:
+                self._record_cohort(question, ranked_candidates, clusters, evaluation_tasks)
+            if pending_candidates:
+                metrics.increment("ranking_partial_responses")
+                logger.warning(
+                    f"Deadline of {deadline_ms}ms reached with {len(pending_candidates)} candidates pending",
+                    extra={"pending": len(pending_candidates), "deadline_ms": deadline_ms}
+                )
+            if tie_break_stats is not None:
+                response["metadata"]["tie_break"] = tie_break_stats
+            if reference_stats is not None:
+                response["metadata"]["reference_similarity"] = reference_stats
             
             logger.info(
                 f"Ranking completed for {len(candidates)} candidates in {evaluation_time_ms}ms",
@@ -68,28 +219,447 @@ class RankingService:
             logger.error(f"Ranking failed: {str(e)}", exc_info=True)
             raise
     
-    async def _evaluate_single_candidate(self, candidate: Dict[str, Any]) -> Dict:
+    async def rank_stream(
+        self,
+        records: AsyncIterator[ParsedRecord],
+        top_k: Optional[int] = None
+    ) -> Dict:
         """
-        Evaluate a single candidate.
+        Evaluate candidates as they are parsed from an upload and rank them.
+        
+        Evaluations start while the rest of the file is still arriving. The
+        next record is only pulled once an evaluation slot is free, so the
+        upload is consumed at the pace of evaluation and at most
+        UPLOAD_CONCURRENCY records are held in memory. Invalid rows are
+        reported and skipped. With top_k only the leading candidates'
+        evaluations are kept rather than one per row.
+        
+        Near-duplicates reuse their representative's evaluation. One that
+        arrives after its representative has dropped out of the top_k is
+        evaluated on its own if its id could still place it there.
         
         Args:
-            candidate: Dict with id, answer, and optional metadata
+            records: Async iterator of (line number, record, error) tuples
+            top_k: Optional number of leading candidates to return
             
         Returns:
-            Dict with evaluation results and candidate info
+            Dict containing ranked candidates, row counts and row errors
         """
+        start_time = time.time()
+        
+        slots = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+        in_flight = set()
+        top = _TopCandidates(top_k)
+        # Representative id -> near-duplicates waiting for its evaluation
+        waiting: Dict[str, List[Dict[str, Any]]] = {}
+        scores: Dict[str, int] = {}
+        seen_ids = set()
+        errors: List[Dict[str, Any]] = []
+        counts = {"received": 0, "rejected": 0, "evaluations": 0}
+        dedup_index = (
+            NearDuplicateIndex(settings.DEDUP_SIMILARITY_THRESHOLD)
+            if settings.DEDUP_ENABLED else None
+        )
+        
+        def reject(line: int, candidate_id: Optional[str], message: str) -> None:
+            counts["rejected"] += 1
+            if len(errors) < settings.UPLOAD_MAX_REPORTED_ERRORS:
+                errors.append({"line": line, "id": candidate_id, "error": message})
+        
+        def add_duplicate(representative: Dict, member: Dict[str, Any]) -> None:
+            top.add({
+                **representative,
+                "id": member["id"],
+                "metadata": member["metadata"],
+                "duplicate_of": representative["id"]
+            })
+        
+        async def evaluate(candidate: Dict[str, Any]) -> None:
+            try:
+                evaluation = await self._evaluate_single_candidate(candidate)
+                counts["evaluations"] += 1
+                scores[candidate["id"]] = evaluation["score"]
+                top.add(evaluation)
+                for member in waiting.get(candidate["id"], []):
+                    add_duplicate(evaluation, member)
+            finally:
+                waiting.pop(candidate["id"], None)
+                slots.release()
+        
+        logger.info("Starting streaming ranking")
+        
         try:
-            evaluation = await self.gemini.evaluate_answer(
-                candidate_answer=candidate["answer"]
-            )
+            async for line, record, parse_error in records:
+                counts["received"] += 1
+                if counts["received"] > settings.UPLOAD_MAX_ROWS:
+                    reject(line, None, f"Row limit of {settings.UPLOAD_MAX_ROWS} exceeded; remaining rows ignored")
+                    break
+                
+                if parse_error is not None:
+                    reject(line, None, parse_error)
+                    continue
+                
+                try:
+                    candidate = CandidateInput.model_validate(record)
+                except ValidationError as e:
+                    reject(line, record.get("id"), "; ".join(error["msg"] for error in e.errors()))
+                    continue
+                
+                if candidate.id in seen_ids:
+                    reject(line, candidate.id, "Duplicate candidate id")
+                    continue
+                seen_ids.add(candidate.id)
+                
+                candidate_data = {
+                    "id": candidate.id,
+                    "answer": candidate.answer,
+                    "metadata": candidate.metadata
+                }
+                
+                if dedup_index is not None:
+                    representative_id, _ = dedup_index.find_or_add(candidate.id, candidate.answer)
+                    if representative_id != candidate.id:
+                        member = {"id": candidate.id, "metadata": candidate.metadata}
+                        representative = top.get(representative_id)
+                        if representative_id in waiting:
+                            waiting[representative_id].append(member)
+                            continue
+                        if representative is not None:
+                            add_duplicate(representative, member)
+                            continue
+                        if not top.could_keep((-scores[representative_id], 0.0, candidate.id)):
+                            top.skip()
+                            continue
+                    else:
+                        waiting[candidate.id] = []
+                
+                await slots.acquire()
+                task = asyncio.create_task(evaluate(candidate_data))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            raise
+        
+        ranked_candidates = self._sort_and_rank(top.entries())
+        evaluation_time_ms = int((time.time() - start_time) * 1000)
+        evaluations = counts["evaluations"]
+        
+        logger.info(
+            f"Streaming ranking completed for {top.count} candidates in {evaluation_time_ms}ms",
+            extra={
+                "total_candidates": top.count,
+                "rows_rejected": counts["rejected"],
+                "time_ms": evaluation_time_ms
+            }
+        )
+        
+        return {
+            "ranked_candidates": ranked_candidates[:top_k] if top_k else ranked_candidates,
+            "total_candidates": top.count,
+            "evaluation_time_ms": evaluation_time_ms,
+            "metadata": {
+                "evaluations": evaluations,
+                "evaluations_saved": top.count - evaluations
+            },
+            "rows_received": counts["received"],
+            "rows_rejected": counts["rejected"],
+            "errors": errors,
+            "errors_truncated": counts["rejected"] > len(errors)
+        }
+    
+    async def add_to_ranking(
+        self,
+        name: str,
+        candidates: List[Dict[str, Any]],
+        replace_existing: bool = False
+    ) -> Dict:
+        """
+        Evaluate new candidates and insert them into a named ranking.
+        
+        Candidates already in the ranking are skipped unless replace_existing
+        is set, so an update only costs evaluations of the new answers.
+        Candidates whose evaluation fails are left out of the ranking (an
+        existing entry is kept as it was) and reported in errors, so the
+        next update evaluates them again.
+        
+        Args:
+            name: Ranking name
+            candidates: List of candidate objects with id, answer, and optional metadata
+            replace_existing: Re-evaluate and replace candidates whose id already exists
+            
+        Returns:
+            Dict summarizing the update
+        """
+        start_time = time.time()
+        
+        ranking = await ranking_store.get_or_create(name)
+        to_evaluate = [
+            candidate for candidate in candidates
+            if replace_existing or candidate["id"] not in ranking
+        ]
+        skipped = [
+            candidate["id"] for candidate in candidates
+            if not replace_existing and candidate["id"] in ranking
+        ]
+        
+        logger.info(
+            f"Adding {len(to_evaluate)} candidates to ranking '{name}' "
+            f"({len(skipped)} already present)"
+        )
+        
+        clusters = self._cluster_candidates(to_evaluate)
+        candidates_by_id = {candidate["id"]: candidate for candidate in to_evaluate}
+        outcomes = await asyncio.gather(*[
+            self._evaluate_candidate(candidates_by_id[representative_id])
+            for representative_id in clusters
+        ], return_exceptions=True)
+        
+        evaluated_representatives = []
+        errors = []
+        for representative_id, outcome in zip(clusters, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(
+                    f"Failed to evaluate candidate {representative_id}: {str(outcome)}",
+                    exc_info=outcome
+                )
+                errors.extend(
+                    {"id": member_id, "error": "Evaluation failed"}
+                    for member_id, _ in clusters[representative_id]
+                )
+            else:
+                evaluated_representatives.append(outcome)
+        evaluated = self._expand_clusters(evaluated_representatives, clusters, candidates_by_id)
+        
+        # Looked up again by name: the ranking may have changed or been deleted meanwhile
+        ranking, replaced = await ranking_store.upsert(name, evaluated)
+        
+        evaluation_time_ms = int((time.time() - start_time) * 1000)
+        
+        logger.info(
+            f"Ranking '{name}' updated in {evaluation_time_ms}ms",
+            extra={
+                "ranking": name,
+                "added": len(evaluated) - replaced,
+                "failed": len(errors),
+                "total_candidates": len(ranking),
+                "time_ms": evaluation_time_ms
+            }
+        )
+        
+        return {
+            "name": name,
+            "added": len(evaluated) - replaced,
+            "replaced": replaced,
+            "skipped": skipped,
+            "errors": errors,
+            "evaluations": len(clusters),
+            "total_candidates": len(ranking),
+            "evaluation_time_ms": evaluation_time_ms
+        }
+    
+    def _cluster_candidates(
+        self,
+        candidates: List[Dict[str, Any]]
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Cluster candidates whose answers are near-duplicates.
+        
+        Args:
+            candidates: List of candidate dicts with id and answer
             
+        Returns:
+            Dict mapping representative id to its (member id, similarity)
+            pairs, in input order; every candidate is its own cluster
+            when deduplication is disabled
+        """
+        if not settings.DEDUP_ENABLED:
+            return {candidate["id"]: [(candidate["id"], 1.0)] for candidate in candidates}
+        
+        return cluster_near_duplicates(
+            [(candidate["id"], candidate["answer"]) for candidate in candidates],
+            threshold=settings.DEDUP_SIMILARITY_THRESHOLD
+        )
+    
+    def _expand_clusters(
+        self,
+        evaluated_representatives: List[Dict],
+        clusters: Dict[str, List[Tuple[str, float]]],
+        candidates_by_id: Dict[str, Dict[str, Any]]
+    ) -> List[Dict]:
+        """
+        Copy each representative's evaluation to the other cluster members.
+        
+        Args:
+            evaluated_representatives: Evaluations of cluster representatives
+            clusters: Representative id to (member id, similarity) pairs
+            candidates_by_id: Original candidate dicts keyed by id
+            
+        Returns:
+            Evaluated candidate dicts for every candidate
+        """
+        evaluated_candidates = []
+        for evaluation in evaluated_representatives:
+            evaluated_candidates.append(evaluation)
+            for member_id, _ in clusters[evaluation["id"]][1:]:
+                evaluated_candidates.append({
+                    **evaluation,
+                    "id": member_id,
+                    "metadata": candidates_by_id[member_id].get("metadata"),
+                    "duplicate_of": evaluation["id"]
+                })
+        
+        if len(evaluated_candidates) > len(evaluated_representatives):
+            logger.info(
+                f"Reused {len(evaluated_candidates) - len(evaluated_representatives)} "
+                f"evaluations for near-duplicate answers"
+            )
+        
+        return evaluated_candidates
+    
+    def _describe_clusters(self, clusters: Dict[str, List[Tuple[str, float]]]) -> List[Dict]:
+        """Summarize clusters with more than one member for response metadata."""
+        return [
+            {
+                "representative": representative_id,
+                "members": [member_id for member_id, _ in members],
+                "min_similarity": round(min(score for _, score in members), 4)
+            }
+            for representative_id, members in clusters.items()
+            if len(members) > 1
+        ]
+    
+    def clear_cache(self) -> None:
+        """Forget cached answer evaluations."""
+        self._evaluations.clear()
+    
+    def _cached_evaluation(self, answer: str) -> asyncio.Future:
+        """
+        Task evaluating an answer: a cached or running one when available.
+        
+        Tasks run detached from the request (and are drained at shutdown), so
+        evaluations still pending at a deadline complete into the cache.
+        Failed evaluations are not cached.
+        """
+        provider = settings.get_ranking_provider()
+        key = hashlib.blake2b(f"{provider}\0{answer}".encode("utf-8"), digest_size=16).hexdigest()
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        
+        cached = self._evaluations.get(key)
+        if cached is not None:
+            task, expires_at = cached
+            usable = (task.done() and expires_at > now) or (not task.done() and task.get_loop() is loop)
+            if usable:
+                self._evaluations.move_to_end(key)
+                metrics.increment("ranking_cache_hits", labels={"state": "done" if task.done() else "running"})
+                return task
+            del self._evaluations[key]
+        
+        task = lifecycle.track(asyncio.ensure_future(
+            self.gemini.evaluate_answer(candidate_answer=answer, provider=provider)
+        ))
+        self._evaluations[key] = (task, now + settings.RANKING_CACHE_TTL_SECONDS)
+        task.add_done_callback(lambda done: self._forget_failed_evaluation(key, done))
+        while len(self._evaluations) > settings.RANKING_CACHE_SIZE:
+            self._evaluations.popitem(last=False)
+        return task
+    
+    def _forget_failed_evaluation(self, key: str, task: asyncio.Future) -> None:
+        """Drop a failed evaluation so the next request retries it."""
+        if task.cancelled() or task.exception() is not None:
+            cached = self._evaluations.get(key)
+            if cached is not None and cached[0] is task:
+                del self._evaluations[key]
+    
+    def _candidate_result(self, candidate: Dict[str, Any], task: asyncio.Future) -> Dict:
+        """Candidate entry from a finished evaluation task."""
+        if task.cancelled() or task.exception() is not None:
+            error = "cancelled" if task.cancelled() else str(task.exception())
+            logger.error(f"Failed to evaluate candidate {candidate['id']}: {error}")
             return {
                 "id": candidate["id"],
-                "score": evaluation["score"],
-                "summary": evaluation["summary"],
-                "improvement": evaluation["improvement"],
+                "score": 1,
+                "summary": "Evaluation failed",
+                "improvement": "Unable to evaluate this response",
                 "metadata": candidate.get("metadata")
             }
+        evaluation = task.result()
+        return {
+            "id": candidate["id"],
+            "score": evaluation["score"],
+            "summary": evaluation["summary"],
+            "improvement": evaluation["improvement"],
+            "metadata": candidate.get("metadata"),
+            "tier": evaluation.get("tier")
+        }
+    
+    @staticmethod
+    def _record_cohort(
+        question: str,
+        ranked_candidates: List[Dict],
+        clusters: Dict[str, List[Tuple[str, float]]],
+        evaluation_tasks: Dict[str, asyncio.Future]
+    ) -> None:
+        """Add each successfully evaluated candidate's score to the question's cohort."""
+        succeeded = {
+            member_id
+            for representative_id, task in evaluation_tasks.items()
+            if not task.cancelled() and task.exception() is None
+            for member_id, _ in clusters[representative_id]
+        }
+        for candidate in ranked_candidates:
+            if candidate["id"] in succeeded:
+                cohort_stats.record(candidate["score"], question=question)
+    
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        """Seconds left before the deadline (None without one)."""
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+    
+    async def _evaluate_candidate(self, candidate: Dict[str, Any]) -> Dict:
+        """
+        Evaluate a single candidate, raising if the evaluation fails.
+        
+        Args:
+            candidate: Dict with id, answer, and optional metadata
+            
+        Returns:
+            Dict with evaluation results and candidate info
+        """
+        evaluation = await self.gemini.evaluate_answer(
+            candidate_answer=candidate["answer"],
+            provider=settings.get_ranking_provider()
+        )
+        
+        return {
+            "id": candidate["id"],
+            "score": evaluation["score"],
+            "summary": evaluation["summary"],
+            "improvement": evaluation["improvement"],
+            "metadata": candidate.get("metadata"),
+            "tier": evaluation.get("tier")
+        }
+    
+    async def _evaluate_single_candidate(self, candidate: Dict[str, Any]) -> Dict:
+        """
+        Evaluate a single candidate, scoring it 1 if the evaluation fails.
+        
+        Args:
+            candidate: Dict with id, answer, and optional metadata
+            
+        Returns:
+            Dict with evaluation results and candidate info
+        """
+        try:
+            return await self._evaluate_candidate(candidate)
             
         except Exception as e:
             logger.error(
@@ -105,6 +675,35 @@ class RankingService:
                 "metadata": candidate.get("metadata")
             }
     
+    def _attach_reference_similarity(
+        self,
+        evaluated_candidates: List[Dict],
+        candidates_by_id: Dict[str, Dict[str, Any]],
+        question: Optional[str],
+        reference_answers: Optional[List[str]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Score all candidates against the reference answers in one pass.
+        
+        Returns:
+            Stats for the response metadata, or None when no references apply
+        """
+        index = reference_registry.resolve(question, reference_answers)
+        if index is None:
+            return None
+        
+        start_time = time.perf_counter()
+        similarities = index.score([
+            candidates_by_id[candidate["id"]]["answer"] for candidate in evaluated_candidates
+        ])
+        for candidate, similarity in zip(evaluated_candidates, similarities.tolist()):
+            candidate["reference_similarity"] = round(similarity, 4)
+        
+        return {
+            "references": len(index),
+            "scoring_ms": round((time.perf_counter() - start_time) * 1000, 3)
+        }
+    
     def _sort_and_rank(self, evaluated_candidates: List[Dict]) -> List[Dict]:
         """
         Sort candidates by score and assign ranks.
@@ -115,11 +714,7 @@ class RankingService:
         Returns:
             List of candidates sorted by score with rank assigned
         """
-        # Sort by score (descending), then by id (for consistent tie-breaking)
-        sorted_candidates = sorted(
-            evaluated_candidates,
-            key=lambda x: (-x["score"], x["id"])
-        )
+        sorted_candidates = sorted(evaluated_candidates, key=_rank_key)
         
         # Assign ranks
         for rank, candidate in enumerate(sorted_candidates, start=1):
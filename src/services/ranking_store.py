@@ -0,0 +1,366 @@
+"""
+Persistent store for named, incrementally maintained rankings.
+Each ranking keeps a sorted index so inserts, removals and page reads
+never require re-evaluating existing candidates.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process journal locking, run a single worker
+    fcntl = None
+
+from src.core.config import settings
+from src.utils.score_histogram import ScoreHistogram
+
+logger = logging.getLogger(__name__)
+
+RANKING_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,100}$")
+
+# Pause between attempts to take a ranking's lock held by another worker
+LOCK_RETRY_SECONDS = 0.005
+
+SortKey = Tuple[int, str]
+
+# (st_dev, st_ino) of a journal file, its generation and the byte offset read up to
+JournalPosition = Tuple[Tuple[int, int], Optional[str], int]
+
+
+class StoredRanking:
+    """
+    A named ranking with candidates kept in score order, and a score
+    histogram maintained alongside for cohort statistics.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove every candidate."""
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._order: List[SortKey] = []
+        self.histogram = ScoreHistogram()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self.entries
+
+    @staticmethod
+    def _sort_key(entry: Dict[str, Any]) -> SortKey:
+        # Same order as RankingService._sort_and_rank without references: score desc, then id
+        return (-entry["score"], entry["id"])
+
+    def insert(self, entry: Dict[str, Any]) -> None:
+        """Insert or replace a candidate, keeping the index sorted."""
+        if entry["id"] in self.entries:
+            self.remove(entry["id"])
+        self.entries[entry["id"]] = entry
+        bisect.insort(self._order, self._sort_key(entry))
+        self.histogram.add(entry["score"])
+
+    def remove(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a candidate; returns the removed entry or None."""
+        entry = self.entries.pop(candidate_id, None)
+        if entry is not None:
+            index = bisect.bisect_left(self._order, self._sort_key(entry))
+            del self._order[index]
+            self.histogram.remove(entry["score"])
+        return entry
+
+    def rank_of(self, candidate_id: str) -> Optional[int]:
+        """1-based rank of a candidate, or None if absent."""
+        entry = self.entries.get(candidate_id)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self._order, self._sort_key(entry)) + 1
+
+    def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Return ranked entries for positions offset+1 .. offset+limit."""
+        return [
+            {**self.entries[candidate_id], "rank": offset + position}
+            for position, (_, candidate_id) in enumerate(
+                self._order[offset:offset + limit], start=1
+            )
+        ]
+
+
+class RankingStore:
+    """
+    Registry of named rankings persisted as append-only journals.
+
+    Every mutation appends one line per changed candidate to
+    `<storage_dir>/<name>.jsonl`, so persistence cost is proportional to
+    the update rather than the ranking size. Journals are compacted when
+    loaded if they hold many superseded records. Every journal file starts
+    with a generation record, so a file recreated after a delete or
+    compaction is recognized even when the filesystem reuses its inode.
+
+    Several worker processes can share a storage directory. Mutations and
+    compaction hold an exclusive lock on `<name>.lock`, and each process
+    applies the records other processes appended (or reloads a compacted
+    journal) before reading or changing a ranking. Mutations take the
+    ranking by name under the lock, so a ranking deleted while a caller was
+    evaluating candidates is started again from empty rather than revived.
+    """
+
+    def __init__(self, storage_dir: str = None):
+        self.storage_dir = Path(storage_dir or settings.RANKINGS_DIR)
+        self._rankings: Dict[str, StoredRanking] = {}
+        self._positions: Dict[str, JournalPosition] = {}
+
+    @staticmethod
+    def validate_name(name: str) -> None:
+        """Ensure a ranking name is safe to use as a file name."""
+        if not RANKING_NAME_PATTERN.match(name):
+            raise ValueError(
+                "Ranking name must be 1-100 characters of letters, digits, '.', '_' or '-'"
+            )
+
+    def _journal_path(self, name: str) -> Path:
+        return self.storage_dir / f"{name}.jsonl"
+
+    def _lock_path(self, name: str) -> Path:
+        return self.storage_dir / f"{name}.lock"
+
+    async def get(self, name: str) -> Optional[StoredRanking]:
+        """Return a ranking, loading it from disk on first access."""
+        self.validate_name(name)
+        ranking = self._rankings.get(name)
+        if ranking is not None:
+            if self._sync(ranking) is None:
+                # Deleted by another process
+                del self._rankings[name]
+                return None
+            return ranking
+        if self._journal_path(name).exists():
+            ranking = await self._load(name)
+            if ranking is not None:
+                self._rankings[name] = ranking
+        return ranking
+
+    async def get_or_create(self, name: str) -> StoredRanking:
+        """Return a ranking, creating an empty one if needed."""
+        ranking = await self.get(name)
+        if ranking is None:
+            ranking = StoredRanking(name)
+            self._rankings[name] = ranking
+        return ranking
+
+    def list_names(self) -> List[str]:
+        """Names of all known rankings."""
+        names = {
+            name for name in self._rankings
+            if name not in self._positions or self._journal_path(name).exists()
+        }
+        if self.storage_dir.exists():
+            names.update(path.stem for path in self.storage_dir.glob("*.jsonl"))
+        return sorted(names)
+
+    async def upsert(self, name: str, entries: List[Dict[str, Any]]) -> Tuple[StoredRanking, int]:
+        """
+        Insert entries into a ranking, creating it if needed, and append
+        them to the journal.
+
+        Returns:
+            The updated ranking and the number of entries that replaced an
+            existing candidate
+        """
+        self.validate_name(name)
+        records = [{"op": "upsert", "entry": entry} for entry in entries]
+        async with self._locked(name):
+            ranking = self._rankings.get(name)
+            if ranking is None:
+                ranking = StoredRanking(name)
+            # Empties the ranking if its journal was deleted meanwhile
+            self._sync(ranking)
+            replaced = sum(1 for entry in entries if entry["id"] in ranking)
+            for record in records:
+                self._apply(ranking, record)
+            self._append(name, records)
+            self._rankings[name] = ranking
+        return ranking, replaced
+
+    async def remove(self, name: str, candidate_id: str) -> bool:
+        """Remove a candidate and journal the removal."""
+        self.validate_name(name)
+        async with self._locked(name):
+            ranking = self._rankings.get(name)
+            if ranking is None or self._sync(ranking) is None:
+                return False
+            if ranking.remove(candidate_id) is None:
+                return False
+            self._append(name, [{"op": "remove", "id": candidate_id}])
+        return True
+
+    async def delete(self, name: str) -> bool:
+        """Delete a ranking and its journal."""
+        self.validate_name(name)
+        async with self._locked(name):
+            existed = self._rankings.pop(name, None) is not None
+            self._positions.pop(name, None)
+            path = self._journal_path(name)
+            if path.exists():
+                path.unlink()
+                existed = True
+            self._lock_path(name).unlink(missing_ok=True)
+        return existed
+
+    @asynccontextmanager
+    async def _locked(self, name: str) -> AsyncIterator[None]:
+        """
+        Hold the ranking's cross-process lock.
+
+        The lock is polled without blocking so a worker waiting for another
+        one keeps serving other requests. The lock file is removed when the
+        ranking is deleted, so a lock taken on a file that has since been
+        unlinked is retried on the new file. Callers must not await while
+        holding the lock.
+        """
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        path = self._lock_path(name)
+        while True:
+            lock_file = open(path, "a")
+            if fcntl is None:
+                break
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(LOCK_RETRY_SECONDS)
+            try:
+                if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(path)):
+                    break
+            except FileNotFoundError:
+                pass
+            lock_file.close()
+        try:
+            yield
+        finally:
+            lock_file.close()
+
+    @staticmethod
+    def _apply(ranking: StoredRanking, record: Dict[str, Any]) -> None:
+        if record["op"] == "upsert":
+            ranking.insert(record["entry"])
+        elif record["op"] == "remove":
+            ranking.remove(record["id"])
+
+    def _sync(self, ranking: StoredRanking) -> Optional[int]:
+        """
+        Bring a ranking up to date with its journal.
+
+        Applies records appended since this process last read the journal,
+        or replays it from the start when it was compacted or replaced.
+        A trailing partial line (an append in progress) is left for later.
+
+        Returns:
+            Number of records applied, or None if the journal was deleted
+            after this process had read it (the ranking is then emptied)
+        """
+        name = ranking.name
+        try:
+            journal = open(self._journal_path(name), "rb")
+        except FileNotFoundError:
+            if self._positions.pop(name, None) is None:
+                return 0
+            ranking.clear()
+            return None
+
+        with journal:
+            stat = os.fstat(journal.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            generation = self._read_generation(journal)
+            known_id, known_generation, offset = self._positions.get(name, (None, None, 0))
+            if known_id != file_id or known_generation != generation or stat.st_size < offset:
+                ranking.clear()
+                offset = 0
+            journal.seek(offset)
+            data = journal.read()
+
+        complete = data[:data.rfind(b"\n") + 1]
+        record_count = 0
+        for line in complete.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["op"] != "generation":
+                record_count += 1
+                self._apply(ranking, record)
+        self._positions[name] = (file_id, generation, offset + len(complete))
+        return record_count
+
+    @staticmethod
+    def _read_generation(journal) -> Optional[str]:
+        """Generation of an open journal, from its first record (None for journals without one)."""
+        journal.seek(0)
+        first = journal.readline()
+        if not first.endswith(b"\n") or b'"generation"' not in first:
+            return None
+        return json.loads(first).get("generation")
+
+    @staticmethod
+    def _generation_record(generation: str) -> str:
+        return json.dumps({"op": "generation", "generation": generation}) + "\n"
+
+    def _append(self, name: str, records: List[Dict[str, Any]]) -> None:
+        """Append records to a journal; the caller holds the lock and has synced."""
+        _, generation, _ = self._positions.get(name, (None, None, 0))
+        with open(self._journal_path(name), "a", encoding="utf-8") as journal:
+            if journal.tell() == 0:
+                generation = uuid.uuid4().hex
+                journal.write(self._generation_record(generation))
+            for record in records:
+                journal.write(json.dumps(record, default=str) + "\n")
+            journal.flush()
+            stat = os.fstat(journal.fileno())
+        self._positions[name] = ((stat.st_dev, stat.st_ino), generation, stat.st_size)
+
+    async def _load(self, name: str) -> Optional[StoredRanking]:
+        """Replay a journal, compacting it when most records are superseded."""
+        async with self._locked(name):
+            ranking = self._rankings.get(name)
+            if ranking is not None:
+                # Loaded by another request while this one waited for the lock
+                if self._sync(ranking) is not None:
+                    return ranking
+                del self._rankings[name]
+                return None
+            ranking = StoredRanking(name)
+            record_count = self._sync(ranking)
+            if not self._journal_path(name).exists():
+                return None
+            if record_count > 2 * len(ranking) + 100:
+                self._compact(ranking)
+
+        logger.info(f"Loaded ranking '{name}' with {len(ranking)} candidates")
+        return ranking
+
+    def _compact(self, ranking: StoredRanking) -> None:
+        """Rewrite a journal with one record per current candidate; the caller holds the lock."""
+        path = self._journal_path(ranking.name)
+        temp_path = path.with_suffix(".jsonl.tmp")
+        generation = uuid.uuid4().hex
+        with open(temp_path, "w", encoding="utf-8") as journal:
+            journal.write(self._generation_record(generation))
+            for entry in ranking.entries.values():
+                journal.write(json.dumps({"op": "upsert", "entry": entry}, default=str) + "\n")
+        os.replace(temp_path, path)
+        stat = path.stat()
+        self._positions[ranking.name] = ((stat.st_dev, stat.st_ino), generation, stat.st_size)
+
+
+# Create global instance
+ranking_store = RankingStore()
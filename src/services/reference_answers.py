@@ -0,0 +1,101 @@
+"""
+Per-question reference answers with precomputed similarity indexes.
+"""
+import json
+import logging
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import settings
+from src.utils.reference_similarity import ReferenceIndex
+
+logger = logging.getLogger(__name__)
+
+# Indexes built from references sent inline with a request
+_ADHOC_CACHE_SIZE = 64
+
+
+def question_key(question: str) -> str:
+    """Normalize a question so trivial formatting differences share an index."""
+    return re.sub(r"\s+", " ", question).strip().lower()
+
+
+class ReferenceAnswerRegistry:
+    """
+    Reference answers for the question bank, indexed once per question.
+
+    Questions are loaded from REFERENCE_ANSWERS_PATH on first use: a JSON
+    object mapping question text to a list of reference answers. References
+    supplied inline with a request are indexed on demand and kept in a small
+    LRU cache so repeated requests reuse the vectors.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path if path is not None else settings.REFERENCE_ANSWERS_PATH
+        self._indexes: Dict[str, ReferenceIndex] = {}
+        self._adhoc: "OrderedDict[Tuple[str, ...], ReferenceIndex]" = OrderedDict()
+        self._loaded = False
+
+    def register(self, question: str, references: List[str]) -> ReferenceIndex:
+        """Index reference answers for a question, replacing earlier ones."""
+        index = ReferenceIndex(references)
+        self._indexes[question_key(question)] = index
+        return index
+
+    def get(self, question: str) -> Optional[ReferenceIndex]:
+        """Index for a question bank question, if it has references."""
+        self._ensure_loaded()
+        return self._indexes.get(question_key(question))
+
+    def resolve(
+        self,
+        question: Optional[str] = None,
+        references: Optional[List[str]] = None
+    ) -> Optional[ReferenceIndex]:
+        """
+        Pick the index for a request: inline references win over the bank.
+
+        Returns:
+            ReferenceIndex or None when no references apply
+        """
+        if references:
+            return self._adhoc_index(references)
+        if question:
+            return self.get(question)
+        return None
+
+    def _adhoc_index(self, references: List[str]) -> ReferenceIndex:
+        key = tuple(references)
+        index = self._adhoc.get(key)
+        if index is None:
+            index = ReferenceIndex(references)
+            self._adhoc[key] = index
+            if len(self._adhoc) > _ADHOC_CACHE_SIZE:
+                self._adhoc.popitem(last=False)
+        else:
+            self._adhoc.move_to_end(key)
+        return index
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not Path(self.path).exists():
+            return
+
+        with open(self.path, encoding="utf-8") as reference_file:
+            bank = json.load(reference_file)
+        for question, references in bank.items():
+            if references:
+                self.register(question, references)
+        logger.info(f"Loaded reference answers for {len(self._indexes)} questions")
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._indexes)
+
+
+# Create global instance
+reference_answers = ReferenceAnswerRegistry()
@@ -0,0 +1,340 @@
+"""
+Scheduler for outbound model calls.
+
+Every provider call takes a slot from a shared concurrency limit. When the
+limit is reached, callers queue by priority class (interactive ahead of
+batch ahead of background). Waiting time ages a caller towards the front,
+so lower classes are delayed but never starved.
+
+Within a class, slots are shared between clients by weighted fair queuing
+on the estimated token cost of each call, so a client submitting a large
+cohort cannot crowd out the others.
+
+The limit itself can adapt to the backend (AIMD): it grows while calls
+complete at healthy latency and is cut back on 429s, timeouts and latency
+spikes.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+
+from src.core.config import settings
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ClientShare(NamedTuple):
+    """Client that model work is accounted to, and its fair-queuing weight."""
+    id: str
+    weight: float = 1.0
+
+
+# Priority class and client of the model work done for the current request
+current_priority: ContextVar[Optional[str]] = ContextVar("model_priority", default=None)
+current_client: ContextVar[Optional[ClientShare]] = ContextVar("model_client", default=None)
+
+# Work submitted outside a request (startup jobs, scripts)
+INTERNAL_CLIENT = ClientShare("internal")
+
+# Finish tags kept for idle clients before they are pruned
+_MAX_TRACKED_CLIENTS = 1024
+
+# Weight of the newest sample in the latency baseline
+BASELINE_ALPHA = 0.05
+
+# Weight of the newest sample in the moving average of slot hold time
+HOLD_TIME_ALPHA = 0.2
+
+
+class AdaptiveLimit:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    - Slow start: until the first overload the limit grows by one per
+      successful call, roughly doubling every round trip
+    - Afterwards it grows by 1/limit per success, about one per round trip
+    - Overload (429, timeout, or latency above ADAPTIVE_LATENCY_TOLERANCE
+      times the baseline) multiplies it by ADAPTIVE_CONCURRENCY_BACKOFF, at
+      most once per baseline round trip so one burst of errors is one cut
+    - It only grows while at least half of it is in use, so an idle period
+      does not inflate it beyond what the backend has been shown to handle
+    """
+
+    def __init__(
+        self,
+        initial: int = None,
+        minimum: int = None,
+        maximum: int = None,
+        backoff: float = None,
+        tolerance: float = None
+    ):
+        self.minimum = minimum or settings.ADAPTIVE_CONCURRENCY_MIN
+        self.maximum = maximum or settings.MODEL_CONCURRENCY_LIMIT
+        self.backoff = backoff or settings.ADAPTIVE_CONCURRENCY_BACKOFF
+        self.tolerance = tolerance or settings.ADAPTIVE_LATENCY_TOLERANCE
+        initial = initial or settings.ADAPTIVE_CONCURRENCY_INITIAL
+        self.value = float(min(max(initial, self.minimum), self.maximum))
+        self.slow_start = True
+        self.baseline_ms: Optional[float] = None
+        self.decreases = 0
+        self._last_decrease_at = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self.value))
+
+    def on_success(self, latency_ms: float, in_flight: int) -> None:
+        """Record a completed call; `in_flight` includes the call itself."""
+        if self.baseline_ms is None:
+            self.baseline_ms = latency_ms
+        spike = latency_ms > self.baseline_ms * self.tolerance
+        self.baseline_ms += BASELINE_ALPHA * (latency_ms - self.baseline_ms)
+        if spike:
+            self.on_overload("latency")
+            return
+        if in_flight * 2 < self.limit:
+            return
+        increment = 1.0 if self.slow_start else 1.0 / self.value
+        self.value = min(self.maximum, self.value + increment)
+
+    def on_overload(self, reason: str) -> None:
+        """Cut the limit after a 429, timeout or latency spike."""
+        now = time.monotonic()
+        if now - self._last_decrease_at < (self.baseline_ms or 0.0) / 1000:
+            return
+        self._last_decrease_at = now
+        self.slow_start = False
+        self.value = max(float(self.minimum), self.value * self.backoff)
+        self.decreases += 1
+        metrics.increment("concurrency_limit_decreases", labels={"reason": reason})
+        logger.info(f"Model concurrency limit cut to {self.limit} ({reason})")
+
+    def snapshot(self) -> Dict:
+        return {
+            "limit": self.limit,
+            "min": self.minimum,
+            "max": self.maximum,
+            "slow_start": self.slow_start,
+            "latency_baseline_ms": round(self.baseline_ms, 2) if self.baseline_ms is not None else None,
+            "decreases": self.decreases,
+        }
+
+
+@dataclass
+class _Waiter:
+    priority: str
+    rank: int  # Position of the class, 0 = highest
+    client: str
+    start_tag: float  # Virtual time at which this call's fair share begins
+    enqueued_at: float
+    future: asyncio.Future = field(repr=False)
+
+
+class ModelCallScheduler:
+    """
+    Priority-ordered, client-fair concurrency limit for model calls in one
+    worker.
+
+    Class selection: a queued caller's effective rank is its class position
+    minus one for every PRIORITY_AGING_MS it has waited; the next free slot
+    goes to the class holding the lowest effective rank.
+
+    Client fairness (start-time fair queuing): each call is tagged on arrival
+    with start = max(virtual time, client's previous finish) and
+    finish = start + cost / weight. Within the chosen class the lowest start
+    tag is served first and virtual time advances to it, so over any busy
+    period each client receives slots in proportion to its weight, measured
+    in tokens rather than requests.
+    """
+
+    def __init__(
+        self,
+        limit: int = None,
+        classes: List[str] = None,
+        aging_ms: float = None,
+        adaptive: Optional[AdaptiveLimit] = None
+    ):
+        self.max_limit = limit or settings.MODEL_CONCURRENCY_LIMIT
+        self.adaptive = adaptive
+        self.classes = classes or settings.get_priority_classes()
+        self.aging_ms = aging_ms or settings.PRIORITY_AGING_MS
+        self.in_flight = 0
+        self.hold_time_ms: Optional[float] = None  # Moving average of slot hold time
+        self.virtual_time = 0.0
+        self._finish_tags: Dict[str, float] = {}
+        self._waiters: List[_Waiter] = []
+
+    @property
+    def limit(self) -> int:
+        """Slots currently available: the adaptive limit, or the static one."""
+        return self.adaptive.limit if self.adaptive is not None else self.max_limit
+
+    def record_latency(self, latency_ms: float) -> None:
+        """
+        Feed a successful call's latency to the adaptive limit (call before
+        leaving the slot). Slots added by a limit increase are granted to
+        queued callers straight away.
+        """
+        if self.adaptive is not None:
+            limit = self.limit
+            self.adaptive.on_success(latency_ms, self.in_flight)
+            if self.limit > limit:
+                self._dispatch()
+
+    def record_overload(self, reason: str) -> None:
+        """Report a 429 or timeout from the backend to the adaptive limit."""
+        if self.adaptive is not None:
+            self.adaptive.on_overload(reason)
+
+    def resolve_priority(self, priority: Optional[str]) -> str:
+        """Explicit class, else the current request's, else the configured default."""
+        priority = priority or current_priority.get() or settings.PRIORITY_DEFAULT_CLASS
+        if priority not in self.classes:
+            raise ValueError(
+                f"Unknown priority class '{priority}'. Available: {', '.join(self.classes)}"
+            )
+        return priority
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[str] = None,
+        client: Optional[ClientShare] = None,
+        cost: float = 1.0
+    ) -> AsyncIterator[None]:
+        """
+        Hold one model-call slot for the duration of the block.
+
+        Args:
+            priority: Priority class (default: the current request's)
+            client: Client to account the call to (default: the current request's)
+            cost: Estimated cost of the call, in tokens
+        """
+        priority = self.resolve_priority(priority)
+        client = client or current_client.get() or INTERNAL_CLIENT
+        await self._acquire(priority, client, cost)
+        acquired_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_hold_time((time.monotonic() - acquired_at) * 1000)
+            self._release()
+
+    async def _acquire(self, priority: str, client: ClientShare, cost: float) -> None:
+        start_tag = self._tag(client, cost)
+        metrics.increment("model_call_cost", cost, labels={"priority": priority})
+
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.virtual_time = max(self.virtual_time, start_tag)
+            self._record_wait(priority, 0.0)
+            return
+
+        waiter = _Waiter(
+            priority=priority,
+            rank=self.classes.index(priority),
+            client=client.id,
+            start_tag=start_tag,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future()
+        )
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before the cancellation landed: hand the slot on
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def _tag(self, client: ClientShare, cost: float) -> float:
+        """Assign the call's start tag and advance the client's finish tag."""
+        if len(self._finish_tags) > _MAX_TRACKED_CLIENTS:
+            # Clients at or behind virtual time carry no credit or debt
+            self._finish_tags = {
+                key: finish for key, finish in self._finish_tags.items() if finish > self.virtual_time
+            }
+        start_tag = max(self.virtual_time, self._finish_tags.get(client.id, 0.0))
+        self._finish_tags[client.id] = start_tag + cost / max(client.weight, 1e-6)
+        return start_tag
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots: best class by aged rank, then lowest start tag."""
+        now = time.monotonic()
+        while self._waiters and self.in_flight < self.limit:
+            best_class = min(
+                self._waiters,
+                key=lambda w: (w.rank - (now - w.enqueued_at) * 1000 / self.aging_ms, w.enqueued_at)
+            ).priority
+            waiter = min(
+                (w for w in self._waiters if w.priority == best_class),
+                key=lambda w: (w.start_tag, w.enqueued_at)
+            )
+            self._waiters.remove(waiter)
+            if waiter.future.done():  # Cancelled, not yet unwound
+                continue
+            self.in_flight += 1
+            self.virtual_time = max(self.virtual_time, waiter.start_tag)
+            waiter.future.set_result(None)
+            self._record_wait(waiter.priority, (now - waiter.enqueued_at) * 1000)
+
+    def _record_hold_time(self, hold_ms: float) -> None:
+        if self.hold_time_ms is None:
+            self.hold_time_ms = hold_ms
+        else:
+            self.hold_time_ms += HOLD_TIME_ALPHA * (hold_ms - self.hold_time_ms)
+
+    def estimated_wait_ms(self, priority: str) -> float:
+        """
+        Expected queueing delay for a new call in `priority`'s class.
+
+        Calls already queued in the same or a higher class go first; with
+        every slot busy, one slot frees up every hold_time / limit on average.
+        Returns 0 until a call has completed.
+        """
+        if self.hold_time_ms is None:
+            return 0.0
+        rank = self.classes.index(priority)
+        ahead = sum(1 for waiter in self._waiters if waiter.rank <= rank)
+        if self.in_flight >= self.limit:
+            ahead += 1
+        return ahead * self.hold_time_ms / self.limit
+
+    @staticmethod
+    def _record_wait(priority: str, wait_ms: float) -> None:
+        metrics.observe("model_queue_wait_ms", wait_ms, labels={"priority": priority})
+
+    def snapshot(self) -> Dict:
+        """Current limit, slots in use and queue depth per class and per client."""
+        queued = {name: 0 for name in self.classes}
+        queued_by_client: Dict[str, int] = {}
+        for waiter in self._waiters:
+            queued[waiter.priority] += 1
+            queued_by_client[waiter.client] = queued_by_client.get(waiter.client, 0) + 1
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": queued,
+            "queued_by_client": queued_by_client,
+            "hold_time_ms": round(self.hold_time_ms, 2) if self.hold_time_ms is not None else None,
+            "estimated_wait_ms": {name: round(self.estimated_wait_ms(name), 2) for name in self.classes},
+            "adaptive": self.adaptive.snapshot() if self.adaptive is not None else None,
+        }
+
+
+# Create global scheduler
+model_scheduler = ModelCallScheduler(
+    adaptive=AdaptiveLimit() if settings.ADAPTIVE_CONCURRENCY_ENABLED else None
+)
+metrics.register_collector("model_scheduler", model_scheduler.snapshot)
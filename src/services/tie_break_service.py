@@ -0,0 +1,333 @@
+"""
+Business logic for refining tied ranking positions.
+Orders candidates with equal scores using batched pairwise model comparisons.
+"""
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.gemini_service import gemini_service
+from src.core.config import settings
+from src.core.lifecycle import lifecycle
+
+logger = logging.getLogger(__name__)
+
+
+class _TruncatedMerge:
+    """
+    Merge of two already ordered runs, stopping after `limit` outputs.
+
+    The best `limit` elements of the union are always among the best `limit`
+    of each run, so truncating every merge keeps top-K selection exact while
+    skipping comparisons for positions nobody will look at.
+    """
+
+    def __init__(self, left: List[Dict], right: List[Dict], limit: int):
+        self.left = left
+        self.right = right
+        self.limit = limit
+        self.output: List[Dict] = []
+        self._i = 0
+        self._j = 0
+        self._drain()
+
+    @property
+    def done(self) -> bool:
+        return (
+            len(self.output) >= self.limit
+            or self._i >= len(self.left)
+            or self._j >= len(self.right)
+        )
+
+    def head_pair(self) -> Tuple[Dict, Dict]:
+        """Return the two run heads that must be compared next."""
+        return self.left[self._i], self.right[self._j]
+
+    def advance(self, left_wins: bool) -> None:
+        """Emit the winner of the head comparison."""
+        if left_wins:
+            self.output.append(self.left[self._i])
+            self._i += 1
+        else:
+            self.output.append(self.right[self._j])
+            self._j += 1
+        self._drain()
+
+    def _drain(self) -> None:
+        """Copy the remainder once one run is exhausted."""
+        if len(self.output) >= self.limit:
+            return
+        if self._i >= len(self.left) or self._j >= len(self.right):
+            remainder = self.left[self._i:] + self.right[self._j:]
+            self.output.extend(remainder[:self.limit - len(self.output)])
+
+
+class _PairwiseComparator:
+    """
+    Per-ranking comparison budget in front of the shared judgement cache.
+
+    Comparisons are requested in rounds; each round is sent as few batched
+    model calls as the batch size allows. Once the budget is spent, or a
+    call fails, pairs fall back to the deterministic id order.
+    """
+
+    def __init__(
+        self,
+        service: "TieBreakService",
+        answers: Dict[str, str],
+        max_comparisons: int
+    ):
+        self.service = service
+        self.answers = answers
+        self.remaining = max_comparisons
+        self.stats = {
+            "comparisons": 0,
+            "model_calls": 0,
+            "cache_hits": 0,
+            "fallbacks": 0
+        }
+
+    async def compare_round(self, pairs: List[Tuple[Dict, Dict]]) -> List[bool]:
+        """
+        Decide a round of comparisons.
+
+        Args:
+            pairs: List of (left, right) candidate dicts
+
+        Returns:
+            List of booleans, True where the left candidate is stronger
+        """
+        results: List[Optional[bool]] = [None] * len(pairs)
+        to_ask: Dict[str, List[int]] = {}
+
+        for index, (left, right) in enumerate(pairs):
+            answer_a, answer_b = self.answers[left["id"]], self.answers[right["id"]]
+            if answer_a == answer_b:
+                results[index] = left["id"] < right["id"]
+                continue
+
+            cached = self.service._cache_lookup(answer_a, answer_b)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                results[index] = cached
+                continue
+
+            key = self.service._cache_key(answer_a, answer_b)
+            if key not in to_ask and self.remaining <= 0:
+                self.stats["fallbacks"] += 1
+                results[index] = left["id"] < right["id"]
+                continue
+            if key not in to_ask:
+                self.remaining -= 1
+            to_ask.setdefault(key, []).append(index)
+
+        if to_ask:
+            await self._ask(pairs, to_ask, results)
+
+        return results
+
+    async def _ask(
+        self,
+        pairs: List[Tuple[Dict, Dict]],
+        to_ask: Dict[str, List[int]],
+        results: List[Optional[bool]]
+    ) -> None:
+        """Send unique uncached pairs to the model in concurrent batches."""
+        first_indices = [indices[0] for indices in to_ask.values()]
+        batch_size = max(1, settings.TIE_BREAK_BATCH_SIZE)
+        batches = [
+            first_indices[start:start + batch_size]
+            for start in range(0, len(first_indices), batch_size)
+        ]
+
+        outcomes = await asyncio.gather(
+            *[
+                self.service.gemini.compare_answers(
+                    [
+                        (self.answers[pairs[i][0]["id"]], self.answers[pairs[i][1]["id"]])
+                        for i in batch
+                    ],
+                    provider=settings.get_ranking_provider()
+                )
+                for batch in batches
+            ],
+            return_exceptions=True
+        )
+        self.stats["model_calls"] += len(batches)
+
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Pairwise comparison batch failed, using id order: {outcome}")
+            for position, index in enumerate(batch):
+                left, right = pairs[index]
+                answer_a, answer_b = self.answers[left["id"]], self.answers[right["id"]]
+                if isinstance(outcome, Exception):
+                    self.stats["fallbacks"] += 1
+                    left_wins = left["id"] < right["id"]
+                else:
+                    self.stats["comparisons"] += 1
+                    left_wins = outcome[position] == "A"
+                    self.service._cache_store(answer_a, answer_b, left_wins)
+
+                for same_pair_index in to_ask[self.service._cache_key(answer_a, answer_b)]:
+                    same_left = pairs[same_pair_index][0]
+                    same_left_answer = self.answers[same_left["id"]]
+                    results[same_pair_index] = left_wins if same_left_answer == answer_a else not left_wins
+
+
+class TieBreakService:
+    """Service for ordering equally scored candidates by pairwise comparison."""
+
+    def __init__(self):
+        """Initialize tie-break service."""
+        self.gemini = gemini_service
+        # Pair key -> whether the lexicographically first answer won
+        self._cache: "OrderedDict[str, bool]" = OrderedDict()
+
+    async def refine(
+        self,
+        ranked_candidates: List[Dict],
+        answers: Dict[str, str],
+        top_k: Optional[int] = None
+    ) -> Tuple[List[Dict], Dict[str, Any]]:
+        """
+        Reorder tied candidates within the top-K positions.
+
+        Candidates must already be sorted by score. Only tie groups that
+        reach into the first `top_k` positions are refined, and only as far
+        as needed to order those positions.
+
+        Args:
+            ranked_candidates: Candidates sorted by score (highest first)
+            answers: Candidate id to answer text
+            top_k: Number of leading positions to refine
+
+        Returns:
+            Tuple of (reordered candidates with ranks reassigned, stats dict)
+        """
+        top_k = top_k or settings.TIE_BREAK_TOP_K
+        comparator = _PairwiseComparator(self, answers, settings.TIE_BREAK_MAX_COMPARISONS)
+
+        refined: List[Dict] = []
+        groups_refined = 0
+        position = 0
+        while position < len(ranked_candidates):
+            end = position
+            while (
+                end < len(ranked_candidates)
+                and ranked_candidates[end]["score"] == ranked_candidates[position]["score"]
+            ):
+                end += 1
+
+            group = ranked_candidates[position:end]
+            if len(group) > 1 and position < top_k:
+                group = await self._sort_group(group, top_k - position, comparator)
+                groups_refined += 1
+
+            refined.extend(group)
+            position = end
+
+        for rank, candidate in enumerate(refined, start=1):
+            candidate["rank"] = rank
+
+        stats = {
+            "top_k": top_k,
+            "groups_refined": groups_refined,
+            "max_comparisons": settings.TIE_BREAK_MAX_COMPARISONS,
+            **comparator.stats
+        }
+
+        logger.info(
+            f"Tie-break refined {groups_refined} groups with {comparator.stats['model_calls']} model calls",
+            extra=stats
+        )
+
+        return refined, stats
+
+    async def _sort_group(
+        self,
+        group: List[Dict],
+        limit: int,
+        comparator: _PairwiseComparator
+    ) -> List[Dict]:
+        """
+        Order the best `limit` members of a tie group.
+
+        Bottom-up merge sort whose merges at each level advance in lockstep,
+        so every round of comparisons becomes one batched request.
+
+        Args:
+            group: Candidates sharing one score, in id order
+            limit: Number of leading members that need an exact order
+            comparator: Comparator holding the ranking's budget
+
+        Returns:
+            The group with its best `limit` members first, the rest in id order
+        """
+        limit = min(limit, len(group))
+        runs = [[candidate] for candidate in group]
+
+        while len(runs) > 1:
+            merges = [
+                _TruncatedMerge(runs[i], runs[i + 1], limit)
+                for i in range(0, len(runs) - 1, 2)
+            ]
+            carry = [runs[-1][:limit]] if len(runs) % 2 else []
+
+            active = [merge for merge in merges if not merge.done]
+            while active:
+                decisions = await comparator.compare_round([merge.head_pair() for merge in active])
+                for merge, left_wins in zip(active, decisions):
+                    merge.advance(left_wins)
+                active = [merge for merge in active if not merge.done]
+
+            runs = [merge.output for merge in merges] + carry
+
+        leaders = runs[0][:limit]
+        leader_ids = {candidate["id"] for candidate in leaders}
+        return leaders + [candidate for candidate in group if candidate["id"] not in leader_ids]
+
+    def _cache_key(self, answer_a: str, answer_b: str) -> str:
+        """Order-independent cache key for a pair of answers."""
+        first, second = sorted((answer_a, answer_b))
+        digest = hashlib.sha256()
+        digest.update(first.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(second.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _cache_lookup(self, answer_a: str, answer_b: str) -> Optional[bool]:
+        """Return whether answer_a beat answer_b, or None if not cached."""
+        key = self._cache_key(answer_a, answer_b)
+        first_wins = self._cache.get(key)
+        if first_wins is None:
+            return None
+        self._cache.move_to_end(key)
+        return first_wins == (answer_a <= answer_b)
+
+    def _cache_store(self, answer_a: str, answer_b: str, a_wins: bool) -> None:
+        """Remember a judgement, evicting the least recently used entry when full."""
+        key = self._cache_key(answer_a, answer_b)
+        self._cache[key] = a_wins == (answer_a <= answer_b)
+        self._cache.move_to_end(key)
+        while len(self._cache) > settings.TIE_BREAK_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def export_cache(self) -> List[Tuple[str, bool]]:
+        """Cached judgements, least recently used first, for saving at shutdown."""
+        return list(self._cache.items())
+
+    def import_cache(self, saved: List[Tuple[str, bool]]) -> None:
+        """Restore judgements saved by export_cache()."""
+        for key, first_wins in saved:
+            self._cache[key] = first_wins
+            self._cache.move_to_end(key)
+        while len(self._cache) > settings.TIE_BREAK_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+
+# Create global instance
+tie_break_service = TieBreakService()
+lifecycle.register_state("tie_break_cache", tie_break_service.export_cache, tie_break_service.import_cache)
@@ -0,0 +1,105 @@
+"""
+Token and cost accounting for model calls.
+
+Each HTTP request gets a RequestUsage tracker (see UsageAccountingMiddleware)
+that every provider call made on its behalf adds to, including calls in
+tasks spawned by the request. Totals are returned to the client and
+aggregated per provider, route and client in metrics. Only the clients
+named in USAGE_CLIENT_LABELS get their own client label, so the number of
+metric series stays bounded however many API keys and IPs call the service.
+"""
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.core.config import settings
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KINDS = ("prompt_tokens", "output_tokens", "total_tokens")
+
+
+def usage_cost_usd(prompt_tokens: int, output_tokens: int) -> float:
+    """Spend for a token count at the configured per-million-token prices."""
+    return (
+        prompt_tokens * settings.TOKEN_PRICE_PROMPT_PER_MILLION
+        + output_tokens * settings.TOKEN_PRICE_OUTPUT_PER_MILLION
+    ) / 1_000_000
+
+
+@dataclass
+class RequestUsage:
+    """Model usage accumulated while serving one request."""
+
+    client: Optional[str] = None
+    calls: int = 0
+    estimated_calls: int = 0  # Calls whose usage was estimated locally
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    @property
+    def cost_usd(self) -> float:
+        return usage_cost_usd(self.prompt_tokens, self.output_tokens)
+
+    def add(self, usage: Dict[str, int], estimated: bool) -> None:
+        self.calls += 1
+        self.estimated_calls += int(estimated)
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+
+    def headers(self) -> Dict[str, str]:
+        """Response headers reporting the totals."""
+        headers = {
+            "X-Model-Calls": str(self.calls),
+            "X-Prompt-Tokens": str(self.prompt_tokens),
+            "X-Output-Tokens": str(self.output_tokens),
+            "X-Total-Tokens": str(self.total_tokens),
+        }
+        if self.estimated_calls:
+            headers["X-Tokens-Estimated"] = str(self.estimated_calls)
+        if self.cost_usd:
+            headers["X-Model-Cost-USD"] = f"{self.cost_usd:.6f}"
+        return headers
+
+
+# Usage tracker of the request being served, if any
+current_usage: ContextVar[Optional[RequestUsage]] = ContextVar("request_usage", default=None)
+
+
+def record_call_usage(provider: str, model: str, usage: Dict[str, int], estimated: bool) -> None:
+    """Add one provider call's usage to the current request and provider metrics."""
+    labels = {"provider": provider, "model": model}
+    for kind in TOKEN_KINDS:
+        metrics.increment(f"provider_{kind}", usage.get(kind, 0), labels=labels)
+    if estimated:
+        metrics.increment("provider_estimated_usage_calls", labels=labels)
+
+    tracker = current_usage.get()
+    if tracker is not None:
+        tracker.add(usage, estimated)
+
+
+def client_label(client: Optional[str]) -> str:
+    """Metric label for a client: its id if listed in USAGE_CLIENT_LABELS, else "other"."""
+    if client is None:
+        return "unknown"
+    return client if client in settings.get_usage_client_labels() else "other"
+
+
+def record_request_usage(route: str, tracker: RequestUsage) -> None:
+    """Aggregate a finished request's usage per route and per client."""
+    client = client_label(tracker.client)
+    for kind in TOKEN_KINDS:
+        value = getattr(tracker, kind)
+        metrics.increment(f"route_{kind}", value, labels={"route": route})
+        metrics.increment(f"client_{kind}", value, labels={"client": client})
+    metrics.observe("request_total_tokens", tracker.total_tokens, labels={"route": route})
+    if tracker.cost_usd:
+        metrics.increment("route_cost_usd", tracker.cost_usd, labels={"route": route})
+        metrics.increment("client_cost_usd", tracker.cost_usd, labels={"client": client})
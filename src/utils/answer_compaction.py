@@ -0,0 +1,165 @@
+"""
+Answer compaction ahead of prompt building.
+
+Pasted answers often carry noise that costs prompt tokens (and latency)
+without changing the score: whitespace runs, repeated lines and log dumps.
+Compaction removes it in three steps:
+
+1. Whitespace: trailing spaces are dropped, runs of spaces/tabs inside a
+   line become one space (indentation is kept, since answers may contain
+   code) and more than one blank line becomes one
+2. Repeats: a run of identical lines keeps one copy, and a run of lines that
+   differ only in their digits (log lines, stack frames) keeps the first and
+   last line; a bracketed note records what was removed
+3. Token budget: an answer still over the budget keeps its start and end
+   (HEAD_SHARE of the budget for the start) around an omission note
+"""
+import re
+from dataclasses import dataclass
+from typing import List
+
+from src.utils.tokens import estimate_tokens, token_spans
+
+# Share of the token budget kept from the start of an over-long answer
+HEAD_SHARE = 0.6
+
+_INDENT = re.compile(r"^[ \t]*")
+_SPACE_RUN = re.compile(r"[^\S\n]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_DIGITS = re.compile(r"\d+")
+
+
+@dataclass
+class CompactedAnswer:
+    """A compacted answer and how much it shrank."""
+
+    text: str
+    original_chars: int
+    original_tokens: int
+    tokens: int
+    lines_collapsed: int = 0
+    truncated: bool = False
+
+    @property
+    def chars(self) -> int:
+        return len(self.text)
+
+    def report(self) -> dict:
+        return {
+            "original_chars": self.original_chars,
+            "chars": self.chars,
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "lines_collapsed": self.lines_collapsed,
+            "truncated": self.truncated,
+        }
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse whitespace runs while keeping line and paragraph breaks."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = []
+    for line in text.split("\n"):
+        indent = _INDENT.match(line).group().replace("\t", "    ")
+        content = _SPACE_RUN.sub(" ", line).strip()
+        lines.append(indent + content if content else "")
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip("\n").rstrip()
+
+
+def collapse_repeats(text: str) -> tuple:
+    """
+    Collapse runs of repeated or near-identical lines.
+
+    Returns:
+        Tuple of (text, number of lines removed)
+    """
+    lines = text.split("\n")
+    output: List[str] = []
+    removed = 0
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        end = index + 1
+        if line:
+            signature = _DIGITS.sub("0", line)
+            while end < len(lines) and lines[end] and _DIGITS.sub("0", lines[end]) == signature:
+                end += 1
+        run = lines[index:end]
+
+        if len(run) > 1 and all(candidate == line for candidate in run):
+            output.extend([line, f"[line repeated {len(run) - 1} more times]"])
+            removed += len(run) - 1
+        elif len(run) > 2:
+            output.extend([line, f"[{len(run) - 2} similar lines omitted]", run[-1]])
+            removed += len(run) - 2
+        else:
+            output.extend(run)
+        index = end
+    return "\n".join(output), removed
+
+
+def truncate_middle(text: str, max_tokens: int) -> tuple:
+    """
+    Keep the start and end of a text within an estimated token budget.
+
+    Cuts fall on word boundaries; the omitted middle is replaced by a note
+    with its estimated size, which counts against the budget.
+
+    Returns:
+        Tuple of (text, whether it was truncated)
+    """
+    spans = list(token_spans(text))
+    total = sum(tokens for _, _, tokens in spans)
+    if total <= max_tokens:
+        return text, False
+
+    available = max(0, max_tokens - estimate_tokens(_omission_note(total)))
+    head_budget = int(available * HEAD_SHARE)
+    tail_budget = available - head_budget
+
+    head_end, used = 0, 0
+    for start, end, tokens in spans:
+        if used + tokens > head_budget:
+            break
+        used += tokens
+        head_end = end
+
+    tail_start, tail_used = len(text), 0
+    for start, end, tokens in reversed(spans):
+        if tail_used + tokens > tail_budget or start < head_end:
+            break
+        tail_used += tokens
+        tail_start = start
+
+    note = _omission_note(total - used - tail_used)
+    return f"{text[:head_end].rstrip()}\n{note}\n{text[tail_start:].lstrip()}", True
+
+
+def _omission_note(tokens: int) -> str:
+    return f"[... {tokens} tokens omitted ...]"
+
+
+def compact_answer(answer: str, max_tokens: int = 0) -> CompactedAnswer:
+    """
+    Compact an answer for the evaluation prompt.
+
+    Args:
+        answer: Candidate's answer as submitted
+        max_tokens: Estimated token budget for the answer (0 = unlimited)
+
+    Returns:
+        CompactedAnswer with the text to send and size statistics
+    """
+    original_tokens = estimate_tokens(answer)
+    text, lines_collapsed = collapse_repeats(normalize_whitespace(answer))
+    truncated = False
+    if max_tokens:
+        text, truncated = truncate_middle(text, max_tokens)
+    return CompactedAnswer(
+        text=text,
+        original_chars=len(answer),
+        original_tokens=original_tokens,
+        tokens=estimate_tokens(text),
+        lines_collapsed=lines_collapsed,
+        truncated=truncated,
+    )
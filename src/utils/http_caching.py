@@ -0,0 +1,54 @@
+"""
+ETag-based conditional responses for result fetches.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag.
+
+    Weak comparison is what RFC 9110 prescribes for If-None-Match, and it
+    lets compressed (weak) validators match their identity form.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_json_response(request: Request, content: Any) -> Response:
+    """
+    Render JSON with an ETag, or 304 Not Modified if the client's copy is current.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        content: Pydantic model or JSON-compatible data
+
+    Returns:
+        JSONResponse with ETag and Cache-Control: no-cache, or an empty 304
+    """
+    response = JSONResponse(jsonable_encoder(content))
+    etag = make_etag(response.body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,173 @@
+"""
+Near-duplicate text detection using 64-bit SimHash fingerprints.
+Used to cluster near-identical candidate answers before evaluation.
+"""
+import hashlib
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, ignoring punctuation and whitespace differences."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature (unlike hash(), not salted per process)."""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute the SimHash fingerprint of a text.
+
+    Features are word shingles, so answers that share most of their wording
+    get fingerprints that differ in only a few bits.
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        64-bit integer fingerprint
+    """
+    tokens = _tokenize(text)
+    if len(tokens) >= SHINGLE_SIZE:
+        features = Counter(
+            " ".join(tokens[i:i + SHINGLE_SIZE])
+            for i in range(len(tokens) - SHINGLE_SIZE + 1)
+        )
+    else:
+        features = Counter([" ".join(tokens)])
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature, count in features.items():
+        feature_hash = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            if feature_hash & (1 << bit):
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def similarity(fingerprint_a: int, fingerprint_b: int) -> float:
+    """Similarity in [0, 1] between two fingerprints (1 - normalized Hamming distance)."""
+    distance = bin(fingerprint_a ^ fingerprint_b).count("1")
+    return 1.0 - distance / FINGERPRINT_BITS
+
+
+class NearDuplicateIndex:
+    """
+    Incremental index of representative fingerprints.
+
+    Fingerprints are split into bands so that, by the pigeonhole principle,
+    any two fingerprints within the allowed Hamming distance share at least
+    one identical band. Lookups only compare against fingerprints in matching
+    band buckets instead of every stored representative.
+    """
+
+    def __init__(self, threshold: float):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("Similarity threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.max_distance = int((1.0 - threshold) * FINGERPRINT_BITS)
+
+        # max_distance + 1 bands covering all bits
+        band_count = min(self.max_distance + 1, FINGERPRINT_BITS)
+        bounds = [round(i * FINGERPRINT_BITS / band_count) for i in range(band_count + 1)]
+        self._bands = [
+            (start, (1 << (end - start)) - 1)
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        self._buckets: List[Dict[int, List[Hashable]]] = [
+            defaultdict(list) for _ in self._bands
+        ]
+        self._fingerprints: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _band_values(self, fingerprint: int):
+        for index, (shift, mask) in enumerate(self._bands):
+            yield index, (fingerprint >> shift) & mask
+
+    def find(self, fingerprint: int) -> Optional[Tuple[Hashable, float]]:
+        """
+        Find the most similar stored representative within the threshold.
+
+        Returns:
+            Tuple of (key, similarity), or None if nothing is close enough
+        """
+        best: Optional[Tuple[Hashable, float]] = None
+        seen = set()
+        for index, value in self._band_values(fingerprint):
+            for key in self._buckets[index].get(value, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(fingerprint, self._fingerprints[key])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+        return best
+
+    def add(self, key: Hashable, fingerprint: int) -> None:
+        """Store a fingerprint as a representative."""
+        self._fingerprints[key] = fingerprint
+        for index, value in self._band_values(fingerprint):
+            self._buckets[index][value].append(key)
+
+    def find_or_add(self, key: Hashable, text: str) -> Tuple[Hashable, float]:
+        """
+        Return the representative for a text, registering it as a new one if needed.
+
+        Returns:
+            Tuple of (representative key, similarity to it); a new
+            representative maps to itself with similarity 1.0
+        """
+        fingerprint = simhash(text)
+        match = self.find(fingerprint)
+        if match is not None:
+            return match
+        self.add(key, fingerprint)
+        return key, 1.0
+
+
+def cluster_near_duplicates(
+    items: List[Tuple[Hashable, str]],
+    threshold: float
+) -> Dict[Hashable, List[Tuple[Hashable, float]]]:
+    """
+    Group texts into tight near-duplicate clusters.
+
+    Every member is within the threshold of its cluster's representative
+    (the first such text in input order), so clusters never chain together
+    loosely related answers.
+
+    Args:
+        items: List of (key, text) pairs
+        threshold: Minimum similarity in (0, 1] to join a cluster
+
+    Returns:
+        Dict mapping each representative key to its members as
+        (key, similarity) pairs, the representative itself first
+    """
+    index = NearDuplicateIndex(threshold)
+    clusters: Dict[Hashable, List[Tuple[Hashable, float]]] = {}
+
+    for key, text in items:
+        representative, score = index.find_or_add(key, text)
+        clusters.setdefault(representative, []).append((key, score))
+
+    return clusters
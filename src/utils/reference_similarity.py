@@ -0,0 +1,135 @@
+"""
+Vectorized similarity of candidate answers to reference answers.
+Texts become hashed word n-gram vectors; a whole batch of answers is scored
+against a question's precomputed reference matrix in one NumPy pass.
+"""
+import re
+import zlib
+from itertools import chain
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_HASH_BITS = 16  # 64k buckets keeps the reference matrix cache-resident
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Frequent function words carry no signal about answer content
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with which can also".split()
+)
+
+
+# Token -> CRC32 hash (-1 for stopwords); bounded so the cache cannot grow forever
+_TOKEN_HASHES: Dict[str, int] = {}
+_TOKEN_CACHE_LIMIT = 500_000
+
+# Bigram hashes combine the two token hashes arithmetically
+_BIGRAM_MULTIPLIER = 1_000_003
+
+
+def _token_hash(token: str) -> int:
+    token_hash = _TOKEN_HASHES.get(token)
+    if token_hash is None:
+        token_hash = -1 if token in _STOPWORDS else zlib.crc32(token.encode("utf-8"))
+        if len(_TOKEN_HASHES) >= _TOKEN_CACHE_LIMIT:
+            _TOKEN_HASHES.clear()
+        _TOKEN_HASHES[token] = token_hash
+    return token_hash
+
+
+def vectorize(texts: Sequence[str], hash_bits: int = DEFAULT_HASH_BITS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hash texts into sparse, L2-normalized vectors of word unigrams and bigrams.
+
+    Only tokenization runs per text in Python; bigram hashing, counting and
+    normalization are vectorized across the whole batch. Term frequencies are
+    sublinear (1 + log tf) so repeated words do not dominate. Hashing uses
+    CRC32, which is stable across processes.
+
+    Args:
+        texts: Texts to vectorize
+        hash_bits: Vector dimension is 2 ** hash_bits
+
+    Returns:
+        (rows, columns, values) of the non-zero entries, sorted by row
+    """
+    mask = (1 << hash_bits) - 1
+    token_lists = [
+        [_token_hash(token) for token in _TOKEN_PATTERN.findall(text.lower())]
+        for text in texts
+    ]
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(texts))
+    hashes = np.fromiter(chain.from_iterable(token_lists), dtype=np.int64, count=int(lengths.sum()))
+    token_rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    keep = hashes >= 0
+    hashes, token_rows = hashes[keep], token_rows[keep]
+    if not len(hashes):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    # Adjacent non-stopword tokens of the same text form bigrams
+    same_text = token_rows[1:] == token_rows[:-1]
+    bigrams = (hashes[:-1][same_text] * _BIGRAM_MULTIPLIER) ^ hashes[1:][same_text]
+    rows = np.concatenate([token_rows, token_rows[1:][same_text]])
+    columns = np.concatenate([hashes, bigrams]) & mask
+
+    # Merge repeated (row, bucket) pairs into counts
+    unique_keys, counts = np.unique(rows << hash_bits | columns, return_counts=True)
+    unique_rows = unique_keys >> hash_bits
+    unique_columns = unique_keys & mask
+
+    values = (1.0 + np.log(counts)).astype(np.float32)
+    norms = np.sqrt(np.bincount(unique_rows, weights=values * values, minlength=len(texts)))
+    values /= norms[unique_rows].astype(np.float32)
+    return unique_rows, unique_columns, values
+
+
+class ReferenceIndex:
+    """
+    Precomputed reference vectors for one question.
+
+    References are stored as a dense (dimension x references) matrix so a
+    candidate's similarity to every reference is a gather of the rows for its
+    non-zero buckets followed by a per-candidate sum.
+    """
+
+    def __init__(self, references: Sequence[str], hash_bits: int = DEFAULT_HASH_BITS):
+        if not references:
+            raise ValueError("At least one reference answer is required")
+        self.references = list(references)
+        self.hash_bits = hash_bits
+
+        rows, columns, values = vectorize(self.references, hash_bits)
+        self._matrix = np.zeros((1 << hash_bits, len(self.references)), dtype=np.float32)
+        self._matrix[columns, rows] = values
+
+    def __len__(self) -> int:
+        return len(self.references)
+
+    def score(self, answers: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarity of each answer to its closest reference.
+
+        Args:
+            answers: Candidate answers
+
+        Returns:
+            float32 array with one similarity in [0, 1] per answer
+        """
+        if not answers:
+            return np.empty(0, dtype=np.float32)
+
+        rows, columns, values = vectorize(answers, self.hash_bits)
+        best = np.zeros(len(answers), dtype=np.float32)
+        if not len(rows):
+            return best
+
+        # Rows are sorted, so each answer's entries form one contiguous segment
+        segment_starts = np.concatenate([[0], np.flatnonzero(np.diff(rows)) + 1])
+        contributions = self._matrix[columns] * values[:, None]
+        similarities = np.add.reduceat(contributions, segment_starts, axis=0)
+        best[rows[segment_starts]] = similarities.max(axis=1)
+        return np.clip(best, 0.0, 1.0)
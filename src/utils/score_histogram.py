@@ -0,0 +1,96 @@
+"""
+Exact, constant-size score distribution for cohort statistics.
+
+Scores are integers from MIN_SCORE to MAX_SCORE, so a histogram with one
+bin per score is an exact quantile sketch: adding, removing and every
+query (mean, percentiles, a score's rank) take time proportional to the
+five bins, not to the number of scores recorded.
+"""
+import math
+from typing import Dict, List, Optional
+
+MIN_SCORE = 1
+MAX_SCORE = 5
+
+# Percentiles reported for every cohort
+REPORTED_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class ScoreHistogram:
+    """Counts of each score; supports removal for maintained rankings."""
+
+    def __init__(self, counts: Optional[List[int]] = None):
+        self.counts = list(counts) if counts is not None else [0] * (MAX_SCORE - MIN_SCORE + 1)
+        self.count = sum(self.counts)
+
+    def _bin(self, score: int) -> int:
+        score = int(score)
+        if not MIN_SCORE <= score <= MAX_SCORE:
+            raise ValueError(f"Score must be between {MIN_SCORE} and {MAX_SCORE}, got {score}")
+        return score - MIN_SCORE
+
+    def add(self, score: int) -> None:
+        self.counts[self._bin(score)] += 1
+        self.count += 1
+
+    def remove(self, score: int) -> None:
+        index = self._bin(score)
+        if self.counts[index] > 0:
+            self.counts[index] -= 1
+            self.count -= 1
+
+    def mean(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return sum(score * n for score, n in self._items()) / self.count
+
+    def stddev(self) -> Optional[float]:
+        mean = self.mean()
+        if mean is None:
+            return None
+        return math.sqrt(sum(n * (score - mean) ** 2 for score, n in self._items()) / self.count)
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """Nearest-rank percentile: the lowest score with at least `percent`% of scores at or below it."""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for score, n in self._items():
+            seen += n
+            if seen >= target:
+                return score
+        return MAX_SCORE
+
+    def position(self, score: int) -> Dict:
+        """
+        Where a score falls in the cohort.
+
+        Returns:
+            Dict with the best and worst rank a candidate with this score
+            shares (1 = best; ties share a range) and its percentile rank
+            (percent of the cohort scoring lower, counting ties as half)
+        """
+        index = self._bin(score)
+        above = sum(self.counts[index + 1:])
+        equal = self.counts[index]
+        below = self.count - above - equal
+        return {
+            "score": int(score),
+            "rank_best": above + 1,
+            "rank_worst": above + max(equal, 1),
+            "percentile_rank": round(100 * (below + equal / 2) / self.count, 2) if self.count else None,
+        }
+
+    def to_dict(self) -> Dict:
+        mean, stddev = self.mean(), self.stddev()
+        return {
+            "count": self.count,
+            "mean": round(mean, 4) if mean is not None else None,
+            "stddev": round(stddev, 4) if stddev is not None else None,
+            "histogram": {str(score): n for score, n in self._items()},
+            "percentiles": {f"p{percent}": self.percentile(percent) for percent in REPORTED_PERCENTILES},
+        }
+
+    def _items(self):
+        return zip(range(MIN_SCORE, MAX_SCORE + 1), self.counts)
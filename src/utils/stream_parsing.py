@@ -0,0 +1,185 @@
+"""
+Incremental parsing of uploaded CSV and JSONL candidate files.
+Records are produced as bytes arrive, so memory stays bounded by the
+longest record rather than the file size.
+"""
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+# (line number, parsed record or None, error message or None)
+ParsedRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+_CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+    "application/x-jsonlines": "jsonl",
+}
+
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Resolve the upload format from an explicit request or the Content-Type.
+
+    Raises:
+        ValueError: If the format is missing or unsupported
+    """
+    if requested:
+        fmt = requested.lower()
+    else:
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        fmt = _CONTENT_TYPE_FORMATS.get(media_type)
+
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(
+            "Unsupported upload format. Use Content-Type text/csv or application/x-ndjson, "
+            "or the format query parameter (csv, jsonl)."
+        )
+    return fmt
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """
+    Split a byte stream into decoded lines.
+
+    Args:
+        chunks: Async iterator of raw body chunks
+        max_line_bytes: Lines longer than this are skipped
+
+    Yields:
+        (line number, line text) with None in place of the text for an
+        over-long line, whose content is discarded as it streams past
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        while True:
+            newline = buffer.find("\n")
+            if newline < 0:
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            line_number += 1
+            yield line_number, None if oversized else line.rstrip("\r")
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            buffer = ""
+            oversized = True
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer or oversized:
+        line_number += 1
+        yield line_number, None if oversized else buffer.rstrip("\r")
+
+
+async def iter_jsonl_records(
+    lines: AsyncIterator[Tuple[int, Optional[str]]]
+) -> AsyncIterator[ParsedRecord]:
+    """Parse one JSON object per non-blank line."""
+    async for line_number, line in lines:
+        if line is None:
+            yield line_number, None, "Line exceeds maximum length"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, record, None
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[Tuple[int, Optional[str]]],
+    max_record_bytes: int
+) -> AsyncIterator[ParsedRecord]:
+    """
+    Parse CSV rows using the first row as header.
+
+    Quoted fields may span lines; physical lines are joined until quotes
+    balance. Columns other than `id` and `answer` become candidate metadata.
+    """
+    header = None
+    pending = ""
+    start_line = 0
+
+    async for line_number, line in lines:
+        if line is None:
+            pending = ""
+            yield line_number, None, "Line exceeds maximum length"
+            continue
+
+        if not pending:
+            start_line = line_number
+            pending = line
+        else:
+            pending += "\n" + line
+
+        if pending.count('"') % 2:
+            if len(pending) > max_record_bytes:
+                pending = ""
+                yield start_line, None, "Record exceeds maximum length"
+            continue
+
+        record_text, pending = pending, ""
+        if not record_text.strip():
+            continue
+
+        try:
+            row = next(csv.reader([record_text]))
+        except csv.Error as e:
+            yield start_line, None, f"Invalid CSV: {e}"
+            continue
+
+        if header is None:
+            header = [column.strip() for column in row]
+            if "id" not in header or "answer" not in header:
+                yield start_line, None, "CSV header must include 'id' and 'answer' columns"
+                return
+            continue
+
+        if len(row) != len(header):
+            yield start_line, None, f"Expected {len(header)} columns, got {len(row)}"
+            continue
+
+        values = dict(zip(header, row))
+        metadata = {
+            column: value for column, value in values.items()
+            if column not in ("id", "answer") and value != ""
+        }
+        yield start_line, {
+            "id": values["id"],
+            "answer": values["answer"],
+            "metadata": metadata or None
+        }, None
+
+    if pending:
+        yield start_line, None, "Unterminated quoted field"
+
+
+def iter_records(
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    max_line_bytes: int
+) -> AsyncIterator[ParsedRecord]:
+    """Build the record iterator for an upload format."""
+    lines = iter_lines(chunks, max_line_bytes)
+    if fmt == "csv":
+        return iter_csv_records(lines, max_line_bytes)
+    return iter_jsonl_records(lines)
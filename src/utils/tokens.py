@@ -0,0 +1,37 @@
+"""
+Local token estimation for backends that do not report usage.
+
+A rough approximation of subword tokenizers: a word costs one token per
+five characters (at least one) and each punctuation mark costs one. Good
+enough for accounting and scheduling, not for enforcing hard API limits.
+"""
+import re
+from typing import Dict, Iterator, Tuple
+
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def _piece_tokens(piece: str) -> int:
+    return max(1, round(len(piece) / 5)) if piece[0].isalnum() or piece[0] == "_" else 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated token count of a text."""
+    return sum(_piece_tokens(piece) for piece in _PIECE_PATTERN.findall(text))
+
+
+def token_spans(text: str) -> Iterator[Tuple[int, int, int]]:
+    """(start, end, estimated tokens) of each word or punctuation mark in a text."""
+    for match in _PIECE_PATTERN.finditer(text):
+        yield match.start(), match.end(), _piece_tokens(match.group())
+
+
+def estimate_usage(prompt: str, output: str) -> Dict[str, int]:
+    """Usage dict (prompt, output and total tokens) estimated from the texts."""
+    prompt_tokens = estimate_tokens(prompt)
+    output_tokens = estimate_tokens(output)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": prompt_tokens + output_tokens,
+    }
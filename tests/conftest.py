@@ -5,14 +5,21 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, AsyncMock
 import os
+import tempfile
 
 # Set test environment variables before importing app
 os.environ["GEMINI_API_KEY"] = "test_api_key_123"
 os.environ["DEBUG"] = "True"
 os.environ["RATE_LIMIT_PER_MINUTE"] = "1000"  # High limit for tests
+os.environ["RANKINGS_DIR"] = tempfile.mkdtemp(prefix="rankings-")  # Keep test rankings out of the repo
+os.environ["REFERENCE_ANSWERS_PATH"] = ""  # No question bank unless a test provides one
+os.environ["QUESTION_BANK_PATH"] = ""
+os.environ["STATE_DIR"] = tempfile.mkdtemp(prefix="state-")  # Shutdown state stays out of the repo
 
 from src.main import app
+from src.services.cohort_stats import cohort_stats
 from src.services.gemini_service import GeminiService
+from src.services.ranking_service import ranking_service
 
 
 @pytest.fixture
@@ -21,6 +28,13 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_ranking_cache():
+    """Keep cached ranking evaluations and cohort statistics from leaking between tests."""
+    ranking_service.clear_cache()
+    cohort_stats.clear()
+
+
 @pytest.fixture
 def mock_gemini_response():
     """Mock Gemini API response."""
@@ -0,0 +1,134 @@
+"""
+Integration tests for /evaluate-answers endpoint.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.services.gemini_service import InvalidAnswerError
+
+
+@pytest.mark.integration
+class TestBatchEvaluateEndpoint:
+    """Test suite for batch evaluation endpoint."""
+    
+    def test_evaluate_answers_success(self, client, mock_gemini_response):
+        """Test batch evaluation with shared question and context references."""
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            return_value=mock_gemini_response
+        ) as mock_evaluate:
+            response = client.post(
+                "/api/v1/evaluate-answers",
+                json={
+                    "questions": {"q1": "What is Python?"},
+                    "contexts": {"junior": "Junior developer interview"},
+                    "items": [
+                        {"id": "a", "candidate_answer": "Python is a language.", "question_ref": "q1", "context_ref": "junior"},
+                        {"id": "b", "candidate_answer": "Python is a snake.", "question_ref": "q1"},
+                        {"id": "c", "candidate_answer": "Python is a language.", "question": "What is Python?", "context_ref": "junior"}
+                    ]
+                }
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["total_items"] == 3
+        assert data["succeeded"] == 3
+        assert data["failed"] == 0
+        # Items a and c resolve to identical text and are evaluated once
+        assert data["unique_evaluations"] == 2
+        assert mock_evaluate.await_count == 2
+        
+        assert [entry["id"] for entry in data["results"]] == ["a", "b", "c"]
+        assert data["results"][0]["result"]["score"] == 4
+        
+        first_call = mock_evaluate.await_args_list[0].kwargs
+        assert first_call["question"] == "What is Python?"
+        assert first_call["context"] == "Junior developer interview"
+    
+    def test_evaluate_answers_reports_per_item_errors(self, client, mock_gemini_response):
+        """Test one failing item does not fail the batch."""
+        async def mock_evaluate(candidate_answer, question=None, context=None, **kwargs):
+            if "fail" in candidate_answer:
+                raise Exception("API Error")
+            return mock_gemini_response
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            response = client.post(
+                "/api/v1/evaluate-answers",
+                json={
+                    "items": [
+                        {"candidate_answer": "A good answer"},
+                        {"candidate_answer": "Please fail"}
+                    ]
+                }
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 1
+        assert data["failed"] == 1
+        assert data["results"][0]["result"] is not None
+        assert data["results"][1]["result"] is None
+        assert data["results"][1]["error"]
+    
+    def test_evaluate_answers_reports_rejected_answers(self, client, mock_gemini_response):
+        """Test answers the model rejects report why instead of the generic error."""
+        async def mock_evaluate(candidate_answer, question=None, context=None, **kwargs):
+            if "rejected" in candidate_answer:
+                raise InvalidAnswerError("The model provider rejected this answer as an invalid request")
+            raise Exception("API Error")
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            response = client.post(
+                "/api/v1/evaluate-answers",
+                json={
+                    "items": [
+                        {"candidate_answer": "A rejected answer"},
+                        {"candidate_answer": "An unlucky answer"}
+                    ]
+                }
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["failed"] == 2
+        assert data["results"][0]["error"] == "The model provider rejected this answer as an invalid request"
+        assert data["results"][1]["error"] == "Failed to evaluate answer. Please try again."
+    
+    def test_evaluate_answers_unknown_reference(self, client):
+        """Test validation for references to undefined shared texts."""
+        response = client.post(
+            "/api/v1/evaluate-answers",
+            json={"items": [{"candidate_answer": "Answer", "question_ref": "missing"}]}
+        )
+        
+        assert response.status_code == 422
+    
+    def test_evaluate_answers_inline_and_reference(self, client):
+        """Test validation rejects both inline question and reference."""
+        response = client.post(
+            "/api/v1/evaluate-answers",
+            json={
+                "questions": {"q1": "What is Python?"},
+                "items": [{"candidate_answer": "Answer", "question": "Q", "question_ref": "q1"}]
+            }
+        )
+        
+        assert response.status_code == 422
+    
+    def test_evaluate_answers_empty_items(self, client):
+        """Test validation for empty item list."""
+        response = client.post("/api/v1/evaluate-answers", json={"items": []})
+        
+        assert response.status_code == 422
@@ -0,0 +1,52 @@
+"""
+Integration tests for /cohorts endpoints.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+@pytest.mark.integration
+class TestCohortsEndpoint:
+    """Test suite for per-question cohort statistics."""
+    
+    def test_question_cohort_accumulates_scores(self, client):
+        """Test evaluations of one question build its distribution."""
+        scores = iter([2, 4, 4, 5])
+        
+        async def mock_evaluate(candidate_answer, **kwargs):
+            return {"score": next(scores), "summary": "S", "improvement": "I"}
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            cohort_ids = {
+                client.post("/api/v1/evaluate-answer", json={
+                    "candidate_answer": f"Answer number {n}",
+                    "question": question
+                }).json()["metadata"]["cohort_id"]
+                for n, question in enumerate(["What is a GIL?", "what is a  GIL?"])
+            }
+            response = client.post("/api/v1/evaluate-answers", json={"items": [
+                {"candidate_answer": "Batch answer one", "question": "What is a GIL?"},
+                {"candidate_answer": "Batch answer two", "question": "What is a GIL?"}
+            ]})
+            assert response.status_code == 200
+        
+        assert len(cohort_ids) == 1
+        cohort_id = cohort_ids.pop()
+        
+        response = client.get(f"/api/v1/cohorts/questions/{cohort_id}?score=4")
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["question"] == "What is a GIL?"
+        assert stats["count"] == 4
+        assert stats["mean"] == 3.75
+        assert stats["histogram"] == {"1": 0, "2": 1, "3": 0, "4": 2, "5": 1}
+        assert stats["position"]["rank_best"] == 2
+        assert stats["position"]["percentile_rank"] == 50.0
+        
+        listing = client.get("/api/v1/cohorts/questions").json()
+        assert listing == [{"cohort_id": cohort_id, "question": "What is a GIL?", "count": 4}]
+        assert client.get("/api/v1/cohorts/questions/unknown").status_code == 404
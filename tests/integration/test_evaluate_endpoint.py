@@ -4,6 +4,11 @@ Integration tests for /evaluate-answer endpoint.
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.services.question_bank import QuestionBank
+from src.services.scheduler import current_priority
+
 
 @pytest.mark.integration
 class TestEvaluateEndpoint:
@@ -89,7 +94,62 @@ class TestEvaluateEndpoint:
         )
         
         assert response.status_code == 422
+    
+    def test_evaluate_answer_priority_class(self, client, mock_gemini_response):
+        """Model work runs as interactive unless the request header picks a class."""
+        seen = []
+        
+        async def mock_evaluate(*args, **kwargs):
+            seen.append(current_priority.get())
+            return mock_gemini_response
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            default = client.post("/api/v1/evaluate-answer", json={"candidate_answer": "First answer"})
+            chosen = client.post(
+                "/api/v1/evaluate-answer",
+                json={"candidate_answer": "Second answer"},
+                headers={"X-Priority": "background"}
+            )
+            unknown = client.post(
+                "/api/v1/evaluate-answer",
+                json={"candidate_answer": "Third answer"},
+                headers={"X-Priority": "urgent"}
+            )
+        
+        assert default.status_code == 200
+        assert chosen.status_code == 200
+        assert unknown.status_code == 400
+        assert seen == ["interactive", "background"]
 
+    
+    def test_evaluate_answer_reports_token_usage(self, client, monkeypatch):
+        """Token usage is returned in metadata and headers and aggregated per route and client."""
+        monkeypatch.setattr(settings, "EVALUATION_PROVIDER", "fake")
+        metrics.reset()
+        
+        response = client.post(
+            "/api/v1/evaluate-answer",
+            json={"candidate_answer": "Python is a readable, general-purpose language."}
+        )
+        
+        assert response.status_code == 200
+        usage = response.json()["metadata"]["usage"]
+        assert usage["estimated"] is True
+        assert usage["total_tokens"] == usage["prompt_tokens"] + usage["output_tokens"] > 0
+        assert response.headers["X-Model-Calls"] == "1"
+        assert response.headers["X-Total-Tokens"] == str(usage["total_tokens"])
+        assert response.headers["X-Tokens-Estimated"] == "1"
+        assert metrics.counter_value(
+            "route_total_tokens", labels={"route": "/api/v1/evaluate-answer"}
+        ) == usage["total_tokens"]
+        # Clients not listed in USAGE_CLIENT_LABELS share one label
+        assert metrics.counter_value(
+            "client_total_tokens", labels={"client": "other"}
+        ) == usage["total_tokens"]
 
 @pytest.mark.integration
 class TestEvaluateEndpointErrorHandling:
@@ -109,3 +169,68 @@ class TestEvaluateEndpointErrorHandling:
         
         assert response.status_code == 500
         assert "detail" in response.json()
+    
+    def test_evaluate_answer_by_question_id(self, client, mock_gemini_response, monkeypatch):
+        """A bank question supplies the question, context and rubric; unknown ids are rejected."""
+        bank = QuestionBank("")
+        bank.register("py-basics", "What is Python?", "Junior developer interview", ["Mentions interpretation"])
+        monkeypatch.setattr("src.services.evaluation_service.question_bank", bank)
+        monkeypatch.setattr("src.api.v1.routes.questions.question_bank", bank)
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            return_value=mock_gemini_response
+        ) as mock_evaluate:
+            response = client.post(
+                "/api/v1/evaluate-answer",
+                json={"candidate_answer": "Python is interpreted.", "question_id": "py-basics"}
+            )
+            unknown = client.post(
+                "/api/v1/evaluate-answer",
+                json={"candidate_answer": "Python is interpreted.", "question_id": "missing"}
+            )
+            both = client.post(
+                "/api/v1/evaluate-answer",
+                json={"candidate_answer": "Python is interpreted.", "question_id": "py-basics", "question": "Q?"}
+            )
+        listed = client.get("/api/v1/questions")
+        
+        assert response.status_code == 200
+        kwargs = mock_evaluate.await_args_list[0].kwargs
+        assert kwargs["question"] == "What is Python?"
+        assert kwargs["context"] == "Junior developer interview"
+        assert kwargs["rubric"] == "- Mentions interpretation"
+        assert unknown.status_code == 400
+        assert both.status_code == 422
+        assert [entry["id"] for entry in listed.json()] == ["py-basics"]
+        assert listed.json()[0]["prompt_prefix_tokens"] > 0
+    
+    def test_evaluate_answer_with_samples(self, client):
+        """Test the samples field reaches the model service and agreement is reported."""
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            return_value={
+                "score": 4,
+                "summary": "Solid answer",
+                "improvement": "Add an example",
+                "self_consistency": {
+                    "requested": 3, "samples": 3, "unparsed": 0,
+                    "scores": [4, 3, 4], "agreement": 0.667, "spread": 1
+                }
+            }
+        ) as mock_evaluate:
+            response = client.post(
+                "/api/v1/evaluate-answer",
+                json={"candidate_answer": "Python is interpreted.", "samples": 3}
+            )
+            too_many = client.post(
+                "/api/v1/evaluate-answer",
+                json={"candidate_answer": "Python is interpreted.", "samples": 9}
+            )
+        
+        assert response.status_code == 200
+        assert mock_evaluate.await_args.kwargs["samples"] == 3
+        assert response.json()["metadata"]["self_consistency"]["agreement"] == 0.667
+        assert too_many.status_code == 422
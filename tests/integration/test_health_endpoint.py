@@ -46,3 +46,34 @@ class TestHealthEndpoints:
         assert "paths" in data
         assert "/api/v1/evaluate-answer" in data["paths"]
         assert "/api/v1/rank-candidates" in data["paths"]
+    
+    def test_metrics_endpoint(self, client):
+        """Test metrics snapshot is exposed."""
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "counters" in data
+        assert "summaries" in data
+        assert "cascade" in data["collectors"]
+    
+    def test_readiness_while_draining(self, client, sample_evaluation_request):
+        """Readiness fails and new API work is rejected once draining starts."""
+        from src.core.lifecycle import lifecycle
+        
+        assert client.get("/ready").status_code == 200
+        
+        lifecycle.begin_drain()
+        try:
+            ready = client.get("/ready")
+            rejected = client.post("/api/v1/evaluate-answer", json=sample_evaluation_request)
+            health = client.get("/health")
+        finally:
+            lifecycle.reset()
+        
+        assert ready.status_code == 503
+        assert ready.json()["status"] == "draining"
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "1"
+        assert rejected.headers["Connection"] == "close"
+        assert health.status_code == 200
@@ -0,0 +1,62 @@
+"""
+Integration tests for the /live-interview WebSocket.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.core.config import settings
+
+
+@pytest.mark.integration
+class TestLiveInterviewEndpoint:
+    """Test suite for the live-interview WebSocket."""
+    
+    def test_final_answer_reuses_draft_evaluation(self, client, mock_gemini_response, monkeypatch):
+        """A paused draft is scored provisionally and its result returned for the final answer."""
+        monkeypatch.setattr(settings, "LIVE_DEBOUNCE_MS", 10)
+        answer = "Python is a high-level, interpreted programming language known for readability."
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            return_value=mock_gemini_response
+        ) as mock_evaluate:
+            with client.websocket_connect("/api/v1/live-interview") as websocket:
+                websocket.send_json({"type": "start", "question": "What is Python?"})
+                websocket.send_json({"type": "draft", "text": answer})
+                provisional = websocket.receive_json()
+                websocket.send_json({"type": "final", "text": answer})
+                result = websocket.receive_json()
+        
+        assert provisional["type"] == "provisional"
+        assert result["type"] == "result"
+        assert result["evaluation"]["score"] == mock_gemini_response["score"]
+        assert result["speculation"]["outcome"] == "reused"
+        assert mock_evaluate.await_count == 1
+        assert mock_evaluate.await_args.kwargs["question"] == "What is Python?"
+    
+    def test_invalid_messages_report_errors(self, client):
+        """Unknown message types and empty final answers are reported without closing."""
+        with client.websocket_connect("/api/v1/live-interview") as websocket:
+            websocket.send_json({"type": "pause"})
+            unknown = websocket.receive_json()
+            websocket.send_json({"type": "final"})
+            empty = websocket.receive_json()
+        
+        assert unknown["type"] == "error"
+        assert empty["type"] == "error"
+        assert "candidate_answer" in empty["detail"]
+    
+    def test_overlong_draft_reports_error(self, client):
+        """Appending past the answer length limit is reported and the session stays open."""
+        with client.websocket_connect("/api/v1/live-interview") as websocket:
+            websocket.send_json({"type": "start", "question": "What is Python?"})
+            for _ in range(2):
+                websocket.send_json({"type": "append", "text": "x" * 3000})
+            error = websocket.receive_json()
+            websocket.send_json({"type": "pause"})
+            still_open = websocket.receive_json()
+        
+        assert error["type"] == "error"
+        assert "5000" in error["detail"]
+        assert still_open["type"] == "error"
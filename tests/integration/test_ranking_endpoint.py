@@ -1,9 +1,13 @@
 """
 Integration tests for /rank-candidates endpoint.
 """
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from src.middleware.load_shedding import load_shedder
+from src.services.scheduler import ModelCallScheduler
+
 
 @pytest.mark.integration
 class TestRankingEndpoint:
@@ -141,3 +145,73 @@ class TestRankingEndpoint:
         )
         
         assert response.status_code == 422
+    
+    def test_rank_candidates_idempotency_key(self, client, sample_ranking_request):
+        """A retried request with the same Idempotency-Key is not re-evaluated."""
+        mock_evaluate = AsyncMock(return_value={
+            "score": 3, "summary": "Decent answer", "improvement": "Explain more"
+        })
+        headers = {"Idempotency-Key": "retry-test-1"}
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            mock_evaluate
+        ):
+            first = client.post("/api/v1/rank-candidates", json=sample_ranking_request, headers=headers)
+            retry = client.post("/api/v1/rank-candidates", json=sample_ranking_request, headers=headers)
+            reused = client.post(
+                "/api/v1/rank-candidates",
+                json={"candidates": sample_ranking_request["candidates"][:2]},
+                headers=headers
+            )
+        
+        assert first.status_code == 200
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        assert mock_evaluate.await_count == 3
+        assert reused.status_code == 422
+    
+    def test_rank_candidates_shed_when_overloaded(self, client, sample_ranking_request, monkeypatch):
+        """An overloaded service rejects rankings with 503 before calling the model."""
+        busy = ModelCallScheduler(limit=1)
+        busy.hold_time_ms = 60000
+        busy.in_flight = 1
+        monkeypatch.setattr(load_shedder, "scheduler", busy)
+        mock_evaluate = AsyncMock()
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            mock_evaluate
+        ):
+            response = client.post("/api/v1/rank-candidates", json=sample_ranking_request)
+        
+        assert response.status_code == 503
+        assert 1 <= int(response.headers["Retry-After"]) <= 60
+        mock_evaluate.assert_not_awaited()
+    
+    def test_rank_candidates_deadline_returns_pending(self, client, sample_ranking_request):
+        """Candidates not evaluated within deadline_ms are listed as pending, without scores."""
+        async def mock_eval(candidate_answer, **kwargs):
+            if candidate_answer == sample_ranking_request["candidates"][0]["answer"]:
+                await asyncio.sleep(2)
+            return {"score": 4, "summary": "Good", "improvement": "More detail"}
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            AsyncMock(side_effect=mock_eval)
+        ):
+            response = client.post(
+                "/api/v1/rank-candidates",
+                json={**sample_ranking_request, "deadline_ms": 200}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["partial"] is True
+        assert data["pending_candidates"] == [
+            {"id": "candidate_1", "status": "pending", "duplicate_of": None}
+        ]
+        assert "candidate_1" not in [c["id"] for c in data["ranked_candidates"]]
+        assert data["total_candidates"] == len(sample_ranking_request["candidates"])
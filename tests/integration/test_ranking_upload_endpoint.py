@@ -0,0 +1,77 @@
+"""
+Integration tests for /rank-candidates/upload endpoint.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+@pytest.mark.integration
+class TestRankingUploadEndpoint:
+    """Test suite for streaming ranking uploads."""
+    
+    def test_upload_csv(self, client):
+        """Test ranking a CSV upload with metadata columns and a bad row."""
+        body = (
+            "id,answer,name\n"
+            "c1,Python is a programming language.,Alice\n"
+            "c2,\"Python is a high-level, interpreted language.\",Bob\n"
+            ",No id here,Carol\n"
+        )
+        
+        async def mock_evaluate(candidate_answer, **kwargs):
+            score = 5 if "high-level" in candidate_answer else 2
+            return {"score": score, "summary": "S", "improvement": "I"}
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            response = client.post(
+                "/api/v1/rank-candidates/upload",
+                content=body.encode("utf-8"),
+                headers={"Content-Type": "text/csv"}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["total_candidates"] == 2
+        assert data["ranked_candidates"][0]["id"] == "c2"
+        assert data["ranked_candidates"][0]["metadata"] == {"name": "Bob"}
+        assert data["rows_received"] == 3
+        assert data["rows_rejected"] == 1
+        assert data["errors"][0]["line"] == 4
+    
+    def test_upload_jsonl_top_k(self, client, mock_gemini_response):
+        """Test JSONL upload with the format query parameter and top_k."""
+        body = "\n".join(
+            f'{{"id": "c{i}", "answer": "Distinct answer number {i} about topic {i * 7}"}}'
+            for i in range(5)
+        )
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            return_value=mock_gemini_response
+        ):
+            response = client.post(
+                "/api/v1/rank-candidates/upload?format=jsonl&top_k=2",
+                content=body.encode("utf-8"),
+                headers={"Content-Type": "application/octet-stream"}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_candidates"] == 5
+        assert len(data["ranked_candidates"]) == 2
+    
+    def test_upload_unsupported_format(self, client):
+        """Test unsupported Content-Type is rejected."""
+        response = client.post(
+            "/api/v1/rank-candidates/upload",
+            content=b'{"candidates": []}',
+            headers={"Content-Type": "application/json"}
+        )
+        
+        assert response.status_code == 415
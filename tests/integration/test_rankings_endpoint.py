@@ -0,0 +1,184 @@
+"""
+Integration tests for /rankings endpoints.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+@pytest.mark.integration
+class TestRankingsEndpoint:
+    """Test suite for named incremental rankings."""
+    
+    def test_incremental_ranking_lifecycle(self, client):
+        """Test adding, paging, reading and removing candidates."""
+        scores = {"Late strong answer about asyncio event loops": 5}
+        
+        async def mock_evaluate(candidate_answer, **kwargs):
+            return {"score": scores.get(candidate_answer, 3), "summary": "S", "improvement": "I"}
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ) as mock:
+            response = client.post(
+                "/api/v1/rankings/backend-2026/candidates",
+                json={"candidates": [
+                    {"id": "c1", "answer": "Threads share memory."},
+                    {"id": "c2", "answer": "Processes have separate memory."}
+                ]}
+            )
+            assert response.status_code == 200
+            assert response.json()["added"] == 2
+            
+            response = client.post(
+                "/api/v1/rankings/backend-2026/candidates",
+                json={"candidates": [
+                    {"id": "c2", "answer": "Processes have separate memory."},
+                    {"id": "c3", "answer": "Late strong answer about asyncio event loops"}
+                ]}
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["added"] == 1
+            assert data["skipped"] == ["c2"]
+            assert data["evaluations"] == 1
+            assert mock.await_count == 3
+        
+        response = client.get("/api/v1/rankings/backend-2026?offset=0&limit=2")
+        assert response.status_code == 200
+        page = response.json()
+        assert page["total_candidates"] == 3
+        assert [(c["id"], c["rank"]) for c in page["ranked_candidates"]] == [("c3", 1), ("c1", 2)]
+        
+        response = client.delete("/api/v1/rankings/backend-2026/candidates/c3")
+        assert response.status_code == 204
+        
+        response = client.get("/api/v1/rankings/backend-2026/candidates/c2")
+        assert response.status_code == 200
+        assert response.json()["rank"] == 2
+        
+        assert "backend-2026" in client.get("/api/v1/rankings").json()
+        assert client.delete("/api/v1/rankings/backend-2026").status_code == 204
+        assert client.get("/api/v1/rankings/backend-2026").status_code == 404
+    
+    def test_unknown_ranking(self, client):
+        """Test reading a ranking that does not exist."""
+        response = client.get("/api/v1/rankings/does-not-exist")
+        
+        assert response.status_code == 404
+    
+    def test_invalid_ranking_name(self, client):
+        """Test names with unsupported characters are rejected."""
+        response = client.post(
+            "/api/v1/rankings/bad name!/candidates",
+            json={"candidates": [{"id": "c1", "answer": "Answer"}]}
+        )
+        
+        assert response.status_code == 400
+    
+    def test_ranking_page_etag_and_compression(self, client):
+        """Test unchanged pages return 304 and large pages are compressed."""
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            return_value={"score": 4, "summary": "Solid answer " * 10, "improvement": "Add examples " * 10}
+        ):
+            client.post(
+                "/api/v1/rankings/etag-test/candidates",
+                json={"candidates": [{"id": f"c{i}", "answer": f"Answer {i}"} for i in range(20)]}
+            )
+        
+        response = client.get("/api/v1/rankings/etag-test", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        
+        response = client.get("/api/v1/rankings/etag-test", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            return_value={"score": 5, "summary": "Best", "improvement": "None"}
+        ):
+            client.post(
+                "/api/v1/rankings/etag-test/candidates",
+                json={"candidates": [{"id": "new", "answer": "New leader"}]}
+            )
+        
+        response = client.get(
+            "/api/v1/rankings/etag-test",
+            headers={"If-None-Match": etag, "Accept-Encoding": "identity"}
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.json()["ranked_candidates"][0]["id"] == "new"
+    
+    def test_ranking_stats_follow_updates(self, client):
+        """Test the score distribution tracks added and removed candidates."""
+        scores = {"a": 5, "b": 3, "c": 3, "d": 1}
+        
+        async def mock_evaluate(candidate_answer, **kwargs):
+            return {"score": scores[candidate_answer], "summary": "S", "improvement": "I"}
+        
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            client.post(
+                "/api/v1/rankings/stats-test/candidates",
+                json={"candidates": [{"id": answer, "answer": answer} for answer in scores]}
+            )
+        
+        response = client.get("/api/v1/rankings/stats-test/stats?score=3")
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["count"] == 4
+        assert stats["histogram"] == {"1": 1, "2": 0, "3": 2, "4": 0, "5": 1}
+        assert stats["percentiles"]["p50"] == 3
+        assert stats["position"] == {"score": 3, "rank_best": 2, "rank_worst": 3, "percentile_rank": 50.0}
+        
+        client.delete("/api/v1/rankings/stats-test/candidates/a")
+        
+        stats = client.get("/api/v1/rankings/stats-test/stats").json()
+        assert stats["count"] == 3
+        assert stats["histogram"]["5"] == 0
+        assert stats["position"] is None
+        assert client.get("/api/v1/rankings/missing/stats").status_code == 404
+    
+    def test_failed_evaluations_are_not_stored(self, client):
+        """A failed evaluation is reported, not ranked, and retried on the next update."""
+        failures = {"Flaky answer about the GIL"}
+        
+        async def mock_evaluate(candidate_answer, **kwargs):
+            if candidate_answer in failures:
+                raise Exception("Gemini API error: 503")
+            return {"score": 4, "summary": "S", "improvement": "I"}
+        
+        candidates = {"candidates": [
+            {"id": "ok", "answer": "Threads share memory."},
+            {"id": "flaky", "answer": "Flaky answer about the GIL"}
+        ]}
+        with patch(
+            'src.services.gemini_service.gemini_service.evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            data = client.post("/api/v1/rankings/retry-test/candidates", json=candidates).json()
+            assert data["added"] == 1
+            assert data["errors"] == [{"id": "flaky", "error": "Evaluation failed"}]
+            assert client.get("/api/v1/rankings/retry-test/candidates/flaky").status_code == 404
+            
+            failures.clear()
+            data = client.post("/api/v1/rankings/retry-test/candidates", json=candidates).json()
+        
+        assert data["added"] == 1
+        assert data["skipped"] == ["ok"]
+        assert data["errors"] == []
+        assert client.get("/api/v1/rankings/retry-test/candidates/flaky").json()["score"] == 4
+        client.delete("/api/v1/rankings/retry-test")
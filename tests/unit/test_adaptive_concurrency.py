@@ -0,0 +1,119 @@
+"""
+Unit tests for the adaptive (AIMD) model concurrency limit, demonstrated
+against the fake provider.
+"""
+import asyncio
+import gc
+import pytest
+
+from src.core.config import settings
+from src.services.providers import ProviderRegistry
+from src.services.providers.fake import FakeProvider
+from src.services.scheduler import AdaptiveLimit, ModelCallScheduler
+
+
+async def run_burst(scheduler, calls):
+    """Send concurrent fake calls through a registry; return successes and observed limits."""
+    registry = ProviderRegistry({"fake": FakeProvider}, scheduler=scheduler)
+    limits = []
+
+    async def call():
+        try:
+            await registry.generate("prompt", provider="fake", model="m", max_output_tokens=1)
+            return True
+        except Exception:
+            return False
+        finally:
+            limits.append(scheduler.limit)
+
+    results = await asyncio.gather(*[call() for _ in range(calls)])
+    return sum(results), limits
+
+
+@pytest.fixture
+def quota_limited_backend(monkeypatch):
+    """Fake backend that accepts 4 concurrent calls and answers in 10 ms."""
+    monkeypatch.setattr(settings, "PROVIDER_FALLBACKS", "")
+    monkeypatch.setattr(settings, "FAKE_PROVIDER_CAPACITY", 4)
+    monkeypatch.setattr(settings, "FAKE_PROVIDER_LATENCY_MS", 10)
+    # Keep full garbage collections of the test session's heap out of the
+    # timed burst: a long pause releases many timers at once and skews it
+    gc.collect()
+    gc.freeze()
+    yield
+    gc.unfreeze()
+
+
+@pytest.mark.unit
+class TestAdaptiveConcurrency:
+    """Test suite for AdaptiveLimit."""
+
+    @pytest.mark.asyncio
+    async def test_limit_converges_on_backend_capacity(self, quota_limited_backend):
+        """The limit probes past the backend's capacity, backs off on 429s and settles near it."""
+        adaptive = AdaptiveLimit(initial=2, minimum=1, maximum=32, backoff=0.5, tolerance=100)
+        successes, limits = await run_burst(ModelCallScheduler(adaptive=adaptive), 300)
+        static_successes, _ = await run_burst(ModelCallScheduler(limit=32), 300)
+
+        assert adaptive.decreases > 0
+        assert max(limits) <= 10
+        assert 2 <= adaptive.limit <= 6
+        assert successes >= 240
+        # A static limit far above capacity turns most of the burst into 429s
+        assert static_successes < successes / 2
+
+    @pytest.mark.asyncio
+    async def test_limit_grows_while_backend_is_healthy(self, monkeypatch):
+        """Without errors or spikes the limit slow-starts up to its maximum."""
+        monkeypatch.setattr(settings, "FAKE_PROVIDER_CAPACITY", 0)
+        monkeypatch.setattr(settings, "FAKE_PROVIDER_LATENCY_MS", 5)
+        adaptive = AdaptiveLimit(initial=2, minimum=1, maximum=16, tolerance=100)
+
+        successes, _ = await run_burst(ModelCallScheduler(adaptive=adaptive), 100)
+
+        assert successes == 100
+        assert adaptive.limit == 16
+        assert adaptive.slow_start is True
+
+    def test_latency_spike_cuts_the_limit_once_per_round_trip(self):
+        """A call far slower than the baseline is treated as overload."""
+        adaptive = AdaptiveLimit(initial=10, minimum=1, maximum=32, backoff=0.5, tolerance=2.0)
+        for _ in range(5):
+            adaptive.on_success(latency_ms=1000, in_flight=10)
+        grown = adaptive.limit
+
+        adaptive.on_success(latency_ms=5000, in_flight=10)
+        adaptive.on_overload("rate_limited")
+
+        assert grown == 15
+        assert adaptive.limit == 7
+        assert adaptive.decreases == 1
+        assert adaptive.slow_start is False
+
+    def test_idle_limit_does_not_grow(self):
+        """Successes while most of the limit is unused do not raise it."""
+        adaptive = AdaptiveLimit(initial=10, minimum=1, maximum=32)
+        for _ in range(20):
+            adaptive.on_success(latency_ms=100, in_flight=2)
+
+        assert adaptive.limit == 10
+
+    @pytest.mark.asyncio
+    async def test_limit_increase_wakes_queued_callers(self):
+        """Slots added by an increase are granted without waiting for a release."""
+        scheduler = ModelCallScheduler(adaptive=AdaptiveLimit(initial=1, minimum=1, maximum=4, tolerance=100))
+        granted = asyncio.Event()
+
+        async def queued():
+            async with scheduler.slot("interactive"):
+                granted.set()
+
+        async with scheduler.slot("interactive"):
+            waiter = asyncio.create_task(queued())
+            await asyncio.sleep(0)
+            assert not granted.is_set()
+
+            scheduler.record_latency(10.0)
+            await asyncio.wait_for(granted.wait(), timeout=1)
+            assert scheduler.limit == 2
+        await waiter
@@ -0,0 +1,115 @@
+"""
+Unit tests for answer compaction and the answer token budget.
+"""
+import pytest
+
+from src.core.config import settings
+from src.services.gemini_service import GeminiService
+from src.services.providers import ProviderRegistry
+from src.services.providers.fake import FakeProvider
+from src.utils.answer_compaction import (
+    collapse_repeats,
+    compact_answer,
+    normalize_whitespace,
+    truncate_middle,
+)
+from src.utils.tokens import estimate_tokens
+
+
+@pytest.mark.unit
+class TestAnswerCompaction:
+    """Test suite for answer compaction."""
+
+    def test_whitespace_is_collapsed_but_indentation_kept(self):
+        """Spaces and blank lines collapse; code indentation survives."""
+        text = "A  decorator\t wraps   a function.  \r\n\r\n\r\n\r\ndef f(x):\n    return   x\n\n"
+
+        assert normalize_whitespace(text) == "A decorator wraps a function.\n\ndef f(x):\n    return x"
+
+    def test_repeated_and_similar_lines_are_collapsed(self):
+        """Identical runs keep one copy; digit-only variations keep first and last."""
+        text = "\n".join(
+            ["Retrying request"] * 4
+            + [f'  File "app.py", line {n}, in handler' for n in range(10, 16)]
+            + ["Done"]
+        )
+
+        compacted, removed = collapse_repeats(text)
+
+        assert compacted.split("\n") == [
+            "Retrying request",
+            "[line repeated 3 more times]",
+            '  File "app.py", line 10, in handler',
+            "[4 similar lines omitted]",
+            '  File "app.py", line 15, in handler',
+            "Done",
+        ]
+        assert removed == 7
+
+    def test_truncation_keeps_start_and_end_within_budget(self):
+        """An over-long answer keeps its start and end and fits the budget."""
+        text = " ".join(f"word{n}" for n in range(2000))
+
+        truncated, was_truncated = truncate_middle(text, 100)
+
+        assert was_truncated
+        assert truncated.startswith("word0 word1 ")
+        assert truncated.endswith(" word1998 word1999")
+        assert "tokens omitted ...]" in truncated
+        assert estimate_tokens(truncated) <= 100
+        assert truncate_middle("short answer", 100) == ("short answer", False)
+
+    def test_compact_answer_reports_reduction(self):
+        """The report gives sizes before and after compaction."""
+        answer = "Generators   yield values lazily.\n" + "Traceback line\n" * 50
+
+        compacted = compact_answer(answer, max_tokens=0)
+
+        assert compacted.text == "Generators yield values lazily.\nTraceback line\n[line repeated 49 more times]"
+        report = compacted.report()
+        assert report["original_chars"] == len(answer)
+        assert report["chars"] == len(compacted.text)
+        assert report["tokens"] < report["original_tokens"]
+        assert report["lines_collapsed"] == 49
+        assert report["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_model_receives_compacted_answer(self, monkeypatch):
+        """The prompt carries the compacted answer and the result reports the saving."""
+        monkeypatch.setattr(settings, "EVALUATION_PROVIDER", "fake")
+        monkeypatch.setattr(settings, "CASCADE_ENABLED", False)
+        monkeypatch.setattr(settings, "ANSWER_COMPACTION_ENABLED", True)
+        monkeypatch.setattr(settings, "ANSWER_MAX_TOKENS", 50)
+        prompts = []
+        provider = FakeProvider()
+        generate = provider.generate
+
+        async def recording_generate(prompt, *args, **kwargs):
+            prompts.append(prompt)
+            return await generate(prompt, *args, **kwargs)
+
+        monkeypatch.setattr(provider, "generate", recording_generate)
+        service = GeminiService(providers=ProviderRegistry({"fake": lambda: provider}))
+
+        result = await service.evaluate_answer(" ".join(["lazy evaluation"] * 500))
+
+        assert "tokens omitted ...]" in prompts[0]
+        assert result["compaction"]["truncated"] is True
+        assert result["compaction"]["tokens"] <= 50
+        assert result["compaction"]["original_tokens"] > 500
+        assert result["compaction"]["compaction_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_long_answers_are_not_truncated_by_default(self, monkeypatch):
+        """Without an ANSWER_MAX_TOKENS budget, a maximum-length code answer is sent whole."""
+        monkeypatch.setattr(settings, "CASCADE_ENABLED", False)
+        monkeypatch.setattr(settings, "ANSWER_COMPACTION_ENABLED", True)
+        monkeypatch.setattr(settings, "ANSWER_MAX_TOKENS", settings.model_fields["ANSWER_MAX_TOKENS"].default)
+        service = GeminiService(providers=ProviderRegistry({"fake": FakeProvider}))
+        names = [a + b for a in "abcdefghij" for b in "klmnopqrst"]
+        answer = "\n".join(f"{name} = f({name}[i], {name}.get(k)) or {{}}" for name in names)[:5000]
+
+        result = await service.evaluate_answer(answer, provider="fake")
+
+        assert result["compaction"]["truncated"] is False
+        assert result["compaction"]["chars"] == len(answer)
@@ -0,0 +1,127 @@
+"""
+Unit tests for cassette recording and replay of model calls.
+"""
+import gzip
+import json
+import time
+import pytest
+
+from src.core.config import settings
+from src.services.gemini_service import GeminiService
+from src.services.providers import EvaluationProvider, ProviderError, ProviderRegistry, ProviderResponse
+from src.services.providers.cassette import CassetteWriter, ReplayProvider
+from src.services.providers.fake import FakeProvider
+
+
+class ScriptedProvider(EvaluationProvider):
+    """Provider returning fixed texts in turn, with a fixed latency."""
+
+    name = "scripted"
+
+    def __init__(self, texts, delay=0.0):
+        self.texts = list(texts)
+        self.delay = delay
+
+    async def generate(self, prompt, model, max_output_tokens, temperature=0.3):
+        time.sleep(self.delay)
+        text = self.texts.pop(0)
+        if isinstance(text, ProviderError):
+            raise text
+        return ProviderResponse(text=text, model=model, provider=self.name)
+
+
+@pytest.fixture
+def record_to(monkeypatch, tmp_path):
+    """Turn recording on; returns a function building a recording registry."""
+    monkeypatch.setattr(settings, "CASSETTE_RECORD", True)
+    monkeypatch.setattr(settings, "PROVIDER_FALLBACKS", "")
+    path = tmp_path / "calls.jsonl.gz"
+    writer = CassetteWriter(str(path))
+    monkeypatch.setattr("src.services.providers.registry.cassette_writer", writer)
+
+    def build(factories):
+        return ProviderRegistry(factories), writer, path
+
+    return build
+
+
+@pytest.mark.unit
+class TestCassette:
+    """Test suite for record/replay."""
+
+    @pytest.mark.asyncio
+    async def test_recorded_evaluations_replay_offline(self, record_to, monkeypatch):
+        """Evaluations replayed from a cassette match the recorded ones."""
+        registry, writer, path = record_to({"fake": FakeProvider})
+        recording = GeminiService(providers=registry)
+        answers = ["word " * 20, "a much longer answer " * 20]
+        recorded = [await recording.evaluate_answer(answer, provider="fake") for answer in answers]
+        writer.flush()
+
+        monkeypatch.setattr(settings, "CASSETTE_RECORD", False)
+        monkeypatch.setattr(settings, "CASSETTE_TIMING_SCALE", 0.0)
+        replaying = GeminiService(providers=ProviderRegistry({"replay": lambda: ReplayProvider(str(path))}))
+        replayed = [await replaying.evaluate_answer(answer, provider="replay") for answer in answers]
+
+        assert [r["score"] for r in replayed] == [r["score"] for r in recorded]
+        assert [r["summary"] for r in replayed] == [r["summary"] for r in recorded]
+        assert replayed[0]["provider"] == "replay"
+        with pytest.raises(Exception):
+            await replaying.evaluate_answer("never recorded", provider="replay")
+
+    @pytest.mark.asyncio
+    async def test_cassette_is_compact_and_keeps_errors(self, record_to):
+        """Repeated prompts are stored once; errors and their kind are recorded."""
+        scripted = ScriptedProvider(
+            ['{"score": 3}', '```json\n{"score": 4}\n```', ProviderError("slow down", 429, "rate_limited")]
+        )
+        registry, writer, path = record_to({"scripted": lambda: scripted})
+        for _ in range(2):
+            await registry.generate("same prompt", provider="scripted", model="m", max_output_tokens=10)
+        with pytest.raises(ProviderError):
+            await registry.generate("other prompt", provider="scripted", model="m", max_output_tokens=10)
+        writer.flush()
+
+        with gzip.open(path, "rt", encoding="utf-8") as cassette:
+            records = [json.loads(line) for line in cassette]
+
+        assert [record.get("prompt") for record in records] == ["same prompt", None, "other prompt"]
+        assert records[2]["error"]["kind"] == "rate_limited"
+
+        replay = ReplayProvider(str(path))
+        texts = [(await replay.generate("same prompt", "m", 10)).text for _ in range(3)]
+        assert texts == ['{"score": 3}', '```json\n{"score": 4}\n```', '{"score": 3}']
+        with pytest.raises(ProviderError) as error:
+            await replay.generate("other prompt", "m", 10)
+        assert error.value.is_rate_limited
+
+    @pytest.mark.asyncio
+    async def test_replay_timing_is_scaled(self, record_to, monkeypatch):
+        """Recorded latency is replayed times CASSETTE_TIMING_SCALE."""
+        registry, writer, path = record_to({"scripted": lambda: ScriptedProvider(['{"score": 5}'], delay=0.1)})
+        await registry.generate("prompt", provider="scripted", model="m", max_output_tokens=10)
+        writer.flush()
+        replay = ReplayProvider(str(path))
+
+        monkeypatch.setattr(settings, "CASSETTE_TIMING_SCALE", 0.5)
+        start_time = time.perf_counter()
+        response = await replay.generate("prompt", "m", 10)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        assert 45 <= response.latency_ms <= 60
+        assert elapsed_ms >= 45
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_prompts_cycle_when_configured(self, record_to, monkeypatch):
+        """With CASSETTE_REPLAY_MISS=cycle, unknown prompts get recordings in file order."""
+        registry, writer, path = record_to({"scripted": lambda: ScriptedProvider(["one", "two"])})
+        for prompt in ("first", "second"):
+            await registry.generate(prompt, provider="scripted", model="m", max_output_tokens=10)
+        writer.flush()
+        monkeypatch.setattr(settings, "CASSETTE_TIMING_SCALE", 0.0)
+        monkeypatch.setattr(settings, "CASSETTE_REPLAY_MISS", "cycle")
+        replay = ReplayProvider(str(path))
+
+        texts = [(await replay.generate(f"new {n}", "m", 10)).text for n in range(3)]
+
+        assert texts == ["one", "two", "one"]
@@ -0,0 +1,103 @@
+"""
+Unit tests for streaming cohort statistics.
+"""
+import multiprocessing
+import pytest
+
+from src.services import cohort_stats as cohort_stats_module
+from src.services.cohort_stats import CohortStats, cohort_id
+from src.services.ranking_store import StoredRanking
+from src.utils.score_histogram import ScoreHistogram
+
+
+def record_scores(state_dir, score, barrier):
+    """Record scores from a separate worker process once every worker is ready."""
+    worker = CohortStats(state_dir=state_dir)
+    barrier.wait()
+    for i in range(300):
+        worker.record(score, question_id=f"q{i % 3}")
+    worker.flush()
+
+
+@pytest.mark.unit
+class TestCohortStats:
+    """Test suite for ScoreHistogram and CohortStats."""
+
+    def test_histogram_percentiles_and_position(self):
+        """Percentiles and ranks match the sorted scores."""
+        histogram = ScoreHistogram()
+        for score in [1, 2, 2, 3, 3, 3, 4, 4, 5, 5]:
+            histogram.add(score)
+
+        stats = histogram.to_dict()
+
+        assert stats["count"] == 10
+        assert stats["mean"] == 3.2
+        assert stats["percentiles"] == {"p10": 1, "p25": 2, "p50": 3, "p75": 4, "p90": 5}
+        assert histogram.position(4) == {"score": 4, "rank_best": 3, "rank_worst": 4, "percentile_rank": 70.0}
+        assert histogram.position(5)["rank_best"] == 1
+        with pytest.raises(ValueError):
+            histogram.add(6)
+
+    def test_cohorts_keyed_by_question_and_bounded(self, tmp_path):
+        """Question text is normalized; the least recently updated cohort is evicted."""
+        cohorts = CohortStats(max_cohorts=2, state_dir=str(tmp_path))
+
+        first = cohorts.record(4, question="What is a  closure?")
+        assert cohorts.record(2, question="what is a closure?") == first
+        assert cohorts.record(5, question_id="py-gil") == "py-gil"
+        assert cohorts.record(3) is None
+        cohorts.record(3, question="Explain async IO")
+
+        assert cohorts.get(first) is None
+        assert cohorts.get("py-gil")["count"] == 1
+        assert cohorts.get(cohort_id("Explain async IO"))["question"] == "Explain async IO"
+
+    def test_workers_share_cohorts_across_restarts(self, tmp_path):
+        """Every worker sees the scores all workers recorded, and a restarted worker keeps them."""
+        worker_a = CohortStats(state_dir=str(tmp_path))
+        worker_b = CohortStats(state_dir=str(tmp_path))
+        for score in [1, 3]:
+            worker_a.record(score, question_id="py-decorators")
+        for score in [3, 5]:
+            worker_b.record(score, question_id="py-decorators")
+
+        restarted = CohortStats(state_dir=str(tmp_path))
+
+        assert worker_a.get("py-decorators")["count"] == 4
+        assert worker_a.get("py-decorators") == worker_b.get("py-decorators") == restarted.get("py-decorators")
+        assert CohortStats(state_dir="").get("py-decorators") is None
+
+    def test_concurrent_workers_with_compaction_lose_no_scores(self, tmp_path, monkeypatch):
+        """Scores appended by two processes while the journal is compacted are all counted."""
+        monkeypatch.setattr(cohort_stats_module, "COMPACT_MIN_RECORDS", 20)
+        context = multiprocessing.get_context("fork")
+        barrier = context.Barrier(2)
+        workers = [
+            context.Process(target=record_scores, args=(str(tmp_path), score, barrier))
+            for score in (2, 4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=30)
+            assert process.exitcode == 0
+
+        cohorts = CohortStats(state_dir=str(tmp_path))
+
+        assert [cohorts.get(f"q{i}")["histogram"] for i in range(3)] == [
+            {"1": 0, "2": 100, "3": 0, "4": 100, "5": 0}
+        ] * 3
+        assert len((tmp_path / "cohort_stats.jsonl").read_text().splitlines()) < 600
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_ranking_histogram_follows_inserts_and_removals(self):
+        """A stored ranking's histogram reflects replaced and removed candidates."""
+        ranking = StoredRanking("test")
+        ranking.insert({"id": "a", "score": 2})
+        ranking.insert({"id": "b", "score": 4})
+        ranking.insert({"id": "a", "score": 5})
+        ranking.remove("b")
+
+        assert ranking.histogram.count == 1
+        assert ranking.histogram.counts == [0, 0, 0, 0, 1]
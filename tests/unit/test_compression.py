@@ -0,0 +1,104 @@
+"""
+Unit tests for response compression and conditional responses.
+"""
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.middleware import compression
+from src.middleware.compression import CompressionMiddleware, negotiate_encoding
+from src.utils.http_caching import etag_matches
+
+LARGE_BODY = "candidate summary " * 200
+
+
+def build_client(minimum_size=500):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_BODY, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(5):
+                yield b"chunk " * 10
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+@pytest.mark.unit
+class TestCompression:
+    """Test suite for CompressionMiddleware."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip;q=0.9", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("identity", None),
+        ("", None),
+        ("gzip;q=0", None),
+    ])
+    def test_negotiation(self, header, expected):
+        """Test the client's weights decide, with brotli preferred on ties."""
+        assert negotiate_encoding(header) == expected
+
+    def test_gzip_only_without_brotli(self, monkeypatch):
+        """Test brotli is never chosen when the package is missing."""
+        monkeypatch.setattr(compression, "brotli", None)
+        assert negotiate_encoding("br") is None
+        assert negotiate_encoding("br, gzip") == "gzip"
+
+    def test_large_body_compressed_and_etag_weakened(self):
+        """Test bodies above the threshold are compressed with a weak ETag."""
+        response = build_client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == 'W/"abc"'
+        assert int(response.headers["content-length"]) < len(LARGE_BODY)
+        assert response.text == LARGE_BODY
+
+    def test_brotli_round_trip(self):
+        """Test brotli-encoded responses decode to the original body."""
+        pytest.importorskip("brotli")
+        response = build_client().get("/large", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.text == LARGE_BODY
+
+    def test_small_body_untouched(self):
+        """Test bodies below the threshold are sent as-is."""
+        response = build_client().get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "tiny"
+
+    def test_streamed_body_compressed_incrementally(self):
+        """Test streaming responses are compressed chunk by chunk."""
+        with build_client().stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw) == b"chunk " * 50
+
+    @pytest.mark.parametrize("header, matches", [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"other"', False),
+        (None, False),
+    ])
+    def test_etag_weak_comparison(self, header, matches):
+        """Test If-None-Match uses weak comparison and lists."""
+        assert etag_matches(header, '"abc"') is matches
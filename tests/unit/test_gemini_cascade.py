@@ -0,0 +1,130 @@
+"""
+Unit tests for the Gemini model cascade.
+"""
+import json
+import pytest
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.services.gemini_service import GeminiService
+from src.services.providers import EvaluationProvider, ProviderRegistry, ProviderResponse
+
+
+class ScriptedProvider(EvaluationProvider):
+    """Provider answering with a fixed payload (or error) per model name."""
+
+    name = "scripted"
+
+    def __init__(self):
+        self.responses = {}
+        self.prompts = {}
+
+    async def generate(self, prompt, model, max_output_tokens, temperature=0.3):
+        self.prompts.setdefault(model, []).append(prompt)
+        response = self.responses[model]
+        if isinstance(response, Exception):
+            raise response
+        return ProviderResponse(text=json.dumps(response), model=model, provider=self.name)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Scripted provider selected as the evaluation provider."""
+    monkeypatch.setattr(settings, "EVALUATION_PROVIDER", "scripted")
+    monkeypatch.setattr(settings, "PROVIDER_FALLBACKS", "")
+    return ScriptedProvider()
+
+
+@pytest.fixture
+def cascade_service(monkeypatch, provider):
+    """Model service with cascade mode on and metrics reset."""
+    monkeypatch.setattr(settings, "CASCADE_ENABLED", True)
+    monkeypatch.setattr(settings, "CASCADE_BORDERLINE_SCORES", "3")
+    monkeypatch.setattr(settings, "CASCADE_MIN_CONFIDENCE", 0.7)
+    metrics.reset()
+    return GeminiService(providers=ProviderRegistry({"scripted": lambda: provider}))
+
+
+@pytest.mark.unit
+class TestGeminiCascade:
+    """Test suite for cascade mode."""
+    
+    @pytest.mark.asyncio
+    async def test_confident_fast_result_is_accepted(self, cascade_service, provider):
+        """Test a clear, confident fast-tier score is returned without escalation."""
+        provider.responses[settings.CASCADE_FAST_MODEL] = {
+            "score": 5, "summary": "Great", "improvement": "None", "confidence": 0.95
+        }
+        provider.responses[settings.GEMINI_MODEL] = {"score": 4, "summary": "S", "improvement": "I"}
+        
+        result = await cascade_service.evaluate_answer("Answer")
+        
+        assert result["score"] == 5
+        assert result["tier"] == "fast"
+        assert result["model"] == settings.CASCADE_FAST_MODEL
+        assert result["provider"] == "scripted"
+        assert settings.GEMINI_MODEL not in provider.prompts
+        assert "confidence" in provider.prompts[settings.CASCADE_FAST_MODEL][0]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fast_payload, reason", [
+        ({"score": 3, "summary": "OK", "improvement": "More", "confidence": 0.99}, "borderline_score"),
+        ({"score": 5, "summary": "OK", "improvement": "More", "confidence": 0.4}, "low_confidence"),
+        ({"score": 5, "summary": "OK", "improvement": "More"}, "missing_confidence"),
+    ])
+    async def test_uncertain_results_escalate(self, cascade_service, provider, fast_payload, reason):
+        """Test borderline or low-confidence fast results are re-scored by the main model."""
+        provider.responses[settings.CASCADE_FAST_MODEL] = fast_payload
+        provider.responses[settings.GEMINI_MODEL] = {"score": 4, "summary": "Solid", "improvement": "Examples"}
+        
+        result = await cascade_service.evaluate_answer("Answer")
+        
+        assert result["score"] == 4
+        assert result["tier"] == "strong"
+        assert result["escalation_reason"] == reason
+        assert result["model"] == settings.GEMINI_MODEL
+        assert metrics.counter_value("cascade_escalations", labels={"reason": reason}) == 1
+    
+    @pytest.mark.asyncio
+    async def test_fast_tier_error_escalates(self, cascade_service, provider):
+        """Test a failing fast tier falls through to the main model."""
+        provider.responses[settings.CASCADE_FAST_MODEL] = Exception("quota")
+        provider.responses[settings.GEMINI_MODEL] = {"score": 2, "summary": "Weak", "improvement": "Study"}
+        
+        result = await cascade_service.evaluate_answer("Answer")
+        
+        assert result["tier"] == "strong"
+        assert result["escalation_reason"] == "fast_tier_error"
+    
+    @pytest.mark.asyncio
+    async def test_escalation_rate_in_metrics(self, cascade_service, provider):
+        """Test the metrics snapshot reports tier counts and escalation rate."""
+        provider.responses[settings.GEMINI_MODEL] = {"score": 4, "summary": "S", "improvement": "I"}
+        provider.responses[settings.CASCADE_FAST_MODEL] = {
+            "score": 5, "summary": "S", "improvement": "I", "confidence": 0.9
+        }
+        await cascade_service.evaluate_answer("First")
+        provider.responses[settings.CASCADE_FAST_MODEL] = {
+            "score": 3, "summary": "S", "improvement": "I", "confidence": 0.9
+        }
+        await cascade_service.evaluate_answer("Second")
+        
+        cascade = metrics.snapshot()["collectors"]["cascade"]
+        assert cascade["fast"] == 1
+        assert cascade["strong"] == 1
+        assert cascade["escalation_rate"] == 0.5
+    
+    @pytest.mark.asyncio
+    async def test_cascade_disabled_uses_main_model(self, monkeypatch, provider):
+        """Test the single-model path is unchanged when cascade is off."""
+        monkeypatch.setattr(settings, "CASCADE_ENABLED", False)
+        service = GeminiService(providers=ProviderRegistry({"scripted": lambda: provider}))
+        provider.responses[settings.GEMINI_MODEL] = {
+            "score": 4, "summary": "S", "improvement": "I", "confidence": 0.2
+        }
+        
+        result = await service.evaluate_answer("Answer")
+        
+        assert result["score"] == 4
+        assert "tier" not in result
+        assert settings.CASCADE_FAST_MODEL not in provider.prompts
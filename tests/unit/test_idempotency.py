@@ -0,0 +1,116 @@
+"""
+Unit tests for the idempotency key store.
+"""
+import asyncio
+import pytest
+
+from src.schemas.evaluation import EvaluationRequest
+from src.services.idempotency import IdempotencyKeyReused, IdempotencyStore, request_fingerprint
+
+
+class CountingComputation:
+    """Coroutine factory that counts runs and can be held open."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return {"score": 4, "call": self.calls}
+
+
+@pytest.mark.unit
+class TestIdempotencyStore:
+    """Test suite for IdempotencyStore."""
+
+    @pytest.mark.asyncio
+    async def test_retries_attach_to_in_flight_computation(self):
+        """Concurrent requests with one key share a single computation."""
+        store = IdempotencyStore(ttl_seconds=60, max_keys=10)
+        compute = CountingComputation()
+
+        first = asyncio.ensure_future(store.run("rank", "key-1", "fp", compute))
+        await asyncio.sleep(0)
+        retry = asyncio.ensure_future(store.run("rank", "key-1", "fp", compute))
+        await asyncio.sleep(0)
+        assert store.snapshot() == {"keys": 1, "in_flight": 1}
+
+        compute.release.set()
+        assert await first == ({"score": 4, "call": 1}, False)
+        assert await retry == ({"score": 4, "call": 1}, True)
+
+        replay = await store.run("rank", "key-1", "fp", compute)
+        assert replay == ({"score": 4, "call": 1}, True)
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_work(self):
+        """A disconnecting first caller leaves the computation running for retries."""
+        store = IdempotencyStore(ttl_seconds=60, max_keys=10)
+        compute = CountingComputation()
+
+        first = asyncio.ensure_future(store.run("rank", "key-1", "fp", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        retry = asyncio.ensure_future(store.run("rank", "key-1", "fp", compute))
+        await asyncio.sleep(0)
+        compute.release.set()
+
+        assert (await retry)[0]["call"] == 1
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_stored(self):
+        """A failed computation is forgotten, so the next retry runs again."""
+        store = IdempotencyStore(ttl_seconds=60, max_keys=10)
+        failing = CountingComputation(fail=True)
+        failing.release.set()
+
+        with pytest.raises(RuntimeError):
+            await store.run("rank", "key-1", "fp", failing)
+
+        succeeding = CountingComputation()
+        succeeding.release.set()
+        result, replayed = await store.run("rank", "key-1", "fp", succeeding)
+
+        assert replayed is False
+        assert succeeding.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_and_surplus_keys_are_evicted(self):
+        """Results expire after the TTL and the oldest are dropped at capacity."""
+        compute = CountingComputation()
+        compute.release.set()
+
+        expiring = IdempotencyStore(ttl_seconds=0, max_keys=10)
+        await expiring.run("rank", "key-1", "fp", compute)
+        _, replayed = await expiring.run("rank", "key-1", "fp", compute)
+        assert replayed is False
+
+        bounded = IdempotencyStore(ttl_seconds=60, max_keys=2)
+        for key in ("a", "b", "c"):
+            await bounded.run("rank", key, "fp", compute)
+        assert bounded.snapshot()["keys"] == 2
+        _, replayed = await bounded.run("rank", "a", "fp", compute)
+        assert replayed is False
+
+    @pytest.mark.asyncio
+    async def test_key_reused_with_other_payload_is_rejected(self):
+        """The same key with a different body is a client error, not a replay."""
+        store = IdempotencyStore(ttl_seconds=60, max_keys=10)
+        compute = CountingComputation()
+        compute.release.set()
+        first = request_fingerprint(EvaluationRequest(candidate_answer="First answer text"))
+        second = request_fingerprint(EvaluationRequest(candidate_answer="Second answer text"))
+
+        await store.run("evaluate", "key-1", first, compute)
+        with pytest.raises(IdempotencyKeyReused):
+            await store.run("evaluate", "key-1", second, compute)
+        _, replayed = await store.run("rank", "key-1", second, compute)
+
+        assert replayed is False
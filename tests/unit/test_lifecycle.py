@@ -0,0 +1,117 @@
+"""
+Unit tests for readiness, draining and shutdown state.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import pytest
+
+from src.core.config import settings
+from src.core.lifecycle import Lifecycle
+from src.services.idempotency import IdempotencyStore
+from src.services.tie_break_service import TieBreakService
+
+
+def save_worker_state(state_dir, worker, barrier):
+    """Save a large state from a separate worker process once every worker is ready."""
+    lifecycle = Lifecycle()
+    lifecycle.register_state("judgements", lambda: [[f"{worker}-{i}", True] for i in range(20000)], None)
+    barrier.wait()
+    lifecycle.save(state_dir)
+
+
+@pytest.mark.unit
+class TestLifecycle:
+    """Test suite for Lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_tracked_work(self):
+        """Work finishing within the grace period completes; the rest is cancelled."""
+        lifecycle = Lifecycle()
+        quick = lifecycle.track(asyncio.ensure_future(asyncio.sleep(0.05, result="done")))
+        stuck = lifecycle.track(asyncio.ensure_future(asyncio.sleep(10)))
+
+        summary = await lifecycle.drain(grace_seconds=0.3)
+
+        assert lifecycle.state == "draining"
+        assert quick.result() == "done"
+        assert stuck.cancelled()
+        assert summary == {"requests_in_flight": 0, "tasks_cancelled": 1}
+
+    @pytest.mark.asyncio
+    async def test_state_survives_restart(self, tmp_path):
+        """Stored idempotent results and cached judgements are saved and restored."""
+        before, after = Lifecycle(), Lifecycle()
+        store, restored_store = IdempotencyStore(ttl_seconds=60), IdempotencyStore(ttl_seconds=60)
+        tie_break, restored_tie_break = TieBreakService(), TieBreakService()
+        before.register_state("idempotency", store.export_state, store.import_state)
+        before.register_state("tie_break_cache", tie_break.export_cache, tie_break.import_cache)
+        after.register_state("idempotency", restored_store.export_state, restored_store.import_state)
+        after.register_state("tie_break_cache", restored_tie_break.export_cache, restored_tie_break.import_cache)
+
+        async def compute():
+            return {"score": 4}
+
+        await store.run("evaluate-answer", "key-1", "fp", compute)
+        tie_break._cache_store("answer a", "answer b", a_wins=False)
+        before.save(str(tmp_path))
+        after.restore(str(tmp_path))
+
+        async def must_not_run():
+            raise AssertionError("restored key recomputed")
+
+        result, replayed = await restored_store.run("evaluate-answer", "key-1", "fp", must_not_run)
+        assert (result, replayed) == ({"score": 4}, True)
+        assert restored_tie_break._cache_lookup("answer b", "answer a") is True
+
+    def test_workers_saving_together_keep_every_state(self, tmp_path):
+        """Workers shutting down at once each keep their file; the next start loads all of them."""
+        context = multiprocessing.get_context("fork")
+        barrier = context.Barrier(2)
+        workers = [
+            context.Process(target=save_worker_state, args=(str(tmp_path), worker, barrier))
+            for worker in ("a", "b")
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=30)
+            assert process.exitcode == 0
+
+        restored = {}
+        after = Lifecycle()
+        after.register_state("judgements", lambda: list(restored.items()), lambda saved: restored.update(saved))
+        after.restore(str(tmp_path))
+
+        assert len(restored) == 40000
+        assert restored["a-19999"] is True and restored["b-0"] is True
+        assert len(list(tmp_path.glob("judgements.*.json"))) == 2
+        assert not list(tmp_path.glob(".*.tmp"))
+
+        # The restored worker files are folded into this worker's own file
+        after.save(str(tmp_path))
+        saved_files = list(tmp_path.glob("judgements.*.json"))
+        assert [path.name for path in saved_files] == [f"judgements.{os.getpid()}.json"]
+        assert len(json.loads(saved_files[0].read_text())) == 40000
+
+    @pytest.mark.asyncio
+    async def test_signal_flips_readiness_before_server_shutdown(self, monkeypatch):
+        """The server's handler runs only after the readiness delay."""
+        monkeypatch.setattr(settings, "SHUTDOWN_READINESS_DELAY", 0.1)
+        lifecycle = Lifecycle()
+        handed_over = []
+        original = signal.signal(signal.SIGTERM, lambda signum, frame: handed_over.append(lifecycle.state))
+        try:
+            lifecycle.install_signal_handlers()
+            signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+            await asyncio.sleep(0)
+
+            assert lifecycle.state == "not_ready"
+            assert handed_over == []
+
+            await asyncio.sleep(0.2)
+            assert handed_over == ["draining"]
+        finally:
+            signal.signal(signal.SIGTERM, original)
@@ -0,0 +1,141 @@
+"""
+Unit tests for speculative live-interview evaluation.
+"""
+import asyncio
+import pytest
+
+from src.core.config import settings
+from src.services.live_interview import MAX_DRAFT_CHARS, DraftTooLong, LiveInterviewSession
+
+ANSWER = "A Python decorator is a function that wraps another function to extend its behaviour"
+
+
+class RecordingEvaluator:
+    """Evaluation stub that records the texts it was asked to score."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, candidate_answer, question=None, context=None, question_id=None):
+        self.started.append(candidate_answer)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(candidate_answer)
+            raise
+        return {"score": 4, "summary": f"{len(candidate_answer)} chars", "improvement": "None"}
+
+
+@pytest.fixture
+def fast_debounce(monkeypatch):
+    monkeypatch.setattr(settings, "LIVE_DEBOUNCE_MS", 20)
+    monkeypatch.setattr(settings, "LIVE_MIN_DRAFT_CHARS", 10)
+    monkeypatch.setattr(settings, "LIVE_REUSE_SIMILARITY", 0.95)
+
+
+@pytest.mark.unit
+class TestLiveInterviewSession:
+    """Test suite for LiveInterviewSession."""
+
+    @pytest.mark.asyncio
+    async def test_drafts_are_debounced(self, fast_debounce):
+        """Only the draft the candidate paused on is evaluated."""
+        evaluator = RecordingEvaluator()
+        session = LiveInterviewSession(evaluate=evaluator)
+
+        for end in range(20, len(ANSWER), 10):
+            session.update(ANSWER[:end])
+        session.update(ANSWER)
+        await asyncio.sleep(0.1)
+
+        assert evaluator.started == [ANSWER]
+        session.close()
+
+    @pytest.mark.asyncio
+    async def test_final_answer_reuses_matching_speculation(self, fast_debounce):
+        """A final answer matching the draft is scored without another evaluation."""
+        evaluator = RecordingEvaluator()
+        provisional = []
+
+        async def on_provisional(result, text):
+            provisional.append(text)
+
+        session = LiveInterviewSession(evaluate=evaluator, on_provisional=on_provisional)
+        session.update(ANSWER)
+        await asyncio.sleep(0.1)
+
+        result, details = await session.finalize(ANSWER + ".")
+
+        assert details["outcome"] == "reused"
+        assert result["summary"] == f"{len(ANSWER)} chars"
+        assert evaluator.started == [ANSWER]
+        assert provisional == [ANSWER]
+
+    @pytest.mark.asyncio
+    async def test_final_answer_joins_running_speculation(self, fast_debounce):
+        """A speculation still in flight is awaited rather than repeated."""
+        evaluator = RecordingEvaluator(delay=0.2)
+        session = LiveInterviewSession(evaluate=evaluator)
+        session.update(ANSWER)
+        await asyncio.sleep(0.05)
+
+        _, details = await session.finalize(ANSWER)
+
+        assert details["outcome"] == "joined"
+        assert evaluator.started == [ANSWER]
+
+    @pytest.mark.asyncio
+    async def test_stale_speculation_is_cancelled(self, fast_debounce):
+        """A changed draft cancels the running speculation; a different final answer is scored fresh."""
+        evaluator = RecordingEvaluator(delay=0.2)
+        session = LiveInterviewSession(evaluate=evaluator)
+        rewritten = "Decorators are syntactic sugar for higher-order functions applied at definition time"
+
+        session.update(ANSWER)
+        await asyncio.sleep(0.05)
+        session.update(rewritten)
+        await asyncio.sleep(0.05)
+
+        assert evaluator.cancelled == [ANSWER]
+        assert evaluator.started == [ANSWER, rewritten]
+
+        _, details = await session.finalize("Something else entirely about generators and iterators")
+
+        assert details["outcome"] == "fresh"
+        assert evaluator.cancelled == [ANSWER, rewritten]
+
+    @pytest.mark.asyncio
+    async def test_draft_is_capped(self, fast_debounce):
+        """A draft over the answer length limit is rejected and the previous draft kept."""
+        session = LiveInterviewSession(evaluate=RecordingEvaluator())
+        session.update("a" * (MAX_DRAFT_CHARS - 1))
+        session.append("b")
+
+        with pytest.raises(DraftTooLong):
+            session.append("c")
+        with pytest.raises(DraftTooLong):
+            session.update("d" * (MAX_DRAFT_CHARS + 1))
+
+        assert len(session.draft) == MAX_DRAFT_CHARS
+        session.close()
+
+    @pytest.mark.asyncio
+    async def test_speculation_requires_admission(self, fast_debounce):
+        """Speculations that are not admitted make no model call."""
+        evaluator = RecordingEvaluator()
+        admissions = [True, False]
+
+        async def admit():
+            return admissions.pop(0)
+
+        session = LiveInterviewSession(evaluate=evaluator, admit=admit)
+        session.update(ANSWER)
+        await asyncio.sleep(0.1)
+        session.update("Decorators are syntactic sugar for higher-order functions applied at definition time")
+        await asyncio.sleep(0.1)
+
+        assert evaluator.started == [ANSWER]
+        assert admissions == []
+        session.close()
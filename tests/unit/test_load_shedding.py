@@ -0,0 +1,95 @@
+"""
+Unit tests for load shedding and the scheduler's wait estimate.
+"""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.core.config import settings
+from src.middleware.load_shedding import LoadShedder
+from src.services.scheduler import ModelCallScheduler, current_priority
+
+CLASSES = ["interactive", "batch", "background"]
+
+
+def make_request(path: str) -> Request:
+    return Request({"type": "http", "method": "POST", "path": path, "headers": [], "query_string": b""})
+
+
+async def fill_queue(scheduler, priority, count, release):
+    """Start `count` calls in a class; those beyond the limit stay queued."""
+    async def call():
+        async with scheduler.slot(priority):
+            await release.wait()
+
+    tasks = [asyncio.ensure_future(call()) for _ in range(count)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.fixture
+def targets(monkeypatch):
+    monkeypatch.setattr(settings, "LOAD_SHED_ENABLED", True)
+    monkeypatch.setattr(settings, "LOAD_SHED_TARGETS_MS", "interactive=3000,batch=10000")
+    monkeypatch.setattr(settings, "LOAD_SHED_MAX_RETRY_AFTER", 60)
+
+
+@pytest.mark.unit
+class TestLoadShedding:
+    """Test suite for LoadShedder."""
+
+    @pytest.mark.asyncio
+    async def test_wait_estimate_counts_work_ahead_of_the_class(self):
+        """Only queued calls of the same or a higher class delay a new call."""
+        scheduler = ModelCallScheduler(limit=2, classes=CLASSES)
+        scheduler.hold_time_ms = 1000
+        release = asyncio.Event()
+
+        tasks = await fill_queue(scheduler, "batch", 6, release)
+
+        assert scheduler.estimated_wait_ms("interactive") == 500
+        assert scheduler.estimated_wait_ms("batch") == 2500
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_rejects_with_retry_after_when_target_is_missed(self, targets):
+        """Batch work is shed once the queue is too long while interactive is still admitted."""
+        scheduler = ModelCallScheduler(limit=2, classes=CLASSES)
+        scheduler.hold_time_ms = 2000
+        shedder = LoadShedder(scheduler)
+        release = asyncio.Event()
+        tasks = await fill_queue(scheduler, "batch", 12, release)
+
+        current_priority.set("batch")
+        with pytest.raises(HTTPException) as exc_info:
+            await shedder(make_request("/api/v1/rank-candidates"))
+
+        current_priority.set("interactive")
+        await shedder(make_request("/api/v1/evaluate-answer"))
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        # 10 queued + 1 busy slot: 11 * 2000 / 2 = 11000 ms wait + one 2000 ms call
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "3"
+
+    @pytest.mark.asyncio
+    async def test_admits_without_latency_history_or_target(self, targets):
+        """No estimate before the first call completes, and background has no target."""
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES)
+        shedder = LoadShedder(scheduler)
+        release = asyncio.Event()
+        tasks = await fill_queue(scheduler, "background", 20, release)
+
+        current_priority.set("batch")
+        await shedder(make_request("/api/v1/rank-candidates"))
+
+        scheduler.hold_time_ms = 60000
+        current_priority.set("background")
+        await shedder(make_request("/api/v1/rank-candidates"))
+
+        release.set()
+        await asyncio.gather(*tasks)
@@ -0,0 +1,189 @@
+"""
+Unit tests for the pooled model transport, against a local HTTP stand-in.
+"""
+import asyncio
+import json
+import pytest
+
+from src.core.config import settings
+from src.services.providers import ModelTransport, ProviderError
+from src.services.providers.gemini import GeminiProvider
+
+GEMINI_BODY = {
+    "candidates": [{"content": {"parts": [{"text": '{"score": 4, '}, {"text": '"summary": "S"}'}]}}],
+    "usageMetadata": {"promptTokenCount": 20, "candidatesTokenCount": 8, "totalTokenCount": 28},
+}
+
+
+class StandInServer:
+    """Minimal keep-alive HTTP/1.1 server that counts TCP connections."""
+
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.connections = 0
+        self.requests = []
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+                length = int(headers.get("content-length", headers.get("Content-Length", 0)))
+                body = await reader.readexactly(length) if length else b""
+                self.requests.append({"method": method, "path": path, "headers": headers, "body": body})
+
+                await asyncio.sleep(self.delay)
+                payload = json.dumps(GEMINI_BODY).encode()
+                writer.write(
+                    f"HTTP/1.1 {self.status} X\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\nConnection: keep-alive\r\n\r\n".encode()
+                    + (payload if method != "HEAD" else b"")
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    """Small HTTP/1.1 pool so limits are observable."""
+    monkeypatch.setattr(settings, "MODEL_HTTP2", False)
+    monkeypatch.setattr(settings, "MODEL_HTTP_MAX_CONNECTIONS", 2)
+    monkeypatch.setattr(settings, "MODEL_HTTP_MAX_KEEPALIVE", 2)
+    monkeypatch.setattr(settings, "MODEL_HTTP_WARMUP_CONNECTIONS", 2)
+
+
+@pytest.mark.unit
+class TestModelTransport:
+    """Test suite for ModelTransport."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_bounded_by_pool_and_reuses_connections(self, pool_settings):
+        """Concurrent requests share the pool's connections across bursts."""
+        transport = ModelTransport()
+        async with StandInServer(delay=0.02) as server:
+            for _ in range(2):
+                responses = await asyncio.gather(*[
+                    transport.post(f"{server.url}/generate", json={"n": i}) for i in range(10)
+                ])
+                assert all(response.status_code == 200 for response in responses)
+
+            snapshot = transport.snapshot()
+            await transport.close()
+
+        assert server.connections == 2
+        assert snapshot["requests"] == 20
+        assert snapshot["peak_in_flight"] == 10
+        assert snapshot["in_flight"] == 0
+        assert snapshot["connections"]["open"] == 2
+        assert snapshot["connections"]["idle"] == 2
+        assert snapshot["utilization"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_queued_requests_visible_during_burst(self, pool_settings):
+        """Requests beyond the connection limit wait in the pool queue."""
+        transport = ModelTransport()
+        async with StandInServer(delay=0.1) as server:
+            burst = asyncio.gather(*[transport.post(f"{server.url}/generate") for _ in range(5)])
+            await asyncio.sleep(0.05)
+            during = transport.snapshot()
+            await burst
+            await transport.close()
+
+        assert during["in_flight"] == 5
+        assert during["connections"]["queued"] == 3
+        assert during["utilization"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_warmup_opens_connections_before_traffic(self, pool_settings):
+        """Startup warm-up leaves pooled connections that the first requests reuse."""
+        transport = ModelTransport()
+        async with StandInServer() as server:
+            await transport.start([server.url, server.url])
+            warmed = transport.pool_stats()
+
+            await asyncio.gather(*[transport.post(f"{server.url}/generate") for _ in range(2)])
+            await transport.close()
+
+        assert warmed["open"] == 2
+        assert server.connections == 2
+        assert [request["method"] for request in server.requests[:2]] == ["HEAD", "HEAD"]
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_unavailable_falls_back(self, pool_settings, monkeypatch):
+        """An unreadable pool is reported as unavailable, not as an empty pool."""
+        transport = ModelTransport()
+        monkeypatch.setattr(transport.client._transport, "_pool", object())
+        transport.in_flight = 1
+
+        snapshot = transport.snapshot()
+        monkeypatch.undo()
+        await transport.close()
+
+        assert snapshot["connections"] is None
+        assert snapshot["utilization"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_warmup_failure_does_not_raise(self, pool_settings):
+        """An unreachable origin is logged, not fatal."""
+        transport = ModelTransport()
+        await transport.start(["http://127.0.0.1:9"])
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_gemini_rest_call_over_pool(self, pool_settings, monkeypatch):
+        """The Gemini provider speaks generateContent through the shared pool."""
+        monkeypatch.setattr(settings, "GEMINI_TRANSPORT", "http")
+        transport = ModelTransport()
+        async with StandInServer() as server:
+            base_url = f"{server.url}/v1beta"
+            monkeypatch.setattr(settings, "GEMINI_API_BASE_URL", base_url)
+            provider = GeminiProvider(transport=transport)
+
+            response = await provider.generate("Prompt", model="gemini-test", max_output_tokens=128)
+            await transport.close()
+
+        request = server.requests[0]
+        body = json.loads(request["body"])
+        assert request["path"] == "/v1beta/models/gemini-test:generateContent"
+        assert request["headers"]["x-goog-api-key"] == settings.GEMINI_API_KEY
+        assert body["contents"][0]["parts"][0]["text"] == "Prompt"
+        assert body["generationConfig"]["maxOutputTokens"] == 128
+        assert response.text == '{"score": 4, "summary": "S"}'
+        assert response.usage == {"prompt_tokens": 20, "output_tokens": 8, "total_tokens": 28}
+        assert provider.warmup_url == base_url
+
+    @pytest.mark.asyncio
+    async def test_gemini_rate_limit_maps_to_provider_error(self, pool_settings, monkeypatch):
+        """A 429 from the API becomes a rate_limited ProviderError."""
+        monkeypatch.setattr(settings, "GEMINI_TRANSPORT", "http")
+        transport = ModelTransport()
+        async with StandInServer(status=429) as server:
+            monkeypatch.setattr(settings, "GEMINI_API_BASE_URL", server.url)
+            provider = GeminiProvider(transport=transport)
+
+            with pytest.raises(ProviderError) as exc_info:
+                await provider.generate("Prompt", model="gemini-test", max_output_tokens=128)
+            await transport.close()
+
+        assert exc_info.value.is_rate_limited
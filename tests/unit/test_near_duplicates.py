@@ -0,0 +1,83 @@
+"""
+Unit tests for near-duplicate detection.
+"""
+import pytest
+
+from src.utils.near_duplicates import (
+    NearDuplicateIndex,
+    cluster_near_duplicates,
+    similarity,
+    simhash,
+)
+
+TEMPLATE_ANSWER = (
+    "Python is a high-level, interpreted programming language with dynamic typing, "
+    "automatic memory management and a large standard library used for web "
+    "development, data science, scripting and automation across many industries."
+)
+
+
+@pytest.mark.unit
+class TestSimHash:
+    """Test suite for SimHash fingerprints."""
+
+    def test_identical_after_normalization(self):
+        """Case, punctuation and whitespace differences do not matter."""
+        noisy = "  " + TEMPLATE_ANSWER.upper().replace(", ", " ;  ") + "!!"
+        assert simhash(TEMPLATE_ANSWER) == simhash(noisy)
+        assert similarity(simhash(TEMPLATE_ANSWER), simhash(noisy)) == 1.0
+
+    def test_small_edit_is_similar(self):
+        """A one-word edit keeps the fingerprints close."""
+        edited = TEMPLATE_ANSWER.replace("many industries", "several industries")
+        score = similarity(simhash(TEMPLATE_ANSWER), simhash(edited))
+        assert score >= 0.85
+
+    def test_different_answers_are_dissimilar(self):
+        """Unrelated answers are far apart."""
+        other = "A list is mutable while a tuple is immutable, so tuples can be dictionary keys."
+        assert similarity(simhash(TEMPLATE_ANSWER), simhash(other)) < 0.8
+
+
+@pytest.mark.unit
+class TestClustering:
+    """Test suite for near-duplicate clustering."""
+
+    def test_cluster_groups_copies_under_first_occurrence(self):
+        """Copies join the first matching answer's cluster."""
+        clusters = cluster_near_duplicates(
+            [
+                ("c1", TEMPLATE_ANSWER),
+                ("c2", "Tuples are immutable sequences; lists are mutable."),
+                ("c3", TEMPLATE_ANSWER.upper()),
+            ],
+            threshold=0.95
+        )
+
+        assert list(clusters) == ["c1", "c2"]
+        assert [member for member, _ in clusters["c1"]] == ["c1", "c3"]
+        assert clusters["c2"] == [("c2", 1.0)]
+
+    def test_threshold_one_requires_exact_fingerprint(self):
+        """A threshold of 1.0 only merges identical fingerprints."""
+        edited = TEMPLATE_ANSWER.replace("many industries", "several industries")
+        clusters = cluster_near_duplicates(
+            [("a", TEMPLATE_ANSWER), ("b", edited)],
+            threshold=1.0
+        )
+        assert len(clusters) == 2
+
+    def test_invalid_threshold(self):
+        """Thresholds outside (0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(0.0)
+
+    def test_index_find_or_add(self):
+        """The index returns the stored representative for a near-copy."""
+        index = NearDuplicateIndex(0.9)
+
+        assert index.find_or_add("first", TEMPLATE_ANSWER) == ("first", 1.0)
+        representative, score = index.find_or_add("second", TEMPLATE_ANSWER + " ")
+        assert representative == "first"
+        assert score == 1.0
+        assert len(index) == 1
@@ -0,0 +1,161 @@
+"""
+Unit tests for model providers and the provider registry.
+"""
+import json
+import pytest
+import httpx
+
+from src.core.config import settings
+from src.services.gemini_service import GeminiService, InvalidAnswerError
+from src.services.providers import EvaluationProvider, ModelTransport, ProviderError, ProviderRegistry
+from src.services.providers.fake import FakeProvider
+from src.services.providers.openai_compatible import OpenAICompatibleProvider
+
+
+class FailingProvider(EvaluationProvider):
+    """Provider that always fails with the given error kind."""
+
+    name = "failing"
+
+    def __init__(self, kind="rate_limited"):
+        self.kind = kind
+        self.calls = 0
+
+    async def generate(self, prompt, model, max_output_tokens, temperature=0.3):
+        self.calls += 1
+        raise ProviderError("boom", status_code=429 if self.kind == "rate_limited" else None, kind=self.kind)
+
+
+@pytest.fixture
+def fallback_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_FALLBACKS", "fake")
+    monkeypatch.setattr(settings, "PROVIDER_UNHEALTHY_AFTER", 2)
+    monkeypatch.setattr(settings, "PROVIDER_COOLDOWN_SECONDS", 60.0)
+
+
+@pytest.mark.unit
+class TestProviders:
+    """Test suite for providers and routing."""
+
+    @pytest.mark.asyncio
+    async def test_fake_provider_drives_evaluation_and_comparison(self):
+        """The fake provider's responses parse through the normal service path."""
+        service = GeminiService(providers=ProviderRegistry({"fake": FakeProvider}))
+
+        evaluation = await service.evaluate_answer("word " * 50, provider="fake")
+        winners = await service.compare_answers(
+            [("short", "a much longer answer"), ("long answer here", "tiny")], provider="fake"
+        )
+
+        assert 1 <= evaluation["score"] <= 5
+        assert evaluation["provider"] == "fake"
+        assert winners == ["B", "A"]
+
+    @pytest.mark.asyncio
+    async def test_failure_falls_back_and_records_stats(self, fallback_settings):
+        """A failing provider falls through to the fallback and is tracked."""
+        failing = FailingProvider()
+        registry = ProviderRegistry({"failing": lambda: failing, "fake": FakeProvider})
+
+        response = await registry.generate("prompt", provider="failing", model="m", max_output_tokens=10)
+
+        assert response.provider == "fake"
+        stats = registry.snapshot()
+        assert stats["failing"]["errors"] == 1
+        assert stats["failing"]["last_error_kind"] == "rate_limited"
+        assert stats["fake"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_provider_is_routed_around(self, fallback_settings):
+        """After repeated failures the primary is skipped until its cooldown ends."""
+        failing = FailingProvider(kind="unavailable")
+        registry = ProviderRegistry({"failing": lambda: failing, "fake": FakeProvider})
+
+        for _ in range(3):
+            await registry.generate("prompt", provider="failing", model="m", max_output_tokens=10)
+
+        assert failing.calls == 2
+        assert registry.route("failing") == ["fake", "failing"]
+        assert registry.snapshot()["failing"]["healthy"] is False
+
+    @pytest.mark.asyncio
+    async def test_last_error_raised_without_fallback(self, monkeypatch):
+        """With no fallback configured the provider error propagates."""
+        monkeypatch.setattr(settings, "PROVIDER_FALLBACKS", "")
+        registry = ProviderRegistry({"failing": FailingProvider})
+
+        with pytest.raises(ProviderError) as exc_info:
+            await registry.generate("prompt", provider="failing", model="m", max_output_tokens=10)
+
+        assert exc_info.value.is_rate_limited
+
+    @pytest.mark.asyncio
+    async def test_rejected_request_is_an_invalid_answer(self, monkeypatch):
+        """A request the provider rejects surfaces as a client error and keeps the provider healthy."""
+        monkeypatch.setattr(settings, "PROVIDER_FALLBACKS", "")
+        failing = FailingProvider(kind="invalid_request")
+        registry = ProviderRegistry({"failing": lambda: failing})
+        service = GeminiService(providers=registry)
+
+        with pytest.raises(InvalidAnswerError):
+            await service.evaluate_answer("An answer", provider="failing")
+
+        stats = registry.snapshot()["failing"]
+        assert stats["errors"] == 0
+        assert stats["healthy"] is True
+
+    @pytest.mark.asyncio
+    async def test_rejected_request_is_not_retried_on_fallback(self, fallback_settings):
+        """A request the provider rejects is raised without trying the fallback."""
+        failing = FailingProvider(kind="invalid_request")
+        fallback = FakeProvider()
+        registry = ProviderRegistry({"failing": lambda: failing, "fake": lambda: fallback})
+
+        with pytest.raises(ProviderError) as exc_info:
+            await registry.generate("prompt", provider="failing", model="m", max_output_tokens=10)
+
+        assert exc_info.value.is_invalid_request
+        assert failing.calls == 1
+        assert registry.snapshot()["fake"]["calls"] == 0
+
+    def test_unknown_provider(self):
+        """Unknown provider names are rejected with the available options."""
+        with pytest.raises(ValueError, match="Unknown provider"):
+            ProviderRegistry({"fake": FakeProvider}).get("missing")
+
+    @pytest.mark.asyncio
+    async def test_openai_compatible_request_and_errors(self, monkeypatch):
+        """The OpenAI-compatible provider speaks chat completions and maps 429s."""
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            if len(requests) > 2:
+                return httpx.Response(400, json={"error": "context too long"})
+            if len(requests) > 1:
+                return httpx.Response(429, json={"error": "slow down"})
+            return httpx.Response(200, json={
+                "model": "local-model",
+                "choices": [{"message": {"content": '{"score": 4}'}}],
+                "usage": {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17}
+            })
+
+        monkeypatch.setattr(settings, "OPENAI_COMPAT_BASE_URL", "http://llm.local/v1/")
+        transport = ModelTransport(httpx.MockTransport(handler))
+        provider = OpenAICompatibleProvider(transport=transport)
+
+        response = await provider.generate("Rate this", model="ignored", max_output_tokens=64)
+        with pytest.raises(ProviderError) as exc_info:
+            await provider.generate("Rate this", model="ignored", max_output_tokens=64)
+        with pytest.raises(ProviderError) as rejected:
+            await provider.generate("Rate this", model="ignored", max_output_tokens=64)
+        await transport.close()
+
+        assert response.text == '{"score": 4}'
+        assert response.model == "local-model"
+        assert response.usage["total_tokens"] == 17
+        assert requests[0]["messages"] == [{"role": "user", "content": "Rate this"}]
+        assert requests[0]["max_tokens"] == 64
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.kind == "rate_limited"
+        assert rejected.value.is_invalid_request
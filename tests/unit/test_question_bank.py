@@ -0,0 +1,68 @@
+"""
+Unit tests for the question bank and evaluation prompt prefixes.
+"""
+import json
+import pytest
+
+from src.services.gemini_service import PROMPT_PREFIX_CACHE_SIZE, GeminiService, gemini_service
+from src.services.question_bank import QuestionBank, UnknownQuestion
+
+
+@pytest.mark.unit
+class TestQuestionBank:
+    """Test suite for QuestionBank."""
+    
+    def test_loads_questions_with_compiled_prefix(self, tmp_path):
+        """Bank questions carry the prompt prefix that evaluations of them use."""
+        path = tmp_path / "bank.json"
+        path.write_text(json.dumps({
+            "py-decorators": {
+                "question": "What is a Python decorator?",
+                "context": "Mid-level backend interview",
+                "rubric": ["Mentions wrapping a function", "Gives a use case"]
+            }
+        }))
+        bank = QuestionBank(str(path))
+        
+        entry = bank.require("py-decorators")
+        prompt = gemini_service._build_evaluation_prompt(
+            "It wraps a function.", entry.question, entry.context, rubric=entry.rubric
+        )
+        
+        assert len(bank) == 1
+        assert entry.rubric == "- Mentions wrapping a function\n- Gives a use case"
+        assert prompt == entry.prompt_prefix + 'Candidate\'s Answer: "It wraps a function."'
+        assert "Question Asked: What is a Python decorator?" in entry.prompt_prefix
+        with pytest.raises(UnknownQuestion):
+            bank.require("missing")
+    
+    def test_prompt_prefix_is_interned_and_answer_comes_last(self):
+        """Repeated questions reuse one prefix string; only the answer differs."""
+        service = GeminiService()
+        
+        first = service._build_evaluation_prompt("First answer", "What is Python?")
+        second = service._build_evaluation_prompt("Second answer", "What is Python?")
+        prefix = service.evaluation_prompt_prefix("What is Python?")
+        
+        assert service.evaluation_prompt_prefix("What is Python?") is prefix
+        assert first.startswith(prefix) and second.startswith(prefix)
+        assert first.endswith('"First answer"')
+    
+    def test_bank_prefixes_survive_prefix_cache_churn(self):
+        """Evaluations of bank questions use the pinned prefix however many other questions are seen."""
+        bank = QuestionBank("")
+        entry = bank.register("py-gil", "What is the GIL?", rubric=["Mentions threads"])
+        replaced = bank.register("py-async", "What is asyncio?")
+        bank.register("py-async", "What is an event loop?")
+        
+        for n in range(PROMPT_PREFIX_CACHE_SIZE + 10):
+            gemini_service.evaluation_prompt_prefix(f"Unrelated question {n}")
+        prompt = gemini_service._build_evaluation_prompt(
+            "It serializes bytecode execution.", entry.question, entry.context, rubric=entry.rubric
+        )
+        
+        assert gemini_service.evaluation_prompt_prefix(entry.question, entry.context, entry.rubric) is entry.prompt_prefix
+        assert prompt.startswith(entry.prompt_prefix)
+        assert (replaced.question, None, None, False) not in gemini_service._pinned_prefixes
+        gemini_service.unpin_question_prefix(entry.question, entry.context, entry.rubric)
+        gemini_service.unpin_question_prefix("What is an event loop?")
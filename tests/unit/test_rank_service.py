@@ -1,6 +1,7 @@
 """
 Unit tests for ranking service.
 """
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
 from src.services.ranking_service import RankingService
@@ -95,3 +96,97 @@ class TestRankingService:
         assert ranked[0]["rank"] == 1
         assert ranked[1]["id"] == "c1"  # c1 before c3 (alphabetical)
         assert ranked[2]["id"] == "c3"
+    
+    @pytest.mark.asyncio
+    async def test_rank_candidates_reuses_near_duplicate_evaluations(self):
+        """Test near-duplicate answers are evaluated once and fanned out."""
+        service = RankingService()
+        template = (
+            "A Python decorator is a function that takes another function and "
+            "extends its behaviour without modifying it, commonly used for logging."
+        )
+        
+        with patch.object(
+            service.gemini,
+            'evaluate_answer',
+            new_callable=AsyncMock,
+            return_value={"score": 4, "summary": "Good", "improvement": "Add example"}
+        ) as mock_evaluate:
+            result = await service.rank_candidates([
+                {"id": "c1", "answer": template},
+                {"id": "c2", "answer": "Decorators wrap functions."},
+                {"id": "c3", "answer": template.lower(), "metadata": {"name": "Copy"}}
+            ])
+        
+        assert mock_evaluate.await_count == 2
+        assert result["total_candidates"] == 3
+        assert result["metadata"]["evaluations_saved"] == 1
+        assert result["metadata"]["duplicate_clusters"] == [
+            {"representative": "c1", "members": ["c1", "c3"], "min_similarity": 1.0}
+        ]
+        
+        copy = next(c for c in result["ranked_candidates"] if c["id"] == "c3")
+        assert copy["duplicate_of"] == "c1"
+        assert copy["score"] == 4
+        assert copy["metadata"] == {"name": "Copy"}
+    
+    @pytest.mark.asyncio
+    async def test_reference_similarity_breaks_score_ties(self):
+        """Test equal scores are ordered by similarity to the reference answers."""
+        service = RankingService()
+        
+        with patch.object(
+            service.gemini,
+            'evaluate_answer',
+            new_callable=AsyncMock,
+            return_value={"score": 4, "summary": "Good", "improvement": "Add example"}
+        ):
+            result = await service.rank_candidates(
+                [
+                    {"id": "a", "answer": "Lists are sequences."},
+                    {"id": "b", "answer": "Tuples are immutable while lists are mutable sequences."}
+                ],
+                reference_answers=["Lists are mutable; tuples are immutable sequences."]
+            )
+        
+        ranked = result["ranked_candidates"]
+        assert [candidate["id"] for candidate in ranked] == ["b", "a"]
+        assert ranked[0]["reference_similarity"] > ranked[1]["reference_similarity"]
+        assert result["metadata"]["reference_similarity"]["references"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_deadline_returns_pending_and_fills_cache(self):
+        """Test slow evaluations are reported as pending and reused once finished."""
+        service = RankingService()
+        slow_done = asyncio.Event()
+        
+        async def mock_eval(candidate_answer, **kwargs):
+            if candidate_answer == "Slow answer":
+                await asyncio.sleep(0.3)
+                slow_done.set()
+                return {"score": 5, "summary": "Thorough", "improvement": "None"}
+            return {"score": 3, "summary": "Basic", "improvement": "Add depth"}
+        
+        candidates = [
+            {"id": "fast", "answer": "Fast answer"},
+            {"id": "slow", "answer": "Slow answer"}
+        ]
+        with patch.object(
+            service.gemini,
+            'evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_eval
+        ) as mock_evaluate:
+            partial = await service.rank_candidates(candidates, deadline_ms=100)
+            await slow_done.wait()
+            complete = await service.rank_candidates(candidates, deadline_ms=100)
+        
+        assert partial["partial"] is True
+        assert [c["id"] for c in partial["ranked_candidates"]] == ["fast"]
+        assert partial["pending_candidates"] == [{"id": "slow", "duplicate_of": None}]
+        assert partial["total_candidates"] == 2
+        
+        assert complete["partial"] is False
+        assert [c["id"] for c in complete["ranked_candidates"]] == ["slow", "fast"]
+        assert complete["metadata"]["cached_evaluations"] == 2
+        assert mock_evaluate.await_count == 2
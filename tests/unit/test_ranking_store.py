@@ -0,0 +1,192 @@
+"""
+Unit tests for the named ranking store.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.services.ranking_service import RankingService
+from src.services.ranking_store import RankingStore, StoredRanking
+
+
+def entry(candidate_id, score):
+    return {"id": candidate_id, "score": score, "summary": "S", "improvement": "I", "metadata": None}
+
+
+@pytest.mark.unit
+class TestStoredRanking:
+    """Test suite for the sorted ranking index."""
+    
+    def test_insert_remove_and_page(self):
+        """Test the index stays ordered through inserts, replacements and removals."""
+        ranking = StoredRanking("pool")
+        for candidate_id, score in [("c1", 3), ("c2", 5), ("c3", 3), ("c4", 1)]:
+            ranking.insert(entry(candidate_id, score))
+        
+        assert [e["id"] for e in ranking.page(0, 10)] == ["c2", "c1", "c3", "c4"]
+        assert ranking.rank_of("c3") == 3
+        
+        ranking.insert(entry("c4", 4))
+        ranking.remove("c2")
+        
+        page = ranking.page(1, 2)
+        assert [(e["id"], e["rank"]) for e in page] == [("c1", 2), ("c3", 3)]
+        assert ranking.rank_of("c4") == 1
+        assert ranking.rank_of("c2") is None
+        assert len(ranking) == 3
+
+
+@pytest.mark.unit
+class TestRankingStore:
+    """Test suite for RankingStore persistence."""
+    
+    @pytest.mark.asyncio
+    async def test_journal_round_trip(self, tmp_path):
+        """Test a ranking is restored from its journal by a new store."""
+        store = RankingStore(storage_dir=str(tmp_path))
+        await store.upsert("cohort-1", [entry("c1", 2), entry("c2", 4)])
+        _, replaced = await store.upsert("cohort-1", [entry("c1", 5)])
+        await store.remove("cohort-1", "c2")
+        
+        restored = await RankingStore(storage_dir=str(tmp_path)).get("cohort-1")
+        
+        assert replaced == 1
+        assert [(e["id"], e["score"]) for e in restored.page(0, 10)] == [("c1", 5)]
+        assert RankingStore(storage_dir=str(tmp_path)).list_names() == ["cohort-1"]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_name(self, tmp_path):
+        """Test names that are unsafe as file names are rejected."""
+        store = RankingStore(storage_dir=str(tmp_path))
+        with pytest.raises(ValueError):
+            await store.get("../escape")
+    
+    @pytest.mark.asyncio
+    async def test_delete(self, tmp_path):
+        """Test deleting a ranking removes its journal."""
+        store = RankingStore(storage_dir=str(tmp_path))
+        await store.upsert("temp", [entry("c1", 3)])
+        
+        assert await store.delete("temp") is True
+        assert await store.get("temp") is None
+        assert list(tmp_path.iterdir()) == []
+    
+    @pytest.mark.asyncio
+    async def test_stores_sharing_a_directory_stay_in_sync(self, tmp_path):
+        """Test each worker's store sees the others' appends, compactions and deletes."""
+        worker_a = RankingStore(storage_dir=str(tmp_path))
+        worker_b = RankingStore(storage_dir=str(tmp_path))
+        await worker_a.upsert("shared", [entry("c1", 2)])
+        await worker_b.get("shared")
+        
+        await worker_b.upsert("shared", [entry("c2", 4)])
+        await worker_a.upsert("shared", [entry("c3", 3)])
+        assert [e["id"] for e in (await worker_a.get("shared")).page(0, 10)] == ["c2", "c3", "c1"]
+        assert [e["id"] for e in (await worker_b.get("shared")).page(0, 10)] == ["c2", "c3", "c1"]
+        
+        assert await worker_b.remove("shared", "c1") is True
+        assert await worker_a.remove("shared", "c1") is False
+        
+        for _ in range(60):
+            await worker_a.upsert("shared", [entry("c2", 1), entry("c2", 4)])
+        worker_c = RankingStore(storage_dir=str(tmp_path))
+        assert len(await worker_c.get("shared")) == 2
+        assert (tmp_path / "shared.jsonl").read_text().count('"op": "upsert"') == 2
+        ranking_b = await worker_b.get("shared")
+        assert [(e["id"], e["score"]) for e in ranking_b.page(0, 10)] == [("c2", 4), ("c3", 3)]
+        
+        await worker_b.delete("shared")
+        assert await worker_a.get("shared") is None
+        assert worker_a.list_names() == []
+    
+    @pytest.mark.asyncio
+    async def test_upsert_after_delete_starts_from_empty(self, tmp_path):
+        """Test a ranking deleted while candidates were evaluated is not revived with stale rows."""
+        store = RankingStore(storage_dir=str(tmp_path))
+        other_worker = RankingStore(storage_dir=str(tmp_path))
+        stale, _ = await store.upsert("pool", [entry("c1", 3), entry("c2", 4)])
+        await store.upsert("shared", [entry("c1", 3)])
+        
+        # Deleted by this worker and by another one during the evaluations
+        await store.delete("pool")
+        ranking, replaced = await store.upsert("pool", [entry("c1", 5)])
+        await other_worker.delete("shared")
+        revived, _ = await store.upsert("shared", [entry("c4", 2)])
+        
+        assert ranking is not stale
+        assert replaced == 0
+        assert [(e["id"], e["score"]) for e in ranking.page(0, 10)] == [("c1", 5)]
+        assert [e["id"] for e in revived.page(0, 10)] == ["c4"]
+        restored = await RankingStore(storage_dir=str(tmp_path)).get("shared")
+        assert [e["id"] for e in restored.page(0, 10)] == ["c4"]
+    
+    @pytest.mark.asyncio
+    async def test_recreated_journal_with_reused_inode_is_replayed(self, tmp_path):
+        """Test a journal recreated under a reused inode number is not read from the old offset."""
+        worker_a = RankingStore(storage_dir=str(tmp_path))
+        worker_b = RankingStore(storage_dir=str(tmp_path))
+        await worker_a.upsert("pool", [entry("c1", 3)])
+        await worker_b.get("pool")
+        _, old_generation, old_offset = worker_b._positions["pool"]
+        
+        await worker_a.delete("pool")
+        await worker_a.upsert("pool", [entry("c2", 4), entry("c3", 2)])
+        # As if the filesystem had handed the new journal the old file's inode
+        stat = (tmp_path / "pool.jsonl").stat()
+        worker_b._positions["pool"] = ((stat.st_dev, stat.st_ino), old_generation, old_offset)
+        
+        ranking = await worker_b.get("pool")
+        assert [e["id"] for e in ranking.page(0, 10)] == ["c2", "c3"]
+    
+    @pytest.mark.asyncio
+    async def test_waiting_for_the_lock_does_not_block_the_event_loop(self, tmp_path):
+        """Test a worker waiting for another worker's lock keeps running other tasks."""
+        holder = RankingStore(storage_dir=str(tmp_path))
+        waiter = RankingStore(storage_dir=str(tmp_path))
+        ticks = []
+        
+        async def tick():
+            for _ in range(5):
+                ticks.append(len(ticks))
+                await asyncio.sleep(0.005)
+        
+        async with holder._locked("pool"):
+            update = asyncio.create_task(waiter.upsert("pool", [entry("c1", 3)]))
+            await tick()
+            assert not update.done()
+        await update
+        
+        assert len(ticks) == 5
+        assert len(await holder.get("pool")) == 1
+
+
+@pytest.mark.unit
+class TestIncrementalRanking:
+    """Test suite for RankingService.add_to_ranking."""
+    
+    @pytest.mark.asyncio
+    async def test_only_new_candidates_are_evaluated(self, tmp_path):
+        """Test existing candidates are skipped and not re-evaluated."""
+        service = RankingService()
+        store = RankingStore(storage_dir=str(tmp_path))
+        
+        with patch('src.services.ranking_service.ranking_store', store), patch.object(
+            service.gemini,
+            'evaluate_answer',
+            new_callable=AsyncMock,
+            return_value={"score": 3, "summary": "S", "improvement": "I"}
+        ) as mock_evaluate:
+            first = await service.add_to_ranking("pool", [
+                {"id": "c1", "answer": "Generators yield values lazily."},
+                {"id": "c2", "answer": "Decorators wrap functions."}
+            ])
+            second = await service.add_to_ranking("pool", [
+                {"id": "c2", "answer": "Decorators wrap functions."},
+                {"id": "c3", "answer": "Context managers handle setup and teardown."}
+            ])
+        
+        assert first["added"] == 2
+        assert second["added"] == 1
+        assert second["skipped"] == ["c2"]
+        assert second["total_candidates"] == 3
+        assert mock_evaluate.await_count == 3
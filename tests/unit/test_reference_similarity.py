@@ -0,0 +1,85 @@
+"""
+Unit tests for reference-answer similarity indexes.
+"""
+import json
+import time
+import pytest
+
+from src.services.reference_answers import ReferenceAnswerRegistry
+from src.utils.reference_similarity import ReferenceIndex, vectorize
+
+REFERENCES = [
+    "A Python decorator is a function that wraps another function to extend its behaviour.",
+    "Decorators take a callable and return a new callable, often used for logging or caching.",
+]
+
+
+@pytest.mark.unit
+class TestReferenceSimilarity:
+    """Test suite for ReferenceIndex and ReferenceAnswerRegistry."""
+
+    def test_scores_are_bounded_and_ordered(self):
+        """Identical text scores 1, unrelated text 0, partial overlap in between."""
+        index = ReferenceIndex(REFERENCES)
+
+        identical, partial, unrelated, empty = index.score([
+            REFERENCES[0],
+            "A decorator wraps a function.",
+            "Photosynthesis converts sunlight into chemical energy.",
+            "",
+        ])
+
+        assert identical == pytest.approx(1.0, abs=1e-5)
+        assert 0.0 < partial < identical
+        assert unrelated == 0.0
+        assert empty == 0.0
+
+    def test_formatting_does_not_change_score(self):
+        """Case, punctuation and whitespace are ignored."""
+        index = ReferenceIndex(REFERENCES)
+
+        plain, noisy = index.score([
+            "decorators wrap functions",
+            "  Decorators,   WRAP functions!!",
+        ])
+
+        assert plain == pytest.approx(noisy)
+
+    def test_batch_matches_single_scoring(self):
+        """Scoring a batch gives the same values as scoring answers one by one."""
+        index = ReferenceIndex(REFERENCES)
+        answers = ["decorator caching", "", "wraps another function", "logging"]
+
+        batch = index.score(answers)
+
+        assert list(batch) == pytest.approx([index.score([answer])[0] for answer in answers])
+
+    def test_vectors_are_normalized(self):
+        """Each non-empty text vector has unit length."""
+        rows, _, values = vectorize(["one two two three", "four"])
+
+        for row in (0, 1):
+            assert float((values[rows == row] ** 2).sum()) == pytest.approx(1.0, rel=1e-5)
+
+    def test_ten_thousand_answers_in_one_pass(self):
+        """A 10k-answer batch is scored well within a second."""
+        index = ReferenceIndex(REFERENCES)
+        answers = [f"answer {i} uses a decorator to wrap function number {i % 97}" for i in range(10000)]
+
+        start_time = time.perf_counter()
+        scores = index.score(answers)
+        elapsed = time.perf_counter() - start_time
+
+        assert scores.shape == (10000,)
+        assert elapsed < 2.0
+
+    def test_registry_loads_question_bank(self, tmp_path):
+        """Questions from the reference file are matched after normalization."""
+        path = tmp_path / "references.json"
+        path.write_text(json.dumps({"What is a decorator?": REFERENCES, "Empty?": []}))
+        registry = ReferenceAnswerRegistry(str(path))
+
+        assert len(registry) == 1
+        assert registry.get("  what is a   DECORATOR? ") is not None
+        assert registry.resolve(question="Unknown question") is None
+        assert registry.resolve(question="Unknown", references=["inline"]) is registry.resolve(references=["inline"])
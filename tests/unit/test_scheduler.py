@@ -0,0 +1,171 @@
+"""
+Unit tests for the model-call scheduler.
+"""
+import asyncio
+import pytest
+from starlette.requests import Request
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.middleware.priority import identify_client
+from src.services.providers import ProviderRegistry
+from src.services.providers.fake import FakeProvider
+from src.services.scheduler import ClientShare, ModelCallScheduler, current_priority
+
+CLASSES = ["interactive", "batch", "background"]
+
+
+async def hold_slot(scheduler, priority, order, release):
+    """Take a slot, record the grant order and hold it until released."""
+    async with scheduler.slot(priority):
+        order.append(priority)
+        await release.wait()
+
+
+async def client_call(scheduler, client, order, cost=1.0):
+    """Take a batch slot for a client and record the grant order."""
+    async with scheduler.slot("batch", client=client, cost=cost):
+        order.append(client.id)
+        await asyncio.sleep(0)
+
+
+async def queue_behind_blocker(scheduler, calls):
+    """Queue (client, cost) calls behind one held slot, then release it."""
+    release = asyncio.Event()
+    blocker = asyncio.ensure_future(hold_slot(scheduler, "batch", [], release))
+    await asyncio.sleep(0)
+    order = []
+    tasks = []
+    for client, cost in calls:
+        tasks.append(asyncio.ensure_future(client_call(scheduler, client, order, cost)))
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(blocker, *tasks)
+    return order
+
+
+@pytest.mark.unit
+class TestModelCallScheduler:
+    """Test suite for ModelCallScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_higher_classes_are_granted_first(self):
+        """Queued interactive work overtakes batch and background work."""
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=60000)
+        order, release = [], asyncio.Event()
+
+        blocker = asyncio.ensure_future(hold_slot(scheduler, "batch", order, release))
+        await asyncio.sleep(0)
+        queued = []
+        for priority in ("background", "batch", "interactive"):
+            queued.append(asyncio.ensure_future(hold_slot(scheduler, priority, order, release)))
+            await asyncio.sleep(0)
+
+        snapshot = scheduler.snapshot()
+        assert snapshot["in_flight"] == 1
+        assert snapshot["queued"] == {"interactive": 1, "batch": 1, "background": 1}
+        release.set()
+        await asyncio.gather(blocker, *queued)
+
+        assert order == ["batch", "interactive", "batch", "background"]
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_waiting_background_work_is_not_starved(self):
+        """After enough waiting a background call outranks fresh interactive calls."""
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=10)
+        order, release = [], asyncio.Event()
+
+        blocker = asyncio.ensure_future(hold_slot(scheduler, "interactive", order, release))
+        await asyncio.sleep(0)
+        background = asyncio.ensure_future(hold_slot(scheduler, "background", order, release))
+        await asyncio.sleep(0.05)
+        interactive = asyncio.ensure_future(hold_slot(scheduler, "interactive", order, release))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(blocker, background, interactive)
+
+        assert order == ["interactive", "background", "interactive"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        """A caller cancelled while queued does not keep or leak a slot."""
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=1000)
+        order, release = [], asyncio.Event()
+
+        blocker = asyncio.ensure_future(hold_slot(scheduler, "batch", order, release))
+        await asyncio.sleep(0)
+        abandoned = asyncio.ensure_future(hold_slot(scheduler, "interactive", order, release))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await blocker
+
+        assert order == ["batch"]
+        assert scheduler.snapshot()["queued"]["interactive"] == 0
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_registry_calls_wait_in_request_class(self):
+        """Provider calls take the class of the current request and report queue wait."""
+        metrics.reset()
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=1000)
+        registry = ProviderRegistry({"fake": FakeProvider}, scheduler=scheduler)
+
+        current_priority.set("background")
+        await registry.generate("prompt", provider="fake", model="m", max_output_tokens=10)
+        await registry.generate("prompt", provider="fake", model="m", max_output_tokens=10, priority="interactive")
+
+        waits = metrics.snapshot()["summaries"]["model_queue_wait_ms"]
+        assert waits["priority=background"]["count"] == 1
+        assert waits["priority=interactive"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_late_client_is_not_stuck_behind_large_cohort(self):
+        """A second client's calls interleave with a backlog queued before them."""
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=60000)
+        bulk, small = ClientShare("bulk"), ClientShare("small")
+
+        order = await queue_behind_blocker(scheduler, [(bulk, 1.0)] * 6 + [(small, 1.0)] * 2)
+
+        # Without fair queuing "small" would wait for all six "bulk" calls
+        assert order[:4] == ["bulk", "small", "bulk", "small"]
+
+    @pytest.mark.asyncio
+    async def test_weights_and_costs_set_the_share(self):
+        """Slots are shared in proportion to weight, measured in cost rather than calls."""
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=60000)
+        heavy, light = ClientShare("heavy", weight=3.0), ClientShare("light")
+        order = await queue_behind_blocker(scheduler, [(heavy, 1.0)] * 8 + [(light, 1.0)] * 8)
+        assert order[:8].count("heavy") == 6
+
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=60000)
+        big, cheap = ClientShare("big"), ClientShare("cheap")
+        order = await queue_behind_blocker(scheduler, [(big, 40.0)] * 3 + [(cheap, 10.0)] * 8)
+        assert order[:6].count("cheap") == 4
+
+    def test_clients_identified_by_api_key_or_ip(self, monkeypatch):
+        """API keys are digested and weighted; other requests are grouped by IP."""
+        monkeypatch.setattr(settings, "FAIR_QUEUE_WEIGHTS", "secret-key=4,10.0.0.9=0.5")
+
+        def request(headers):
+            return Request({
+                "type": "http",
+                "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+                "client": ("10.0.0.9", 1234),
+            })
+
+        keyed = identify_client(request({"X-API-Key": "secret-key"}))
+        anonymous = identify_client(request({}))
+
+        assert keyed.id.startswith("key-") and "secret" not in keyed.id
+        assert keyed.weight == 4.0
+        assert anonymous == ClientShare("10.0.0.9", 0.5)
+
+    def test_unknown_class_is_rejected(self):
+        """Only configured classes are accepted."""
+        scheduler = ModelCallScheduler(limit=1, classes=CLASSES, aging_ms=1000)
+        with pytest.raises(ValueError, match="Unknown priority class"):
+            scheduler.resolve_priority("urgent")
@@ -0,0 +1,112 @@
+"""
+Unit tests for multi-sample (self-consistency) evaluation.
+"""
+import json
+import pytest
+import httpx
+
+from src.core.config import settings
+from src.services.gemini_service import GeminiService
+from src.services.providers import EvaluationProvider, ModelTransport, ProviderRegistry, ProviderResponse
+from src.services.providers.fake import FakeProvider
+from src.services.providers.gemini import GeminiProvider
+
+
+def sample(score):
+    return json.dumps({"score": score, "summary": f"Rated {score}", "improvement": "More depth"})
+
+
+class SamplingProvider(EvaluationProvider):
+    """Provider returning fixed samples and recording each call's options."""
+
+    name = "sampling"
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = []
+
+    async def generate(self, prompt, model, max_output_tokens, temperature=0.3, candidate_count=1):
+        self.calls.append({"temperature": temperature, "candidate_count": candidate_count})
+        texts = self.texts[:candidate_count]
+        return ProviderResponse(
+            text=texts[0], model=model, provider=self.name, candidates=texts if len(texts) > 1 else []
+        )
+
+
+@pytest.fixture
+def sampling_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_FALLBACKS", "")
+    monkeypatch.setattr(settings, "CASCADE_ENABLED", False)
+    monkeypatch.setattr(settings, "SELF_CONSISTENCY_TEMPERATURE", 0.7)
+
+
+@pytest.mark.unit
+class TestSelfConsistency:
+    """Test suite for sampled evaluations."""
+
+    @pytest.mark.asyncio
+    async def test_samples_drawn_in_one_call_and_aggregated(self, sampling_settings):
+        """One call draws every sample; the median score and agreement are returned."""
+        provider = SamplingProvider([sample(3), sample(4), "not json", sample(4), sample(5)])
+        service = GeminiService(providers=ProviderRegistry({"sampling": lambda: provider}))
+
+        result = await service.evaluate_answer("Answer", provider="sampling", samples=5)
+
+        assert provider.calls == [{"temperature": 0.7, "candidate_count": 5}]
+        assert result["score"] == 4
+        assert result["summary"] == "Rated 4"
+        assert result["self_consistency"] == {
+            "requested": 5,
+            "samples": 4,
+            "unparsed": 1,
+            "scores": [3, 4, 4, 5],
+            "agreement": 0.5,
+            "spread": 2,
+        }
+
+    @pytest.mark.asyncio
+    async def test_single_sample_is_unchanged(self, sampling_settings, monkeypatch):
+        """With one sample the call and result are as before."""
+        monkeypatch.setattr(settings, "SELF_CONSISTENCY_SAMPLES", 1)
+        provider = SamplingProvider([sample(2)])
+        service = GeminiService(providers=ProviderRegistry({"sampling": lambda: provider}))
+
+        result = await service.evaluate_answer("Answer", provider="sampling")
+
+        assert provider.calls == [{"temperature": 0.3, "candidate_count": 1}]
+        assert result["score"] == 2
+        assert "self_consistency" not in result
+
+    @pytest.mark.asyncio
+    async def test_fake_provider_samples(self, sampling_settings):
+        """The fake provider returns the requested number of samples."""
+        service = GeminiService(providers=ProviderRegistry({"fake": FakeProvider}))
+
+        result = await service.evaluate_answer("word " * 50, provider="fake", samples=3)
+
+        assert len(result["self_consistency"]["scores"]) == 3
+        assert result["score"] in result["self_consistency"]["scores"]
+        assert result["usage"]["output_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_gemini_requests_candidate_count(self, monkeypatch):
+        """The Gemini REST call asks for several candidates and returns them all."""
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={"candidates": [
+                {"content": {"parts": [{"text": sample(score)}]}} for score in (4, 3, 4)
+            ]})
+
+        monkeypatch.setattr(settings, "GEMINI_TRANSPORT", "http")
+        monkeypatch.setattr(settings, "GEMINI_API_BASE_URL", "http://gemini.local/v1beta")
+        transport = ModelTransport(httpx.MockTransport(handler))
+        provider = GeminiProvider(transport=transport)
+
+        response = await provider.generate("Prompt", model="gemini-test", max_output_tokens=64, candidate_count=3)
+        await transport.close()
+
+        assert requests[0]["generationConfig"]["candidateCount"] == 3
+        assert response.texts == [sample(4), sample(3), sample(4)]
+        assert response.text == sample(4)
@@ -0,0 +1,73 @@
+"""
+Unit tests for the uvicorn launcher configuration.
+"""
+import pytest
+from unittest.mock import patch
+
+from src.core import server
+from src.core.config import settings
+
+
+@pytest.mark.unit
+class TestServerConfig:
+    """Test suite for build_server_config and helpers."""
+
+    def test_development_config_uses_reload(self):
+        """Development mode is a single auto-reloading process."""
+        config = server.build_server_config(production=False)
+
+        assert config["reload"] is True
+        assert "workers" not in config
+        assert server.resolve_app_target(config) == server.APP_IMPORT_STRING
+
+    def test_production_config_from_settings(self, monkeypatch):
+        """Production mode takes tuning values from settings."""
+        monkeypatch.setattr(settings, "WORKERS", 3)
+        monkeypatch.setattr(settings, "SERVER_LOOP", "asyncio")
+        monkeypatch.setattr(settings, "SERVER_HTTP", "h11")
+        monkeypatch.setattr(settings, "SERVER_BACKLOG", 512)
+        monkeypatch.setattr(settings, "SERVER_KEEPALIVE_TIMEOUT", 15)
+        monkeypatch.setattr(settings, "SERVER_GRACEFUL_TIMEOUT", 20)
+
+        config = server.build_server_config(production=True)
+
+        assert "reload" not in config
+        assert config["workers"] == 3
+        assert config["loop"] == "asyncio"
+        assert config["http"] == "h11"
+        assert config["backlog"] == 512
+        assert config["timeout_keep_alive"] == 15
+        assert config["timeout_graceful_shutdown"] == 20
+        assert "3 worker processes" in server.describe_concurrency(config)
+
+    def test_workers_default_from_cpu_count(self, monkeypatch):
+        """Unset worker count falls back to the CPU count."""
+        monkeypatch.setattr(settings, "WORKERS", 0)
+
+        with patch("src.core.server.os.cpu_count", return_value=6):
+            assert server.resolve_workers() == 6
+
+        with patch("src.core.server.os.cpu_count", return_value=None):
+            assert server.resolve_workers() == 1
+
+    def test_auto_loop_and_http_fall_back(self):
+        """Auto selection falls back when optional accelerators are missing."""
+        with patch("src.core.server.importlib.util.find_spec", return_value=None):
+            assert server.resolve_loop("auto") == "asyncio"
+            assert server.resolve_http("auto") == "h11"
+
+    def test_single_worker_preloads_app(self, monkeypatch):
+        """A single production worker reuses the preloaded app object."""
+        from src.main import app
+
+        monkeypatch.setattr(settings, "WORKERS", 1)
+        config = server.build_server_config(production=True)
+
+        assert server.resolve_app_target(config) is app
+
+    def test_multiple_workers_use_import_string(self, monkeypatch):
+        """Multiple workers must import the app in each process."""
+        monkeypatch.setattr(settings, "WORKERS", 4)
+        config = server.build_server_config(production=True)
+
+        assert server.resolve_app_target(config) == server.APP_IMPORT_STRING
@@ -0,0 +1,187 @@
+"""
+Unit tests for streaming upload parsing and ranking.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.core.config import settings
+from src.services import ranking_service as ranking_service_module
+from src.services.ranking_service import RankingService
+from src.utils.stream_parsing import detect_format, iter_records
+
+
+async def chunked(data: bytes, size: int = 7):
+    """Yield data in small chunks, splitting lines and multi-byte characters."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(records):
+    return [record async for record in records]
+
+
+@pytest.mark.unit
+class TestStreamParsing:
+    """Test suite for incremental CSV/JSONL parsing."""
+    
+    def test_detect_format(self):
+        """Test format detection from query parameter and Content-Type."""
+        assert detect_format("text/csv; charset=utf-8") == "csv"
+        assert detect_format("application/x-ndjson") == "jsonl"
+        assert detect_format("application/octet-stream", "JSONL") == "jsonl"
+        with pytest.raises(ValueError):
+            detect_format("application/json")
+    
+    @pytest.mark.asyncio
+    async def test_csv_records_across_chunks(self):
+        """Test CSV rows, quoted newlines and metadata columns survive chunking."""
+        data = (
+            "id,answer,name\r\n"
+            "c1,\"Python is, simply, great\",Zoë\r\n"
+            "c2,\"Multi\nline answer\",\r\n"
+            "c3,missing column\n"
+        ).encode("utf-8")
+        
+        records = await collect(iter_records(chunked(data), "csv", 1024))
+        
+        assert records[0] == (2, {"id": "c1", "answer": "Python is, simply, great", "metadata": {"name": "Zoë"}}, None)
+        assert records[1] == (3, {"id": "c2", "answer": "Multi\nline answer", "metadata": None}, None)
+        assert records[2][0] == 5
+        assert records[2][2].startswith("Expected 3 columns")
+    
+    @pytest.mark.asyncio
+    async def test_csv_requires_header_columns(self):
+        """Test CSV without id/answer header is rejected."""
+        records = await collect(iter_records(chunked(b"name,text\na,b\n"), "csv", 1024))
+        
+        assert len(records) == 1
+        assert "header" in records[0][2]
+    
+    @pytest.mark.asyncio
+    async def test_jsonl_records_and_errors(self):
+        """Test JSONL parsing reports bad lines and skips blank ones."""
+        data = b'{"id": "c1", "answer": "A"}\n\nnot json\n[1, 2]\n{"id": "c2", "answer": "B"}'
+        
+        records = await collect(iter_records(chunked(data), "jsonl", 1024))
+        
+        assert records[0] == (1, {"id": "c1", "answer": "A"}, None)
+        assert records[1][0] == 3 and records[1][2].startswith("Invalid JSON")
+        assert records[2][0] == 4 and "JSON object" in records[2][2]
+        assert records[3] == (5, {"id": "c2", "answer": "B"}, None)
+    
+    @pytest.mark.asyncio
+    async def test_oversized_line_is_skipped(self):
+        """Test lines beyond the size limit are dropped without buffering them."""
+        data = b'{"id": "c1", "answer": "' + b"x" * 200 + b'"}\n{"id": "c2", "answer": "B"}\n'
+        
+        records = await collect(iter_records(chunked(data, 16), "jsonl", 64))
+        
+        assert records[0] == (1, None, "Line exceeds maximum length")
+        assert records[1] == (2, {"id": "c2", "answer": "B"}, None)
+
+
+@pytest.mark.unit
+class TestRankStream:
+    """Test suite for RankingService.rank_stream."""
+    
+    @pytest.mark.asyncio
+    async def test_rank_stream_validates_and_ranks(self):
+        """Test invalid and duplicate rows are reported while valid rows are ranked."""
+        service = RankingService()
+        data = (
+            b'{"id": "c1", "answer": "First answer about decorators"}\n'
+            b'{"id": "c2", "answer": "   "}\n'
+            b'{"id": "c1", "answer": "Duplicate id"}\n'
+            b'{"id": "c3", "answer": "Second answer about generators"}\n'
+        )
+        scores = {"First answer about decorators": 3, "Second answer about generators": 5}
+        
+        async def mock_evaluate(candidate_answer, **kwargs):
+            return {"score": scores[candidate_answer], "summary": "S", "improvement": "I"}
+        
+        with patch.object(
+            service.gemini,
+            'evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            result = await service.rank_stream(iter_records(chunked(data), "jsonl", 1024))
+        
+        assert [c["id"] for c in result["ranked_candidates"]] == ["c3", "c1"]
+        assert result["rows_received"] == 4
+        assert result["rows_rejected"] == 2
+        assert [error["line"] for error in result["errors"]] == [2, 3]
+        assert result["errors"][1]["error"] == "Duplicate candidate id"
+    
+    @pytest.mark.asyncio
+    async def test_rank_stream_applies_backpressure(self, monkeypatch):
+        """Test the upload is not read further ahead than the evaluation slots allow."""
+        monkeypatch.setattr(settings, "UPLOAD_CONCURRENCY", 2)
+        monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+        service = RankingService()
+        release = asyncio.Event()
+        produced = []
+        
+        async def records():
+            for i in range(10):
+                produced.append(i)
+                yield i + 1, {"id": f"c{i}", "answer": f"Answer {i}"}, None
+        
+        async def mock_evaluate(*args, **kwargs):
+            await release.wait()
+            return {"score": 3, "summary": "S", "improvement": "I"}
+        
+        with patch.object(
+            service.gemini,
+            'evaluate_answer',
+            new_callable=AsyncMock,
+            side_effect=mock_evaluate
+        ):
+            task = asyncio.create_task(service.rank_stream(records(), top_k=4))
+            await asyncio.sleep(0.05)
+            # Two evaluations in flight plus the record waiting for a slot
+            assert len(produced) == 3
+            release.set()
+            result = await task
+        
+        assert result["total_candidates"] == 10
+        assert len(result["ranked_candidates"]) == 4
+    
+    @pytest.mark.asyncio
+    async def test_rank_stream_top_k_keeps_only_leading_candidates(self, monkeypatch):
+        """Test top_k matches the full ranking, including late near-duplicates, with a bounded buffer."""
+        monkeypatch.setattr(settings, "DEDUP_ENABLED", True)
+        words = ["lambda", "closure", "iterator", "metaclass", "descriptor", "coroutine", "mixin", "slots",
+                 "pickle", "asyncio", "typing", "dataclass", "context", "generator", "thread", "process"]
+        answers = [" ".join(words[(i * 7 + j * 5) % 16] + str(i * j) for j in range(10)) for i in range(40)]
+        rows = [(f"c{i:02d}", answers[i]) for i in range(40)]
+        # Late copies whose ids sort before their representatives', most after those dropped out
+        rows += [(f"a{i:02d}", answers[i]) for i in (1, 9, 24, 39)]
+        
+        async def records():
+            for line, (candidate_id, answer) in enumerate(rows, start=1):
+                yield line, {"id": candidate_id, "answer": answer}, None
+        
+        async def mock_evaluate(candidate_answer, **kwargs):
+            return {"score": answers.index(candidate_answer) % 5 + 1, "summary": "S", "improvement": "I"}
+        
+        buffered = []
+        original_add = ranking_service_module._TopCandidates.add
+        
+        def tracking_add(top, entry):
+            original_add(top, entry)
+            buffered.append(len(top.entries()))
+        
+        service = RankingService()
+        with patch.object(service.gemini, 'evaluate_answer', new_callable=AsyncMock, side_effect=mock_evaluate):
+            full = await service.rank_stream(records())
+            monkeypatch.setattr(ranking_service_module._TopCandidates, "add", tracking_add)
+            top = await service.rank_stream(records(), top_k=3)
+        
+        assert [c["id"] for c in top["ranked_candidates"]] == [c["id"] for c in full["ranked_candidates"][:3]]
+        assert [c["id"] for c in top["ranked_candidates"]] == ["a09", "a24", "a39"]
+        assert top["ranked_candidates"][0]["duplicate_of"] == "c09"
+        assert top["total_candidates"] == full["total_candidates"] == 44
+        assert (full["metadata"]["evaluations"], top["metadata"]["evaluations"]) == (40, 41)
+        assert max(buffered) < 6
@@ -0,0 +1,159 @@
+"""
+Unit tests for tie-break refinement.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.core.config import settings
+from src.services.tie_break_service import TieBreakService
+
+
+def make_tied_pool(size, score=4):
+    """Build tied candidates whose hidden quality is encoded in the answer."""
+    candidates = [
+        {"id": f"c{i:02d}", "score": score, "summary": "OK", "improvement": "More"}
+        for i in range(size)
+    ]
+    # Quality increases with id, so alphabetical tie-breaking is maximally wrong
+    answers = {candidate["id"]: f"answer quality {i + 1:03d}" for i, candidate in enumerate(candidates)}
+    return candidates, answers
+
+
+async def judge_by_quality(pairs, question=None, **kwargs):
+    """Fake comparator preferring the answer with the higher quality number."""
+    return ["A" if a.split()[-1] > b.split()[-1] else "B" for a, b in pairs]
+
+
+@pytest.mark.unit
+class TestTieBreakService:
+    """Test suite for TieBreakService."""
+
+    @pytest.mark.asyncio
+    async def test_refine_orders_top_k_with_batched_calls(self, monkeypatch):
+        """Tied leaders are ordered by comparison within a bounded call count."""
+        monkeypatch.setattr(settings, "TIE_BREAK_MAX_COMPARISONS", 1000)
+        service = TieBreakService()
+        candidates, answers = make_tied_pool(16)
+
+        with patch.object(
+            service.gemini,
+            'compare_answers',
+            new_callable=AsyncMock,
+            side_effect=judge_by_quality
+        ) as mock_compare:
+            ranked, stats = await service.refine(candidates, answers, top_k=3)
+
+        assert [c["id"] for c in ranked[:3]] == ["c15", "c14", "c13"]
+        assert [c["rank"] for c in ranked] == list(range(1, 17))
+        assert stats["groups_refined"] == 1
+        # Truncated merges need far fewer than the n*log2(n) = 64 comparisons of a full sort
+        assert stats["comparisons"] < 30
+        assert stats["model_calls"] == mock_compare.await_count
+        assert stats["model_calls"] < stats["comparisons"]
+
+    @pytest.mark.asyncio
+    async def test_groups_outside_top_k_are_untouched(self):
+        """Only tie groups reaching into the top-K are refined."""
+        service = TieBreakService()
+        leaders, leader_answers = make_tied_pool(2, score=5)
+        tail = [
+            {"id": "t1", "score": 2, "summary": "Weak", "improvement": "More"},
+            {"id": "t2", "score": 2, "summary": "Weak", "improvement": "More"},
+        ]
+        answers = {**leader_answers, "t1": "tail one", "t2": "tail two"}
+
+        with patch.object(
+            service.gemini,
+            'compare_answers',
+            new_callable=AsyncMock,
+            side_effect=judge_by_quality
+        ) as mock_compare:
+            ranked, stats = await service.refine(leaders + tail, answers, top_k=2)
+
+        assert [c["id"] for c in ranked] == ["c01", "c00", "t1", "t2"]
+        assert stats["groups_refined"] == 1
+        assert mock_compare.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_repeat_refinement_uses_cache(self):
+        """A second refinement of the same answers costs no model calls."""
+        service = TieBreakService()
+        candidates, answers = make_tied_pool(5)
+
+        with patch.object(
+            service.gemini,
+            'compare_answers',
+            new_callable=AsyncMock,
+            side_effect=judge_by_quality
+        ) as mock_compare:
+            first, _ = await service.refine([dict(c) for c in candidates], answers, top_k=5)
+            calls_after_first = mock_compare.await_count
+            second, stats = await service.refine([dict(c) for c in candidates], answers, top_k=5)
+
+        assert [c["id"] for c in first] == [c["id"] for c in second]
+        assert mock_compare.await_count == calls_after_first
+        assert stats["model_calls"] == 0
+        assert stats["cache_hits"] > 0
+
+    @pytest.mark.asyncio
+    async def test_budget_exhaustion_falls_back_to_id_order(self, monkeypatch):
+        """Comparisons beyond the budget use id order instead of the model."""
+        monkeypatch.setattr(settings, "TIE_BREAK_MAX_COMPARISONS", 2)
+        service = TieBreakService()
+        candidates, answers = make_tied_pool(8)
+
+        with patch.object(
+            service.gemini,
+            'compare_answers',
+            new_callable=AsyncMock,
+            side_effect=judge_by_quality
+        ):
+            ranked, stats = await service.refine(candidates, answers, top_k=8)
+
+        assert stats["comparisons"] == 2
+        assert stats["fallbacks"] > 0
+        assert len(ranked) == 8
+
+    @pytest.mark.asyncio
+    async def test_failed_comparison_keeps_id_order(self):
+        """A failing comparison call leaves the id ordering in place."""
+        service = TieBreakService()
+        candidates, answers = make_tied_pool(3)
+
+        with patch.object(
+            service.gemini,
+            'compare_answers',
+            new_callable=AsyncMock,
+            side_effect=Exception("API Error")
+        ):
+            ranked, stats = await service.refine(candidates, answers, top_k=3)
+
+        assert [c["id"] for c in ranked] == ["c00", "c01", "c02"]
+        assert stats["comparisons"] == 0
+        assert stats["fallbacks"] > 0
+
+
+@pytest.mark.unit
+class TestGeminiComparisonParsing:
+    """Test Gemini service comparison prompt and parsing."""
+
+    def test_build_comparison_prompt(self):
+        """Every pair appears in the prompt."""
+        from src.services.gemini_service import GeminiService
+
+        service = GeminiService()
+        prompt = service._build_comparison_prompt([("first A", "first B"), ("second A", "second B")])
+
+        assert "Pair 1:" in prompt and "Pair 2:" in prompt
+        assert "second B" in prompt
+        assert "winners" in prompt
+
+    def test_parse_comparison_response(self):
+        """Winners are normalized and validated against the pair count."""
+        from src.services.gemini_service import GeminiService
+
+        service = GeminiService()
+        assert service._parse_comparison_response('```json\n{"winners": ["a", "B"]}\n```', 2) == ["A", "B"]
+
+        with pytest.raises(ValueError):
+            service._parse_comparison_response('{"winners": ["A"]}', 2)
@@ -0,0 +1,91 @@
+"""
+Unit tests for token estimation and usage accounting.
+"""
+import pytest
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.services.gemini_service import GeminiService
+from src.services.providers import EvaluationProvider, ProviderRegistry, ProviderResponse
+from src.services.providers.fake import FakeProvider
+from src.services.usage import RequestUsage, current_usage, record_request_usage
+from src.utils.tokens import estimate_tokens, estimate_usage
+
+
+class ReportingProvider(EvaluationProvider):
+    """Provider that reports its own token usage."""
+
+    name = "reporting"
+
+    async def generate(self, prompt, model, max_output_tokens, temperature=0.3):
+        return ProviderResponse(
+            text='{"score": 4, "summary": "S", "improvement": "I"}',
+            model=model,
+            provider=self.name,
+            usage={"prompt_tokens": 100, "output_tokens": 20, "total_tokens": 120}
+        )
+
+
+@pytest.mark.unit
+class TestUsageAccounting:
+    """Test suite for token usage accounting."""
+
+    def test_estimate_tokens(self):
+        """Words cost a token per five characters; punctuation costs one."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("Hello world") == 2
+        assert estimate_tokens("Python is a high-level, interpreted programming language.") == 14
+        assert estimate_usage("one two", "three") == {
+            "prompt_tokens": 2, "output_tokens": 1, "total_tokens": 3
+        }
+
+    @pytest.mark.asyncio
+    async def test_calls_add_to_current_request(self):
+        """Reported usage is used as-is; missing usage is estimated and flagged."""
+        metrics.reset()
+        service = GeminiService(providers=ProviderRegistry({"fake": FakeProvider, "reporting": ReportingProvider}))
+        tracker = RequestUsage()
+        current_usage.set(tracker)
+
+        reported = await service.evaluate_answer("An answer", provider="reporting")
+        estimated = await service.evaluate_answer("An answer", provider="fake")
+
+        assert reported["usage"] == {
+            "prompt_tokens": 100, "output_tokens": 20, "total_tokens": 120, "estimated": False
+        }
+        assert estimated["usage"]["estimated"] is True
+        assert estimated["usage"]["prompt_tokens"] > 0
+        assert tracker.calls == 2
+        assert tracker.estimated_calls == 1
+        assert tracker.total_tokens == 120 + estimated["usage"]["total_tokens"]
+        assert metrics.counter_value(
+            "provider_total_tokens", labels={"provider": "reporting", "model": settings.GEMINI_MODEL}
+        ) == 120
+
+    def test_headers_and_cost(self, monkeypatch):
+        """Totals are reported as headers, with spend when prices are configured."""
+        monkeypatch.setattr(settings, "TOKEN_PRICE_PROMPT_PER_MILLION", 0.5)
+        monkeypatch.setattr(settings, "TOKEN_PRICE_OUTPUT_PER_MILLION", 2.0)
+        tracker = RequestUsage()
+        tracker.add({"prompt_tokens": 1000, "output_tokens": 500}, estimated=False)
+
+        assert tracker.headers() == {
+            "X-Model-Calls": "1",
+            "X-Prompt-Tokens": "1000",
+            "X-Output-Tokens": "500",
+            "X-Total-Tokens": "1500",
+            "X-Model-Cost-USD": "0.001500",
+        }
+
+    def test_client_labels_are_bounded(self, monkeypatch):
+        """Only listed clients get their own label; the rest share "other"."""
+        metrics.reset()
+        monkeypatch.setattr(settings, "USAGE_CLIENT_LABELS", "key-aaaa, 10.0.0.7")
+        for client in ["key-aaaa", "10.0.0.7", "key-bbbb", "10.0.0.8", None]:
+            tracker = RequestUsage(client=client)
+            tracker.add({"prompt_tokens": 10, "output_tokens": 5}, estimated=False)
+            record_request_usage("/route", tracker)
+
+        for label, expected in [("key-aaaa", 15), ("10.0.0.7", 15), ("other", 30), ("unknown", 15)]:
+            assert metrics.counter_value("client_total_tokens", labels={"client": label}) == expected
+        assert metrics.counter_value("client_total_tokens", labels={"client": "key-bbbb"}) == 0